@@ -5,6 +5,7 @@ from sqlalchemy import pool
 
 from alembic import context
 import os
+import re
 import sys
 from dotenv import load_dotenv
 
@@ -14,7 +15,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 load_dotenv()
 #import models
 from app.db import Base
-from app.models import task_model, user, note_model
+from app.models import task_model, user, note_model, stats_model, tombstone_model
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -31,6 +32,17 @@ if config.config_file_name is not None:
 # target_metadata = mymodel.Base.metadata
 target_metadata = Base.metadata
 
+# Full-text search objects are managed by hand in migrations, not by the models
+def include_object(object, name, type_, reflected, compare_to):
+    if type_ == "column" and name == "search_vector":
+        return False
+    if type_ == "index" and name and name.endswith("_search_vector"):
+        return False
+    # SQLite FTS5 tables (tasks_fts) and their shadow tables (tasks_fts_data, ...)
+    if type_ == "table" and reflected and re.fullmatch(r"\w+_fts(_\w+)?", name):
+        return False
+    return True
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -55,6 +67,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -79,7 +92,7 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata, include_object=include_object
         )
 
         with context.begin_transaction():
@@ -0,0 +1,30 @@
+"""Add keyset pagination indexes
+
+Revision ID: 5b2e8c41d7a9
+Revises: 38f1d7b8d38b
+Create Date: 2026-10-18 09:12:31.482113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b2e8c41d7a9'
+down_revision: Union[str, Sequence[str], None] = '38f1d7b8d38b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_tasks_created_at_id', 'tasks', ['created_at', 'id'], unique=False)
+    op.create_index('ix_notes_created_at_id', 'notes', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_notes_created_at_id', table_name='notes')
+    op.drop_index('ix_tasks_created_at_id', table_name='tasks')
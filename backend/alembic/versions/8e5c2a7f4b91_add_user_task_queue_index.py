@@ -0,0 +1,32 @@
+"""Add partial index for the per-user task work queue
+
+Revision ID: 8e5c2a7f4b91
+Revises: d41f7b2c9e60
+Create Date: 2026-10-18 21:04:37.215408
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e5c2a7f4b91'
+down_revision: Union[str, Sequence[str], None] = 'd41f7b2c9e60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_tasks_queue_user', 'tasks', ['user_id', 'completed', 'priority', 'due_date', 'id'], unique=False,
+        postgresql_where=sa.text('completed = false'),
+        sqlite_where=sa.text('completed = 0'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_queue_user', table_name='tasks')
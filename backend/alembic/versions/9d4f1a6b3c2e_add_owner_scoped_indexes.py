@@ -0,0 +1,32 @@
+"""Add owner-scoped indexes
+
+Revision ID: 9d4f1a6b3c2e
+Revises: 5b2e8c41d7a9
+Create Date: 2026-10-18 10:03:47.215390
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d4f1a6b3c2e'
+down_revision: Union[str, Sequence[str], None] = '5b2e8c41d7a9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_tasks_user_id_completed_due_date', 'tasks', ['user_id', 'completed', 'due_date'], unique=False)
+    op.create_index('ix_tasks_completed_id', 'tasks', ['completed', 'id'], unique=False)
+    op.create_index('ix_notes_user_id_created_at', 'notes', ['user_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_notes_user_id_created_at', table_name='notes')
+    op.drop_index('ix_tasks_completed_id', table_name='tasks')
+    op.drop_index('ix_tasks_user_id_completed_due_date', table_name='tasks')
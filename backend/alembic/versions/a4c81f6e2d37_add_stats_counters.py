@@ -0,0 +1,255 @@
+"""Add trigger-maintained counters for GET /stats
+
+Revision ID: a4c81f6e2d37
+Revises: e2b9d4c6a871
+Create Date: 2026-10-18 14:02:41.517308
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4c81f6e2d37'
+down_revision: Union[str, Sequence[str], None] = 'e2b9d4c6a871'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Changed rows per statement, signed: +1 for rows added to a scope, -1 for rows removed from it
+TASK_CHANGES = {
+    'ins': "SELECT user_id, completed, priority, due_date, 1 AS sign FROM new_rows",
+    'del': "SELECT user_id, completed, priority, due_date, -1 AS sign FROM old_rows",
+    'upd': "SELECT user_id, completed, priority, due_date, 1 AS sign FROM new_rows "
+           "UNION ALL SELECT user_id, completed, priority, due_date, -1 FROM old_rows",
+}
+NOTE_CHANGES = {
+    'ins': "SELECT user_id, 1 AS sign FROM new_rows",
+    'del': "SELECT user_id, -1 AS sign FROM old_rows",
+    'upd': "SELECT user_id, 1 AS sign FROM new_rows UNION ALL SELECT user_id, -1 FROM old_rows",
+}
+REFERENCING = {
+    'ins': ('INSERT', 'REFERENCING NEW TABLE AS new_rows'),
+    'del': ('DELETE', 'REFERENCING OLD TABLE AS old_rows'),
+    'upd': ('UPDATE', 'REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows'),
+}
+
+# Every write touches scope 0, so its counters are spread over this many rows: a writer adds to the row
+# of its backend pid (instead of queueing on one row lock), reads sum them. Other scopes use shard 0.
+SHARDS = 16
+
+# One aggregated upsert per statement, so bulk writes and COPY imports touch each counter row once.
+# HAVING drops zero deltas: title-only updates leave the counters (and their row locks) alone.
+TASK_FUNCTION = """
+CREATE FUNCTION tasks_stats_{op}() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    WITH changes AS ({changes}),
+    scoped AS (
+        SELECT 0 AS scope, pg_backend_pid() % {shards} AS shard, * FROM changes
+        UNION ALL SELECT user_id, 0, * FROM changes WHERE user_id IS NOT NULL
+    )
+    INSERT INTO stat_counters AS c (scope, shard, tasks_total, tasks_completed, tasks_low, tasks_medium, tasks_high, notes_total)
+    SELECT scope, shard, sum(sign), sum(sign * completed::int),
+           sum(sign * (priority::text = 'low')::int),
+           sum(sign * (priority::text = 'medium')::int),
+           sum(sign * (priority::text = 'high')::int), 0
+    FROM scoped GROUP BY scope, shard
+    HAVING sum(sign) <> 0 OR sum(sign * completed::int) <> 0
+        OR sum(sign * (priority::text = 'low')::int) <> 0
+        OR sum(sign * (priority::text = 'medium')::int) <> 0
+        OR sum(sign * (priority::text = 'high')::int) <> 0
+    ORDER BY scope, shard
+    ON CONFLICT (scope, shard) DO UPDATE SET
+        tasks_total = c.tasks_total + excluded.tasks_total,
+        tasks_completed = c.tasks_completed + excluded.tasks_completed,
+        tasks_low = c.tasks_low + excluded.tasks_low,
+        tasks_medium = c.tasks_medium + excluded.tasks_medium,
+        tasks_high = c.tasks_high + excluded.tasks_high;
+
+    WITH changes AS ({changes}),
+    scoped AS (
+        SELECT 0 AS scope, pg_backend_pid() % {shards} AS shard, * FROM changes
+        UNION ALL SELECT user_id, 0, * FROM changes WHERE user_id IS NOT NULL
+    )
+    INSERT INTO task_due_counters AS c (scope, due_day, shard, open_count)
+    SELECT scope, due_date::date, shard, sum(sign)
+    FROM scoped WHERE NOT completed AND due_date IS NOT NULL
+    GROUP BY scope, due_date::date, shard
+    HAVING sum(sign) <> 0
+    ORDER BY scope, due_date::date, shard
+    ON CONFLICT (scope, due_day, shard) DO UPDATE SET open_count = c.open_count + excluded.open_count;
+    RETURN NULL;
+END
+$$
+"""
+NOTE_FUNCTION = """
+CREATE FUNCTION notes_stats_{op}() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    WITH changes AS ({changes}),
+    scoped AS (
+        SELECT 0 AS scope, pg_backend_pid() % {shards} AS shard, * FROM changes
+        UNION ALL SELECT user_id, 0, * FROM changes WHERE user_id IS NOT NULL
+    )
+    INSERT INTO stat_counters AS c (scope, shard, tasks_total, tasks_completed, tasks_low, tasks_medium, tasks_high, notes_total)
+    SELECT scope, shard, 0, 0, 0, 0, 0, sum(sign)
+    FROM scoped GROUP BY scope, shard
+    HAVING sum(sign) <> 0
+    ORDER BY scope, shard
+    ON CONFLICT (scope, shard) DO UPDATE SET notes_total = c.notes_total + excluded.notes_total;
+    RETURN NULL;
+END
+$$
+"""
+
+# SQLite: row-level triggers, single writer so always shard 0 (mirrors app.models.stats_model)
+def sqlite_task_delta(ref: str, sign: int) -> str:
+    scopes = f"(SELECT 0 AS scope UNION ALL SELECT {ref}.user_id WHERE {ref}.user_id IS NOT NULL)"
+
+    def priority(value: str) -> str:
+        return f"{sign} * coalesce({ref}.priority = '{value}', 0)"
+
+    return (
+        "INSERT INTO stat_counters (scope, tasks_total, tasks_completed, tasks_low, tasks_medium, tasks_high, notes_total) "
+        f"SELECT scope, {sign}, {sign} * {ref}.completed, {priority('low')}, {priority('medium')}, {priority('high')}, 0 "
+        f"FROM {scopes} WHERE true "
+        "ON CONFLICT (scope, shard) DO UPDATE SET "
+        "tasks_total = tasks_total + excluded.tasks_total, "
+        "tasks_completed = tasks_completed + excluded.tasks_completed, "
+        "tasks_low = tasks_low + excluded.tasks_low, "
+        "tasks_medium = tasks_medium + excluded.tasks_medium, "
+        "tasks_high = tasks_high + excluded.tasks_high; "
+        "INSERT INTO task_due_counters (scope, due_day, open_count) "
+        f"SELECT scope, date({ref}.due_date), {sign} FROM {scopes} "
+        f"WHERE NOT {ref}.completed AND {ref}.due_date IS NOT NULL "
+        "ON CONFLICT (scope, due_day, shard) DO UPDATE SET open_count = open_count + excluded.open_count; "
+    )
+
+
+def sqlite_note_delta(ref: str, sign: int) -> str:
+    scopes = f"(SELECT 0 AS scope UNION ALL SELECT {ref}.user_id WHERE {ref}.user_id IS NOT NULL)"
+    return (
+        "INSERT INTO stat_counters (scope, tasks_total, tasks_completed, tasks_low, tasks_medium, tasks_high, notes_total) "
+        f"SELECT scope, 0, 0, 0, 0, 0, {sign} FROM {scopes} WHERE true "
+        "ON CONFLICT (scope, shard) DO UPDATE SET notes_total = notes_total + excluded.notes_total; "
+    )
+
+
+SQLITE_TRIGGERS = {
+    'tasks_stats_ai': f"AFTER INSERT ON tasks BEGIN {sqlite_task_delta('new', 1)}END",
+    'tasks_stats_ad': f"AFTER DELETE ON tasks BEGIN {sqlite_task_delta('old', -1)}END",
+    'tasks_stats_au': "AFTER UPDATE OF completed, priority, due_date, user_id ON tasks "
+                      f"BEGIN {sqlite_task_delta('old', -1)}{sqlite_task_delta('new', 1)}END",
+    'notes_stats_ai': f"AFTER INSERT ON notes BEGIN {sqlite_note_delta('new', 1)}END",
+    'notes_stats_ad': f"AFTER DELETE ON notes BEGIN {sqlite_note_delta('old', -1)}END",
+    'notes_stats_au': "AFTER UPDATE OF user_id ON notes "
+                      f"BEGIN {sqlite_note_delta('old', -1)}{sqlite_note_delta('new', 1)}END",
+}
+
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'stat_counters',
+        sa.Column('scope', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('shard', sa.Integer(), autoincrement=False, server_default='0', nullable=False),
+        sa.Column('tasks_total', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('tasks_completed', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('tasks_low', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('tasks_medium', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('tasks_high', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('notes_total', sa.Integer(), server_default='0', nullable=False),
+        sa.PrimaryKeyConstraint('scope', 'shard'),
+    )
+    op.create_table(
+        'task_due_counters',
+        sa.Column('scope', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('due_day', sa.Date(), nullable=False),
+        sa.Column('shard', sa.Integer(), autoincrement=False, server_default='0', nullable=False),
+        sa.Column('open_count', sa.Integer(), server_default='0', nullable=False),
+        sa.PrimaryKeyConstraint('scope', 'due_day', 'shard'),
+    )
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        for name, body in SQLITE_TRIGGERS.items():
+            op.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+        # Backfill: the migration's write transaction keeps other writers out on SQLite
+        op.execute("""
+            WITH task_rows AS (
+                SELECT user_id, completed, coalesce(priority = 'low', 0) AS low,
+                       coalesce(priority = 'medium', 0) AS medium, coalesce(priority = 'high', 0) AS high
+                FROM tasks
+            ),
+            scoped AS (
+                SELECT 0 AS scope, 1 AS tasks, completed, low, medium, high, 0 AS notes FROM task_rows
+                UNION ALL SELECT user_id, 1, completed, low, medium, high, 0 FROM task_rows WHERE user_id IS NOT NULL
+                UNION ALL SELECT 0, 0, 0, 0, 0, 0, 1 FROM notes
+                UNION ALL SELECT user_id, 0, 0, 0, 0, 0, 1 FROM notes WHERE user_id IS NOT NULL
+            )
+            INSERT INTO stat_counters (scope, tasks_total, tasks_completed, tasks_low, tasks_medium, tasks_high, notes_total)
+            SELECT scope, sum(tasks), sum(completed), sum(low), sum(medium), sum(high), sum(notes)
+            FROM scoped GROUP BY scope
+        """)
+        op.execute("""
+            WITH open_rows AS (
+                SELECT user_id, date(due_date) AS due_day FROM tasks WHERE NOT completed AND due_date IS NOT NULL
+            )
+            INSERT INTO task_due_counters (scope, due_day, open_count)
+            SELECT scope, due_day, count(*) FROM (
+                SELECT 0 AS scope, due_day FROM open_rows
+                UNION ALL SELECT user_id, due_day FROM open_rows WHERE user_id IS NOT NULL
+            ) GROUP BY scope, due_day
+        """)
+        return
+    if dialect != 'postgresql':
+        return
+
+    # Statement-level triggers with transition tables (these can't take an UPDATE OF column list)
+    for table, function, changes in (('tasks', TASK_FUNCTION, TASK_CHANGES), ('notes', NOTE_FUNCTION, NOTE_CHANGES)):
+        for name, (event, referencing) in REFERENCING.items():
+            op.execute(function.format(op=name, changes=changes[name], shards=SHARDS))
+            op.execute(
+                f"CREATE TRIGGER {table}_stats_{name} AFTER {event} ON {table} {referencing} "
+                f"FOR EACH STATEMENT EXECUTE FUNCTION {table}_stats_{name}()"
+            )
+
+    # Backfill while holding off writers, so no write is counted twice or missed
+    op.execute("LOCK TABLE tasks, notes IN SHARE MODE")
+    op.execute("""
+        INSERT INTO stat_counters (scope, tasks_total, tasks_completed, tasks_low, tasks_medium, tasks_high, notes_total)
+        SELECT scope, sum(tasks_total), sum(tasks_completed), sum(tasks_low), sum(tasks_medium), sum(tasks_high), sum(notes_total)
+        FROM (
+            SELECT s.scope, 1 AS tasks_total, t.completed::int AS tasks_completed,
+                   (t.priority::text = 'low')::int AS tasks_low,
+                   (t.priority::text = 'medium')::int AS tasks_medium,
+                   (t.priority::text = 'high')::int AS tasks_high, 0 AS notes_total
+            FROM tasks t CROSS JOIN LATERAL (SELECT 0 AS scope UNION ALL SELECT t.user_id WHERE t.user_id IS NOT NULL) s
+            UNION ALL
+            SELECT s.scope, 0, 0, 0, 0, 0, 1
+            FROM notes n CROSS JOIN LATERAL (SELECT 0 AS scope UNION ALL SELECT n.user_id WHERE n.user_id IS NOT NULL) s
+        ) rows
+        GROUP BY scope
+    """)
+    op.execute("""
+        INSERT INTO task_due_counters (scope, due_day, open_count)
+        SELECT s.scope, t.due_date::date, count(*)
+        FROM tasks t CROSS JOIN LATERAL (SELECT 0 AS scope UNION ALL SELECT t.user_id WHERE t.user_id IS NOT NULL) s
+        WHERE NOT t.completed AND t.due_date IS NOT NULL
+        GROUP BY s.scope, t.due_date::date
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        for name in SQLITE_TRIGGERS:
+            op.execute(f"DROP TRIGGER IF EXISTS {name}")
+    if dialect == 'postgresql':
+        for table in ('tasks', 'notes'):
+            for name in REFERENCING:
+                op.execute(f"DROP TRIGGER IF EXISTS {table}_stats_{name} ON {table}")
+                op.execute(f"DROP FUNCTION IF EXISTS {table}_stats_{name}()")
+    op.drop_table('task_due_counters')
+    op.drop_table('stat_counters')
@@ -0,0 +1,78 @@
+"""Add tombstones and updated_at indexes for incremental sync
+
+Revision ID: b6e1d0a93f25
+Revises: f3d92b7a5c18
+Create Date: 2026-10-18 15:47:52.093518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6e1d0a93f25'
+down_revision: Union[str, Sequence[str], None] = 'f3d92b7a5c18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+RESOURCES = {'tasks': 'task', 'notes': 'note'}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_tasks_updated_at_id', 'tasks', ['updated_at', 'id'], unique=False)
+    op.create_index('ix_notes_updated_at_id', 'notes', ['updated_at', 'id'], unique=False)
+    op.create_table(
+        'tombstones',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('resource', sa.String(length=16), nullable=False),
+        sa.Column('item_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('deleted_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_tombstones_resource_deleted_at_id', 'tombstones', ['resource', 'deleted_at', 'id'], unique=False)
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        # Row-level, timestamps in the format SQLAlchemy writes to updated_at (mirrors app.models.tombstone_model)
+        for table, resource in RESOURCES.items():
+            op.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {table}_tombstones_ad AFTER DELETE ON {table} BEGIN "
+                "INSERT INTO tombstones (resource, item_id, user_id, deleted_at) "
+                f"VALUES ('{resource}', old.id, old.user_id, strftime('%Y-%m-%d %H:%M:%f', 'now') || '000'); END"
+            )
+        return
+    if dialect != 'postgresql':
+        return
+    for table, resource in RESOURCES.items():
+        op.execute(f"""
+            CREATE FUNCTION {table}_tombstones() RETURNS trigger LANGUAGE plpgsql AS $$
+            BEGIN
+                INSERT INTO tombstones (resource, item_id, user_id, deleted_at)
+                SELECT '{resource}', id, user_id, now() FROM old_rows;
+                RETURN NULL;
+            END
+            $$
+        """)
+        op.execute(
+            f"CREATE TRIGGER {table}_tombstones AFTER DELETE ON {table} REFERENCING OLD TABLE AS old_rows "
+            f"FOR EACH STATEMENT EXECUTE FUNCTION {table}_tombstones()"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        for table in RESOURCES:
+            op.execute(f"DROP TRIGGER IF EXISTS {table}_tombstones_ad")
+    if dialect == 'postgresql':
+        for table in RESOURCES:
+            op.execute(f"DROP TRIGGER IF EXISTS {table}_tombstones ON {table}")
+            op.execute(f"DROP FUNCTION IF EXISTS {table}_tombstones()")
+    op.drop_index('ix_tombstones_resource_deleted_at_id', table_name='tombstones')
+    op.drop_table('tombstones')
+    op.drop_index('ix_notes_updated_at_id', table_name='notes')
+    op.drop_index('ix_tasks_updated_at_id', table_name='tasks')
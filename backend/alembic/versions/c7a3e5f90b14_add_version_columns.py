@@ -0,0 +1,30 @@
+"""Add version columns for optimistic concurrency
+
+Revision ID: c7a3e5f90b14
+Revises: 9d4f1a6b3c2e
+Create Date: 2026-10-18 11:26:05.630218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7a3e5f90b14'
+down_revision: Union[str, Sequence[str], None] = '9d4f1a6b3c2e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('tasks', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('notes', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('notes', 'version')
+    op.drop_column('tasks', 'version')
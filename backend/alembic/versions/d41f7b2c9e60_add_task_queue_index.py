@@ -0,0 +1,32 @@
+"""Add partial index for the task work queue
+
+Revision ID: d41f7b2c9e60
+Revises: b6e1d0a93f25
+Create Date: 2026-10-18 18:12:05.480913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd41f7b2c9e60'
+down_revision: Union[str, Sequence[str], None] = 'b6e1d0a93f25'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_tasks_queue', 'tasks', ['priority', 'due_date', 'id'], unique=False,
+        postgresql_where=sa.text('completed = false'),
+        sqlite_where=sa.text('completed = 0'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_queue', table_name='tasks')
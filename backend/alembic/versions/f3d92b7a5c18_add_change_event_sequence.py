@@ -0,0 +1,33 @@
+"""Add the change feed event id sequence
+
+Revision ID: f3d92b7a5c18
+Revises: a4c81f6e2d37
+Create Date: 2026-10-18 15:10:07.284116
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3d92b7a5c18'
+down_revision: Union[str, Sequence[str], None] = 'a4c81f6e2d37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Postgres only: ids of events fanned out with EVENTS_BACKEND=postgres (LISTEN/NOTIFY)
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute("CREATE SEQUENCE change_event_ids")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute("DROP SEQUENCE change_event_ids")
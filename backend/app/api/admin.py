@@ -0,0 +1,30 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+from starlette.concurrency import run_in_threadpool
+from app.utils.profiling import StackSampler, token_valid, profile_lock, PROFILE_MAX_SECONDS
+from app.utils.request_metrics import TimedRoute
+
+router = APIRouter(route_class=TimedRoute)
+
+def require_profiling_token(x_profiling_token: Optional[str] = Header(None)):
+    if not token_valid(x_profiling_token):
+        raise HTTPException(status_code=403, detail="Invalid profiling token")
+
+@router.get("/profile", response_class=PlainTextResponse, dependencies=[Depends(require_profiling_token)])
+async def sample_process(
+    seconds: float = Query(10, gt=0, le=PROFILE_MAX_SECONDS),
+    interval: float = Query(0.005, ge=0.001, le=1),
+    include_idle: bool = False
+):
+    """
+    Sample every thread of this worker for `seconds` and return collapsed stacks
+    (flamegraph.pl, speedscope, inferno); the event loop keeps serving while it samples
+    """
+    if not profile_lock.acquire(blocking=False):
+        raise HTTPException(status_code=409, detail="Another profile is running")
+    try:
+        sampler = await run_in_threadpool(StackSampler(interval=interval, include_idle=include_idle).run, seconds)
+    finally:
+        profile_lock.release()
+    return PlainTextResponse(sampler.collapsed(), headers={"X-Profile-Samples": str(sampler.samples)})
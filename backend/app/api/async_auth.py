@@ -0,0 +1,64 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db import get_async_db
+from app.services.async_auth_service import AsyncAuthService
+from app.schemas.user_schemas import UserCreate, UserResponse, UserLogin, Token
+from app.utils.auth import verify_token
+from app.utils.batch import batch_user
+from app.api.auth import oauth2_scheme
+from app.utils.request_metrics import TimedRoute
+
+# Async versions of the routes in app.api.auth, mounted when DB_ASYNC is enabled
+router = APIRouter(route_class=TimedRoute)
+
+@router.post("/register", response_model=UserResponse)
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_async_db)):
+    """
+    Register a new user
+    """
+    return await AsyncAuthService.register_user(db, user_data)
+
+@router.post("/login", response_model=Token)
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)):
+    """
+    Login user and return access token
+    Uses OAuth2PasswordRequestForm for standard login form
+    """
+    login_data = UserLogin(username=form_data.username, password=form_data.password)
+    result = await AsyncAuthService.login_user(db, login_data)
+    
+    return Token(
+        access_token=result["access_token"],
+        token_type=result["token_type"]
+    )
+
+# Dependency to get current user (for protecting async endpoints)
+async def get_current_user_async(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)):
+    """
+    Async dependency function to get current authenticated user
+    """
+    user = batch_user(token)
+    if user is not None:
+        return user
+    token_data = verify_token(token)
+    user = await AsyncAuthService.get_authenticated_user(db, token_data.username)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    if not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="User account is disabled"
+        )
+    return user
+
+@router.get("/me", response_model=UserResponse)
+async def get_current_user(current_user= Depends(get_current_user_async)):
+    """
+    Get current user information from JWT token
+    """
+    return current_user
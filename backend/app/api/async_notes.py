@@ -0,0 +1,119 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db import get_async_db, get_async_session_factory
+from app.services.async_note_service import AsyncNoteService
+from app.schemas.note_schemas import NoteCreate, NoteUpdate, NoteResponse, NotePage
+from typing import List
+from typing import Optional
+from datetime import datetime
+from app.utils.export import ExportFormat, ExportEncoder, astream_export, export_response
+from app.utils.fast_json import list_response
+from app.utils.pagination import set_total_count
+from app.utils.etag import version_etag, parse_if_match, collection_etag, etag_matches, not_modified, set_cache_headers, CACHE_CONTROL
+from app.api.async_auth import get_current_user_async
+from app.utils.request_metrics import TimedRoute
+
+# Async versions of the routes in app.api.notes, mounted when DB_ASYNC is enabled
+router = APIRouter(route_class=TimedRoute)
+
+@router.get("/", response_model=List[NoteResponse])
+async def get_notes(
+    skip: int = 0,
+    limit: int = 100,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,title,updated_at"),
+    preview_chars: Optional[int] = Query(None, ge=1, le=10000, description="Return only the first characters of content"),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db)
+):
+    fieldset = AsyncNoteService.get_fieldset(fields, preview_chars)
+    # The total is part of the ETag: rows added past this page change it too
+    total, exact = await AsyncNoteService.count_notes(db)
+    variant = f"{fieldset.key}#{total}"
+    # Conditional GET: compare against the cheap (id, version) fingerprint before loading rows
+    if if_none_match:
+        etag = collection_etag(await AsyncNoteService.get_note_versions(db, skip, limit), variant)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag, CACHE_CONTROL["list"])
+    
+    # Column rows validated and serialized in one pass, no ORM hydration; only the requested columns are read
+    rows = await AsyncNoteService.get_note_rows(db, skip, limit, fieldset.columns)
+    response = list_response(fieldset.adapter, rows)
+    set_cache_headers(response, collection_etag(((row["id"], row["version"]) for row in rows), variant), CACHE_CONTROL["list"])
+    set_total_count(response, total, exact)
+    return response
+
+@router.get("/page", response_model=NotePage)
+async def get_notes_page(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Keyset pagination: pass the returned next_cursor to fetch the following page
+    """
+    notes, next_cursor = await AsyncNoteService.get_notes_page(db, cursor, limit)
+    set_cache_headers(response, None, CACHE_CONTROL["list"])
+    return {"items": notes, "next_cursor": next_cursor}
+
+@router.get("/mine", response_model=List[NoteResponse])
+async def get_my_notes(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    db: AsyncSession = Depends(get_async_db),
+    current_user= Depends(get_current_user_async)
+):
+    """
+    Get notes owned by the authenticated user
+    """
+    set_cache_headers(response, None, CACHE_CONTROL["list"])
+    return await AsyncNoteService.get_user_notes(db, current_user.id, skip, limit)
+
+@router.get("/export")
+async def export_notes(
+    format: ExportFormat = ExportFormat.ndjson,
+    user_id: Optional[int] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    session_factory= Depends(get_async_session_factory),
+    current_user= Depends(get_current_user_async)
+):
+    async def batches():
+        async with session_factory() as db:
+            async for batch in AsyncNoteService.iter_note_batches(db, user_id=user_id, created_from=created_from, created_to=created_to):
+                yield batch
+    
+    encoder = ExportEncoder(NoteResponse, format)
+    return export_response(astream_export(batches(), encoder), format, "notes")
+
+@router.get("/{note_id}", response_model=NoteResponse)
+async def get_note(note_id: int, response: Response, if_none_match: Optional[str] = Header(None), db: AsyncSession = Depends(get_async_db)):
+    note = await AsyncNoteService.get_note(db, note_id)
+    if not note:
+        raise HTTPException(status_code=404, detail="Note not found")
+    etag = version_etag(note.version)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, CACHE_CONTROL["item"])
+    # Send back as If-Match to make an update/delete conditional
+    set_cache_headers(response, etag, CACHE_CONTROL["item"])
+    return note
+
+@router.post("/", response_model=NoteResponse)
+async def create_note(note: NoteCreate, db: AsyncSession = Depends(get_async_db), current_user= Depends(get_current_user_async)):
+    return await AsyncNoteService.create_note(db, note)
+
+@router.put("/{note_id}", response_model=NoteResponse)
+async def update_note(note_id: int, note: NoteUpdate, response: Response, if_match: Optional[str] = Header(None), db: AsyncSession = Depends(get_async_db), current_user= Depends(get_current_user_async)):
+    updated_note = await AsyncNoteService.update_note(db, note_id, note, parse_if_match(if_match))
+    if not updated_note:
+        raise HTTPException(status_code=404, detail="Note not found")
+    response.headers["ETag"] = version_etag(updated_note.version)
+    return updated_note
+
+@router.delete("/{note_id}")
+async def delete_note(note_id: int, if_match: Optional[str] = Header(None), db: AsyncSession = Depends(get_async_db), current_user= Depends(get_current_user_async)):
+    deleted = await AsyncNoteService.delete_note(db, note_id, parse_if_match(if_match))
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Note not found")
+    return {"message": "Note deleted successfully"}
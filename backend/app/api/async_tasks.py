@@ -0,0 +1,128 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db import get_async_db, get_async_session_factory
+from app.services.async_task_service import AsyncTaskService
+from app.schemas.task_schemas import TaskCreate, TaskUpdate, TaskResponse, TaskPage, TaskListQuery
+from typing import List
+from typing import Optional
+from datetime import datetime
+from app.utils.export import ExportFormat, ExportEncoder, astream_export, export_response
+from app.utils.fast_json import list_response
+from app.utils.pagination import set_total_count
+from app.utils.etag import version_etag, parse_if_match, collection_etag, etag_matches, not_modified, set_cache_headers, CACHE_CONTROL
+from app.api.async_auth import get_current_user_async
+from app.utils.request_metrics import TimedRoute
+
+# Async versions of the routes in app.api.tasks, mounted when DB_ASYNC is enabled
+router = APIRouter(route_class=TimedRoute)
+
+@router.get("/", response_model=List[TaskResponse])
+async def get_tasks(
+    skip: int = 0,
+    limit: int = 100,
+    completed: Optional[bool] = None,
+    due_before: Optional[datetime] = None,
+    due_after: Optional[datetime] = None,
+    overdue: Optional[bool] = None,
+    sort: Optional[str] = Query(None, description="Comma-separated fields, - for descending, e.g. -priority,due_date"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,title,updated_at"),
+    preview_chars: Optional[int] = Query(None, ge=1, le=10000, description="Return only the first characters of description"),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db)
+):
+    query = TaskListQuery(completed=completed, due_before=due_before, due_after=due_after, overdue=overdue, sort=sort)
+    fieldset = AsyncTaskService.get_fieldset(fields, preview_chars)
+    # The total is part of the ETag: rows added past this page change it too
+    total, exact = await AsyncTaskService.count_tasks(db, query)
+    variant = f"{fieldset.key}#{total}"
+    # Conditional GET: compare against the cheap (id, version) fingerprint before loading rows
+    if if_none_match:
+        etag = collection_etag(await AsyncTaskService.get_task_versions(db, skip, limit, query), variant)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag, CACHE_CONTROL["list"])
+    
+    # Column rows validated and serialized in one pass, no ORM hydration; only the requested columns are read
+    rows = await AsyncTaskService.get_task_rows(db, skip, limit, query, fieldset.columns)
+    response = list_response(fieldset.adapter, rows)
+    set_cache_headers(response, collection_etag(((row["id"], row["version"]) for row in rows), variant), CACHE_CONTROL["list"])
+    set_total_count(response, total, exact)
+    return response
+
+@router.get("/page", response_model=TaskPage)
+async def get_tasks_page(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    completed: Optional[bool] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Keyset pagination: pass the returned next_cursor to fetch the following page
+    """
+    tasks, next_cursor = await AsyncTaskService.get_tasks_page(db, cursor, limit, completed)
+    set_cache_headers(response, None, CACHE_CONTROL["list"])
+    return {"items": tasks, "next_cursor": next_cursor}
+
+@router.get("/mine", response_model=List[TaskResponse])
+async def get_my_tasks(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    completed: Optional[bool] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user= Depends(get_current_user_async)
+):
+    """
+    Get tasks owned by the authenticated user, ordered by due date
+    """
+    set_cache_headers(response, None, CACHE_CONTROL["list"])
+    return await AsyncTaskService.get_user_tasks(db, current_user.id, skip, limit, completed)
+
+@router.get("/export")
+async def export_tasks(
+    format: ExportFormat = ExportFormat.ndjson,
+    completed: Optional[bool] = None,
+    user_id: Optional[int] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    session_factory= Depends(get_async_session_factory),
+    current_user= Depends(get_current_user_async)
+):
+    async def batches():
+        async with session_factory() as db:
+            async for batch in AsyncTaskService.iter_task_batches(db, completed=completed, user_id=user_id, created_from=created_from, created_to=created_to):
+                yield batch
+    
+    encoder = ExportEncoder(TaskResponse, format)
+    return export_response(astream_export(batches(), encoder), format, "tasks")
+
+@router.get("/{task_id}", response_model=TaskResponse)
+async def get_task(task_id: int, response: Response, if_none_match: Optional[str] = Header(None), db: AsyncSession = Depends(get_async_db)):
+    task = await AsyncTaskService.get_task(db, task_id)
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    etag = version_etag(task.version)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, CACHE_CONTROL["item"])
+    # Send back as If-Match to make an update/delete conditional
+    set_cache_headers(response, etag, CACHE_CONTROL["item"])
+    return task
+
+@router.post("/", response_model=TaskResponse)
+async def create_task(task: TaskCreate, db: AsyncSession = Depends(get_async_db), current_user= Depends(get_current_user_async)):
+    return await AsyncTaskService.create_task(db, task)
+
+@router.put("/{task_id}", response_model=TaskResponse)
+async def update_task(task_id: int, task: TaskUpdate, response: Response, if_match: Optional[str] = Header(None), db: AsyncSession = Depends(get_async_db), current_user= Depends(get_current_user_async)):
+    updated_task = await AsyncTaskService.update_task(db, task_id, task, parse_if_match(if_match))
+    if not updated_task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    response.headers["ETag"] = version_etag(updated_task.version)
+    return updated_task
+
+@router.delete("/{task_id}")
+async def delete_task(task_id: int, if_match: Optional[str] = Header(None), db: AsyncSession = Depends(get_async_db), current_user= Depends(get_current_user_async)):
+    deleted = await AsyncTaskService.delete_task(db, task_id, parse_if_match(if_match))
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return {"message": "Task deleted successfully"}
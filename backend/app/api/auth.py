@@ -1,12 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
-from app.db import get_db
+from app.db import get_db, get_read_db
 from app.services.auth_service import AuthService
 from app.schemas.user_schemas import UserCreate, UserResponse, UserLogin, Token
 from app.utils.auth import verify_token
+from app.utils.batch import batch_user
+from app.utils.request_metrics import TimedRoute
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 # OAuth2 scheme for token authentication
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
@@ -34,23 +36,11 @@ def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depend
     )
 
 @router.get("/me", response_model=UserResponse)
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_read_db)):
     """
     Get current user information from JWT token
     """
-    # Verify token and get username
-    token_data = verify_token(token)
-    
-    # Get user from database
-    user = AuthService.get_user_by_username(db, token_data.username)
-    if user is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    
-    return user
+    return get_current_user_dependency(token, db)
 
 # Dependency to get current user (for protecting endpoints)
 def get_current_user_dependency(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
@@ -58,12 +48,22 @@ def get_current_user_dependency(token: str = Depends(oauth2_scheme), db: Session
     Dependency function to get current authenticated user
     Use this to protect endpoints that require authentication
     """
+    # Sub-requests of a POST /batch reuse the user (or the error) the batch resolved for the same token
+    user = batch_user(token)
+    if user is not None:
+        return user
+    # Both lookups are cached, so most requests skip the JWT decode and the user query
     token_data = verify_token(token)
-    user = AuthService.get_user_by_username(db, token_data.username)
+    user = AuthService.get_authenticated_user(db, token_data.username)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    if not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="User account is disabled"
+        )
     return user
\ No newline at end of file
@@ -0,0 +1,52 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.security import OAuth2PasswordBearer
+from starlette.concurrency import run_in_threadpool
+from app.api.auth import get_current_user_dependency
+from app.db import get_session_factory
+from app.schemas.batch_schemas import BatchRequest, BatchResponse
+from app.services.batch_service import BatchService
+from app.utils.batch import BatchContext, current_batch
+from app.utils.request_metrics import TimedRoute
+
+router = APIRouter(route_class=TimedRoute)
+
+# The batch itself is open to anonymous callers (register, login); each operation enforces its own auth
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login", auto_error=False)
+
+def resolve_user(batch: BatchContext) -> None:
+    """
+    Look the batch's user up once for all its operations
+    A failure is kept too: operations report it without touching the shared session again
+    """
+    try:
+        batch.user = get_current_user_dependency(batch.token, batch.session)
+    except HTTPException as exc:
+        batch.auth_error = exc
+
+@router.post("", response_model=BatchResponse)
+async def run_batch(
+    batch_request: BatchRequest,
+    request: Request,
+    token: Optional[str] = Depends(optional_oauth2_scheme),
+    session_factory= Depends(get_session_factory)
+):
+    """
+    Run several /tasks, /notes and /auth requests in one round trip, in-process
+    Operations share one DB session and one user lookup; writes run in order, consecutive reads
+    run concurrently and their GET /tasks/{id}, /notes/{id} lookups collapse into one IN query.
+    Each operation gets its own status and body: one failing doesn't fail the batch
+    """
+    db = session_factory()
+    try:
+        batch = BatchContext(db, token)
+        if token:
+            await run_in_threadpool(resolve_user, batch)
+        reset = current_batch.set(batch)
+        try:
+            results = await BatchService.run(request, batch, batch_request.operations)
+        finally:
+            current_batch.reset(reset)
+    finally:
+        await run_in_threadpool(db.close)
+    return BatchResponse(results=results)
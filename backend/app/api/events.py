@@ -0,0 +1,67 @@
+import asyncio
+import os
+from fastapi import APIRouter, Header, Query
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, Optional
+from app.schemas.event_schemas import ChangeEvent, EventResource
+from app.services.event_service import Subscription, broadcaster
+from app.utils.sse import sse_message, sse_comment, sse_retry
+from app.utils.request_metrics import TimedRoute
+
+# Comment sent on idle streams so proxies and load balancers keep them open
+EVENTS_KEEPALIVE = float(os.getenv("EVENTS_KEEPALIVE", "15"))
+# Streams end after this long; EventSource reconnects with Last-Event-ID, which rebalances clients across workers
+EVENTS_MAX_DURATION = float(os.getenv("EVENTS_MAX_DURATION", "300"))
+EVENTS_RETRY_MS = int(os.getenv("EVENTS_RETRY_MS", "3000"))
+
+router = APIRouter(route_class=TimedRoute)
+
+def _event_message(event: ChangeEvent) -> str:
+    return sse_message(event.model_dump_json(exclude_none=True), f"{event.resource.value}.{event.action.value}", event.id)
+
+def _reset_message() -> str:
+    """Tells the client events were missed, refetch the lists"""
+    return sse_message("{}", "reset")
+
+async def _stream(resource: Optional[EventResource], user_id: Optional[int], last_event_id: Optional[str]) -> AsyncIterator[str]:
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + EVENTS_MAX_DURATION
+    # Subscribed here, not in the endpoint: the finally below only runs once the body has started,
+    # a client gone before that would otherwise leave its subscription behind
+    subscription = Subscription(loop, resource, user_id)
+    missed, reset = broadcaster.subscribe(subscription, last_event_id)
+    try:
+        yield sse_retry(EVENTS_RETRY_MS)
+        if reset:
+            yield _reset_message()
+        for event in missed:
+            yield _event_message(event)
+        
+        while (remaining := deadline - loop.time()) > 0:
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), min(EVENTS_KEEPALIVE, remaining))
+            except asyncio.TimeoutError:
+                if deadline - loop.time() > 0:
+                    yield sse_comment("keepalive")
+                continue
+            yield _event_message(event) if event is not None else _reset_message()
+    finally:
+        broadcaster.unsubscribe(subscription)
+
+@router.get("", response_class=StreamingResponse)
+async def stream_events(
+    resource: Optional[EventResource] = None,
+    user_id: Optional[int] = None,
+    since: Optional[str] = Query(None, description="Resume after this event id (EventSource sends Last-Event-ID itself)"),
+    last_event_id: Optional[str] = Header(None),
+):
+    """
+    Server-sent events for task and note changes, instead of polling the list endpoints
+    Filter by resource and/or owner; reconnect with Last-Event-ID to replay what was missed
+    A "reset" event means the missed events are no longer available: refetch the lists
+    """
+    return StreamingResponse(
+        _stream(resource, user_id, last_event_id or since),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,28 +1,173 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
-from app.db import get_db
+from app.db import get_db, get_read_db, get_session_factory
 from app.services.note_service import NoteService
-from app.schemas.note_schemas import NoteCreate, NoteUpdate, NoteResponse
-from typing import List
+from app.schemas.note_schemas import NoteCreate, NoteUpdate, NoteResponse, NotePage, NoteChanges, NoteBulkResult
+from app.schemas.bulk_schemas import BulkDeleteRequest, BulkDeleteResult
+from typing import Any, Dict, List
 from typing import Optional
+from datetime import datetime
+from app.utils.export import ExportFormat, ExportEncoder, stream_export, export_response
+from app.utils.importer import iter_records
+from app.services.import_service import ImportService
+from app.schemas.import_schemas import ImportProgress
+from app.utils.fast_json import list_response
+from app.utils.pagination import set_total_count
+from app.utils.etag import version_etag, parse_if_match, collection_etag, etag_matches, not_modified, set_cache_headers, CACHE_CONTROL
 from app.api.auth import get_current_user_dependency
+from app.utils.request_metrics import TimedRoute
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 @router.get("/", response_model=List[NoteResponse])
 def get_notes(
     skip: int = 0,
     limit: int = 100,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,title,updated_at"),
+    preview_chars: Optional[int] = Query(None, ge=1, le=10000, description="Return only the first characters of content"),
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_read_db)
+):
+    fieldset = NoteService.get_fieldset(fields, preview_chars)
+    # The total is part of the ETag: rows added past this page change it too
+    total, exact = NoteService.count_notes(db)
+    variant = f"{fieldset.key}#{total}"
+    # Conditional GET: compare against the cheap (id, version) fingerprint before loading rows
+    if if_none_match:
+        etag = collection_etag(NoteService.get_note_versions(db, skip, limit), variant)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag, CACHE_CONTROL["list"])
+    
+    # Column rows validated and serialized in one pass, no ORM hydration; only the requested columns are read
+    rows = NoteService.get_note_rows(db, skip, limit, fieldset.columns)
+    response = list_response(fieldset.adapter, rows)
+    set_cache_headers(response, collection_etag(((row["id"], row["version"]) for row in rows), variant), CACHE_CONTROL["list"])
+    set_total_count(response, total, exact)
+    return response
+
+@router.get("/page", response_model=NotePage)
+def get_notes_page(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Keyset pagination: pass the returned next_cursor to fetch the following page
+    """
+    notes, next_cursor = NoteService.get_notes_page(db, cursor, limit)
+    set_cache_headers(response, None, CACHE_CONTROL["list"])
+    return {"items": notes, "next_cursor": next_cursor}
+
+@router.get("/changes", response_model=NoteChanges)
+def get_note_changes(
+    response: Response,
+    since: Optional[str] = None,
+    limit: int = Query(500, ge=1, le=5000),
+    user_id: Optional[int] = None,
     db: Session = Depends(get_db)
 ):
-    notes = NoteService.get_notes(db, skip, limit)
-    return notes
+    """
+    Incremental sync: notes created/updated and ids deleted since the token
+    Omit since for a full sync, then keep passing the returned next; call again while has_more
+    Apply deleted before items; changes from the last few seconds may be sent twice (compare versions)
+    """
+    set_cache_headers(response, None, CACHE_CONTROL["list"])
+    return NoteService.get_note_changes(db, since, limit, user_id)
+
+@router.get("/mine", response_model=List[NoteResponse])
+def get_my_notes(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_db),
+    current_user= Depends(get_current_user_dependency)
+):
+    """
+    Get notes owned by the authenticated user
+    """
+    set_cache_headers(response, None, CACHE_CONTROL["list"])
+    return NoteService.get_user_notes(db, current_user.id, skip, limit)
+
+@router.get("/export")
+def export_notes(
+    format: ExportFormat = ExportFormat.ndjson,
+    user_id: Optional[int] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    session_factory= Depends(get_session_factory),
+    current_user= Depends(get_current_user_dependency)
+):
+    """
+    Stream every matching note as NDJSON or CSV
+    Filters: `user_id`, `created_from` (inclusive) and `created_to` (exclusive)
+    """
+    def batches():
+        with session_factory() as db:
+            yield from NoteService.iter_note_batches(db, user_id=user_id, created_from=created_from, created_to=created_to)
+    
+    encoder = ExportEncoder(NoteResponse, format)
+    return export_response(stream_export(batches(), encoder), format, "notes")
+
+@router.post("/import", response_model=ImportProgress)
+async def import_notes(
+    request: Request,
+    format: ExportFormat = ExportFormat.ndjson,
+    import_id: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user= Depends(get_current_user_dependency)
+):
+    """
+    Load a streamed NDJSON or CSV upload (the raw request body, same layout as the export)
+    Rows are validated and committed in chunks; the summary lists rejected rows
+    Pass import_id to poll GET /notes/import/{import_id} while the upload runs (409 if one of
+    your imports with that id is still running)
+    """
+    progress = ImportService.start(current_user.id, import_id)
+    return await NoteService.import_notes(db, iter_records(request.stream(), format), progress)
+
+@router.get("/import/{import_id}", response_model=ImportProgress)
+def get_note_import(import_id: str, current_user= Depends(get_current_user_dependency)):
+    progress = ImportService.get_progress(current_user.id, import_id)
+    if not progress:
+        raise HTTPException(status_code=404, detail="Import not found")
+    return progress
+
+@router.post("/bulk", response_model=NoteBulkResult)
+def bulk_create_notes(rows: List[Dict[str, Any]] = Body(...), db: Session = Depends(get_db), current_user= Depends(get_current_user_dependency)):
+    """
+    Create many notes in one transaction
+    Rows are validated one by one; invalid rows are reported in errors
+    """
+    notes, errors = NoteService.bulk_create_notes(db, rows)
+    return {"items": notes, "errors": errors}
+
+@router.patch("/bulk", response_model=NoteBulkResult)
+def bulk_update_notes(rows: List[Dict[str, Any]] = Body(...), db: Session = Depends(get_db), current_user= Depends(get_current_user_dependency)):
+    """
+    Update many notes in one transaction, each row is {"id": ..., <fields to change>}
+    """
+    notes, errors = NoteService.bulk_update_notes(db, rows)
+    return {"items": notes, "errors": errors}
+
+@router.delete("/bulk", response_model=BulkDeleteResult)
+def bulk_delete_notes(request: BulkDeleteRequest, db: Session = Depends(get_db), current_user= Depends(get_current_user_dependency)):
+    """
+    Delete many notes in one transaction
+    """
+    deleted, errors = NoteService.bulk_delete_notes(db, request.ids)
+    return {"deleted": deleted, "errors": errors}
 
 @router.get("/{note_id}", response_model=NoteResponse)
-def get_note(note_id: int, db: Session = Depends(get_db)):
+def get_note(note_id: int, response: Response, if_none_match: Optional[str] = Header(None), db: Session = Depends(get_read_db)):
     note = NoteService.get_note(db, note_id)
     if not note:
         raise HTTPException(status_code=404, detail="Note not found")
+    etag = version_etag(note.version)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, CACHE_CONTROL["item"])
+    # Send back as If-Match to make an update/delete conditional
+    set_cache_headers(response, etag, CACHE_CONTROL["item"])
     return note
 
 @router.post("/", response_model=NoteResponse)
@@ -30,15 +175,16 @@ def create_note(note: NoteCreate, db: Session = Depends(get_db), current_user= D
     return NoteService.create_note(db, note)
 
 @router.put("/{note_id}", response_model=NoteResponse)
-def update_note(note_id: int, note: NoteUpdate, db: Session = Depends(get_db), current_user= Depends(get_current_user_dependency)):
-    updated_note = NoteService.update_note(db, note_id, note)
+def update_note(note_id: int, note: NoteUpdate, response: Response, if_match: Optional[str] = Header(None), db: Session = Depends(get_db), current_user= Depends(get_current_user_dependency)):
+    updated_note = NoteService.update_note(db, note_id, note, parse_if_match(if_match))
     if not updated_note:
         raise HTTPException(status_code=404, detail="Note not found")
+    response.headers["ETag"] = version_etag(updated_note.version)
     return updated_note
 
 @router.delete("/{note_id}")
-def delete_note(note_id: int, db: Session = Depends(get_db), current_user= Depends(get_current_user_dependency)):
-    deleted = NoteService.delete_note(db, note_id)
+def delete_note(note_id: int, if_match: Optional[str] = Header(None), db: Session = Depends(get_db), current_user= Depends(get_current_user_dependency)):
+    deleted = NoteService.delete_note(db, note_id, parse_if_match(if_match))
     if not deleted:
         raise HTTPException(status_code=404, detail="Note not found")
     return {"message": "Note deleted successfully"}
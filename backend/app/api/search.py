@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.orm import Session
+from typing import Optional
+from app.db import get_db
+from app.services.search_service import SearchService
+from app.schemas.search_schemas import SearchResponse, SearchType
+from app.utils.etag import set_cache_headers, CACHE_CONTROL
+from app.utils.request_metrics import TimedRoute
+
+router = APIRouter(route_class=TimedRoute)
+
+@router.get("", response_model=SearchResponse)
+def search(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    type: Optional[SearchType] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """
+    Full-text search across tasks and notes, best matches first
+    """
+    set_cache_headers(response, None, CACHE_CONTROL["search"])
+    return {"query": q, "results": SearchService.search(db, q, limit, type)}
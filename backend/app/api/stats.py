@@ -0,0 +1,34 @@
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.orm import Session
+from app.db import get_db
+from app.services.stats_service import StatsService, ALL_SCOPE
+from app.schemas.stats_schemas import DashboardStats
+from app.utils.etag import set_cache_headers, CACHE_CONTROL
+from app.api.auth import get_current_user_dependency
+from app.utils.request_metrics import TimedRoute
+
+router = APIRouter(route_class=TimedRoute)
+
+@router.get("", response_model=DashboardStats, response_model_exclude_none=True)
+def get_stats(
+    response: Response,
+    top_users: int = Query(10, ge=0, le=100),
+    db: Session = Depends(get_db)
+):
+    """
+    Dashboard totals across all tasks and notes, read from precomputed counters
+    """
+    set_cache_headers(response, None, CACHE_CONTROL["stats"])
+    return StatsService.get_stats(db, ALL_SCOPE, top_users)
+
+@router.get("/me", response_model=DashboardStats, response_model_exclude_none=True)
+def get_my_stats(
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user= Depends(get_current_user_dependency)
+):
+    """
+    Dashboard totals for the authenticated user's tasks and notes
+    """
+    set_cache_headers(response, None, CACHE_CONTROL["stats"])
+    return StatsService.get_stats(db, current_user.id)
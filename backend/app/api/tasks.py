@@ -1,30 +1,196 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
-from app.db import get_db
+from app.db import get_db, get_read_db, get_session_factory
 from app.services.task_service import TaskService
-from app.schemas.task_schemas import TaskCreate, TaskUpdate, TaskResponse
-from typing import List
+from app.schemas.task_schemas import TaskCreate, TaskUpdate, TaskResponse, TaskPage, TaskChanges, TaskListQuery, task_list_adapter, TaskBulkResult
+from app.schemas.bulk_schemas import BulkDeleteRequest, BulkDeleteResult
+from typing import Any, Dict, List
 from typing import Optional
+from datetime import datetime
+from app.utils.export import ExportFormat, ExportEncoder, stream_export, export_response
+from app.utils.importer import iter_records
+from app.services.import_service import ImportService
+from app.schemas.import_schemas import ImportProgress
+from app.utils.fast_json import list_response
+from app.utils.pagination import set_total_count
+from app.utils.etag import version_etag, parse_if_match, collection_etag, etag_matches, not_modified, set_cache_headers, CACHE_CONTROL
 from app.api.auth import get_current_user_dependency
+from app.utils.request_metrics import TimedRoute
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 @router.get("/", response_model=List[TaskResponse])
 def get_tasks(
+    skip: int = 0,
+    limit: int = 100,
+    completed: Optional[bool] = None,
+    due_before: Optional[datetime] = None,
+    due_after: Optional[datetime] = None,
+    overdue: Optional[bool] = None,
+    sort: Optional[str] = Query(None, description="Comma-separated fields, - for descending, e.g. -priority,due_date"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,title,updated_at"),
+    preview_chars: Optional[int] = Query(None, ge=1, le=10000, description="Return only the first characters of description"),
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_read_db)
+):
+    query = TaskListQuery(completed=completed, due_before=due_before, due_after=due_after, overdue=overdue, sort=sort)
+    fieldset = TaskService.get_fieldset(fields, preview_chars)
+    # The total is part of the ETag: rows added past this page change it too
+    total, exact = TaskService.count_tasks(db, query)
+    variant = f"{fieldset.key}#{total}"
+    # Conditional GET: compare against the cheap (id, version) fingerprint before loading rows
+    if if_none_match:
+        etag = collection_etag(TaskService.get_task_versions(db, skip, limit, query), variant)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag, CACHE_CONTROL["list"])
+    
+    # Column rows validated and serialized in one pass, no ORM hydration; only the requested columns are read
+    rows = TaskService.get_task_rows(db, skip, limit, query, fieldset.columns)
+    response = list_response(fieldset.adapter, rows)
+    set_cache_headers(response, collection_etag(((row["id"], row["version"]) for row in rows), variant), CACHE_CONTROL["list"])
+    set_total_count(response, total, exact)
+    return response
+
+@router.get("/page", response_model=TaskPage)
+def get_tasks_page(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    completed: Optional[bool] = None,
+    db: Session = Depends(get_read_db)
+):
+    """
+    Keyset pagination: pass the returned next_cursor to fetch the following page
+    """
+    tasks, next_cursor = TaskService.get_tasks_page(db, cursor, limit, completed)
+    set_cache_headers(response, None, CACHE_CONTROL["list"])
+    return {"items": tasks, "next_cursor": next_cursor}
+
+@router.get("/changes", response_model=TaskChanges)
+def get_task_changes(
+    response: Response,
+    since: Optional[str] = None,
+    limit: int = Query(500, ge=1, le=5000),
+    user_id: Optional[int] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Incremental sync: tasks created/updated and ids deleted since the token
+    Omit since for a full sync, then keep passing the returned next; call again while has_more
+    Apply deleted before items; changes from the last few seconds may be sent twice (compare versions)
+    """
+    set_cache_headers(response, None, CACHE_CONTROL["list"])
+    return TaskService.get_task_changes(db, since, limit, user_id)
+
+@router.get("/queue", response_model=List[TaskResponse])
+def get_task_queue(
+    limit: int = Query(20, ge=1, le=200),
+    user_id: Optional[int] = None,
+    db: Session = Depends(get_read_db)
+):
+    """
+    What to do next: open tasks by priority (high first), then nearest due date, undated last
+    Read in index order from ix_tasks_queue, so only the returned rows are touched
+    """
+    response = list_response(task_list_adapter, TaskService.get_queue(db, limit, user_id))
+    set_cache_headers(response, None, CACHE_CONTROL["list"])
+    return response
+
+@router.get("/mine", response_model=List[TaskResponse])
+def get_my_tasks(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     completed: Optional[bool] = None,
     db: Session = Depends(get_db),
-   
+    current_user= Depends(get_current_user_dependency)
+):
+    """
+    Get tasks owned by the authenticated user, ordered by due date
+    """
+    set_cache_headers(response, None, CACHE_CONTROL["list"])
+    return TaskService.get_user_tasks(db, current_user.id, skip, limit, completed)
+
+@router.get("/export")
+def export_tasks(
+    format: ExportFormat = ExportFormat.ndjson,
+    completed: Optional[bool] = None,
+    user_id: Optional[int] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    session_factory= Depends(get_session_factory),
+    current_user= Depends(get_current_user_dependency)
 ):
-    tasks = TaskService.get_tasks(db, skip, limit, completed)
-    return tasks
+    """
+    Stream every matching task as NDJSON or CSV
+    Filters: `completed`, `user_id`, `created_from` (inclusive) and `created_to` (exclusive)
+    """
+    def batches():
+        with session_factory() as db:
+            yield from TaskService.iter_task_batches(db, completed=completed, user_id=user_id, created_from=created_from, created_to=created_to)
+    
+    encoder = ExportEncoder(TaskResponse, format)
+    return export_response(stream_export(batches(), encoder), format, "tasks")
+
+@router.post("/import", response_model=ImportProgress)
+async def import_tasks(
+    request: Request,
+    format: ExportFormat = ExportFormat.ndjson,
+    import_id: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user= Depends(get_current_user_dependency)
+):
+    """
+    Load a streamed NDJSON or CSV upload (the raw request body, same layout as the export)
+    Rows are validated and committed in chunks; the summary lists rejected rows
+    Pass import_id to poll GET /tasks/import/{import_id} while the upload runs (409 if one of
+    your imports with that id is still running)
+    """
+    progress = ImportService.start(current_user.id, import_id)
+    return await TaskService.import_tasks(db, iter_records(request.stream(), format), progress)
+
+@router.get("/import/{import_id}", response_model=ImportProgress)
+def get_task_import(import_id: str, current_user= Depends(get_current_user_dependency)):
+    progress = ImportService.get_progress(current_user.id, import_id)
+    if not progress:
+        raise HTTPException(status_code=404, detail="Import not found")
+    return progress
+
+@router.post("/bulk", response_model=TaskBulkResult)
+def bulk_create_tasks(rows: List[Dict[str, Any]] = Body(...), db: Session = Depends(get_db), current_user= Depends(get_current_user_dependency)):
+    """
+    Create many tasks in one transaction
+    Rows are validated one by one; invalid rows are reported in errors
+    """
+    tasks, errors = TaskService.bulk_create_tasks(db, rows)
+    return {"items": tasks, "errors": errors}
+
+@router.patch("/bulk", response_model=TaskBulkResult)
+def bulk_update_tasks(rows: List[Dict[str, Any]] = Body(...), db: Session = Depends(get_db), current_user= Depends(get_current_user_dependency)):
+    """
+    Update many tasks in one transaction, each row is {"id": ..., <fields to change>}
+    """
+    tasks, errors = TaskService.bulk_update_tasks(db, rows)
+    return {"items": tasks, "errors": errors}
+
+@router.delete("/bulk", response_model=BulkDeleteResult)
+def bulk_delete_tasks(request: BulkDeleteRequest, db: Session = Depends(get_db), current_user= Depends(get_current_user_dependency)):
+    """
+    Delete many tasks in one transaction
+    """
+    deleted, errors = TaskService.bulk_delete_tasks(db, request.ids)
+    return {"deleted": deleted, "errors": errors}
 
 @router.get("/{task_id}", response_model=TaskResponse)
-def get_task(task_id: int, db: Session = Depends(get_db)):
+def get_task(task_id: int, response: Response, if_none_match: Optional[str] = Header(None), db: Session = Depends(get_read_db)):
     task = TaskService.get_task(db, task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
+    etag = version_etag(task.version)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, CACHE_CONTROL["item"])
+    # Send back as If-Match to make an update/delete conditional
+    set_cache_headers(response, etag, CACHE_CONTROL["item"])
     return task
 
 @router.post("/", response_model=TaskResponse)
@@ -32,15 +198,16 @@ def create_task(task: TaskCreate, db: Session = Depends(get_db), current_user= D
     return TaskService.create_task(db, task)
 
 @router.put("/{task_id}", response_model=TaskResponse)
-def update_task(task_id: int, task: TaskUpdate, db: Session = Depends(get_db), current_user= Depends(get_current_user_dependency)):
-    updated_task = TaskService.update_task(db, task_id, task)
+def update_task(task_id: int, task: TaskUpdate, response: Response, if_match: Optional[str] = Header(None), db: Session = Depends(get_db), current_user= Depends(get_current_user_dependency)):
+    updated_task = TaskService.update_task(db, task_id, task, parse_if_match(if_match))
     if not updated_task:
         raise HTTPException(status_code=404, detail="Task not found")
+    response.headers["ETag"] = version_etag(updated_task.version)
     return updated_task
 
 @router.delete("/{task_id}")
-def delete_task(task_id: int, db: Session = Depends(get_db), current_user= Depends(get_current_user_dependency)):
-    deleted = TaskService.delete_task(db, task_id)
+def delete_task(task_id: int, if_match: Optional[str] = Header(None), db: Session = Depends(get_db), current_user= Depends(get_current_user_dependency)):
+    deleted = TaskService.delete_task(db, task_id, parse_if_match(if_match))
     if not deleted:
         raise HTTPException(status_code=404, detail="Task not found")
     return {"message": "Task deleted successfully"}
@@ -1,7 +1,13 @@
+from fastapi import Request
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
+from app.utils.batch import current_batch
+from app.utils.db_metrics import PoolStats, TimedQueuePool, TimedAsyncAdaptedQueuePool, attach_query_timer
+from app.utils.replicas import ReplicaRouter
 import os
 
 # Only load .env file if not in container (for local development)
@@ -10,21 +16,119 @@ if not os.getenv("DOCKER_CONTAINER"):
 
 SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL")
 
+# Set DB_ASYNC=true to serve the core routes from the async engine instead of the sync one
+DB_ASYNC = os.getenv("DB_ASYNC", "false").lower() == "true"
 
+# Async drivers used when no explicit ASYNC_DATABASE_URL is given
+ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
 
+def get_async_database_url(url: str) -> str:
+    """
+    Map a sync database URL onto its async driver
+    e.g. postgresql://... -> postgresql+asyncpg://...
+    """
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    return parsed.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(hide_password=False)
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+# Connection pool settings, per worker process: size the pool so that
+# workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) stays below Postgres max_connections
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+
+def get_pool_options(url: str, poolclass=TimedQueuePool) -> dict:
+    """
+    create_engine keyword arguments for the configured pool
+    SQLite keeps its default pool, only pre-ping applies there
+    """
+    if make_url(url).get_backend_name() == "sqlite":
+        return {"pool_pre_ping": DB_POOL_PRE_PING}
+    return {
+        "poolclass": poolclass,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **get_pool_options(SQLALCHEMY_DATABASE_URL))
+
+# Live pool statistics, served by /health/db
+pool_stats = PoolStats()
+pool_stats.attach(engine)
+# Per-request SQL time and query count (Server-Timing, /metrics)
+attach_query_timer(engine)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Read replicas (comma-separated URLs) serving the read-only routes through get_read_db
+DATABASE_REPLICA_URLS = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+replica_engines = [create_engine(url, **get_pool_options(url)) for url in DATABASE_REPLICA_URLS]
+for replica_engine in replica_engines:
+    attach_query_timer(replica_engine)
+read_router = ReplicaRouter(SessionLocal, replica_engines)
+
+# The async engine is only built in async mode so the sync path never needs the async drivers
+async_engine = None
+async_pool_stats = PoolStats()
+if DB_ASYNC:
+    ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or get_async_database_url(SQLALCHEMY_DATABASE_URL)
+    async_engine = create_async_engine(ASYNC_DATABASE_URL, **get_pool_options(ASYNC_DATABASE_URL, TimedAsyncAdaptedQueuePool))
+    async_pool_stats.attach(async_engine.sync_engine)
+    attach_query_timer(async_engine.sync_engine)
+
+# expire_on_commit=False: attributes can't be lazy-loaded outside the event loop after commit
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
-def get_db():
+def get_db(request: Request):
+    # Writes go through here: keep this client's reads on the primary for a while
+    read_router.mark_write(request)
+    batch = current_batch.get()
+    if batch is not None:
+        # A POST /batch sub-request: the batch owns and closes the session
+        yield batch.session
+        return
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
 
+def get_read_db(request: Request):
+    """
+    Session for read-only routes: a replica when one is configured and healthy,
+    the primary right after this client wrote or when every replica is down or lagging
+    """
+    batch = current_batch.get()
+    if batch is not None:
+        yield batch.session
+        return
+    db = read_router.read_session(request)
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+def get_session_factory():
+    """
+    Session factory for streaming responses
+    Dependencies with yield are closed before the body is streamed, so generators open their own session
+    """
+    return SessionLocal
+
+def get_async_session_factory():
+    """Async counterpart of get_session_factory"""
+    return AsyncSessionLocal
+
 def create_tables():
     Base.metadata.create_all(bind=engine)
\ No newline at end of file
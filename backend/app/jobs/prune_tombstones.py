@@ -0,0 +1,27 @@
+"""
+Remove deletion-log entries older than the sync retention
+
+Usage (from backend/):
+    python -m app.jobs.prune_tombstones              # SYNC_RETENTION_DAYS (default 30)
+    python -m app.jobs.prune_tombstones --days 7
+
+Clients holding a sync token older than the retention get 410 from the changes
+endpoints and refetch everything, so run this with the same retention the API uses.
+"""
+import argparse
+import sys
+from app.db import SessionLocal
+from app.services.sync_service import SyncService, SYNC_RETENTION_DAYS
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=SYNC_RETENTION_DAYS, help="keep tombstones this many days")
+    args = parser.parse_args(argv)
+
+    with SessionLocal() as db:
+        removed = SyncService.prune_tombstones(db, args.days)
+    print(f"removed {removed} tombstones older than {args.days} days")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,7 @@
 from .task_model import Task
 from .user import User
 from .note_model import Note
+from .stats_model import StatCounter, TaskDueCounter
+from .tombstone_model import Tombstone
 
-__all__ = ["Task", "User", "Note"]
\ No newline at end of file
+__all__ = ["Task", "User", "Note", "StatCounter", "TaskDueCounter", "Tombstone"]
@@ -0,0 +1,26 @@
+from typing import Sequence
+from sqlalchemy import DDL, Table, event
+
+def register_sqlite_fts(table: Table, columns: Sequence[str]) -> None:
+    """
+    Keep an FTS5 index of a table's text columns on SQLite (table_name + "_fts")
+    Postgres uses the generated search_vector columns and GIN indexes from the migrations instead
+    """
+    fts = f"{table.name}_fts"
+    cols = ", ".join(columns)
+    new_values = ", ".join(f"new.{column}" for column in columns)
+    old_values = ", ".join(f"old.{column}" for column in columns)
+    statements = [
+        # External content table: the text lives in the base table only
+        f"CREATE VIRTUAL TABLE {fts} USING fts5({cols}, content='{table.name}', content_rowid='id')",
+        f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {table.name} BEGIN "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_values}); END",
+        f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {table.name} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_values}); END",
+        f"CREATE TRIGGER {fts}_au AFTER UPDATE OF {cols} ON {table.name} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_values}); "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_values}); END",
+    ]
+    for statement in statements:
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+    event.listen(table, "before_drop", DDL(f"DROP TABLE IF EXISTS {fts}").execute_if(dialect="sqlite"))
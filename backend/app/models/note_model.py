@@ -1,6 +1,8 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Text, Enum
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Text, Enum, Index
 from sqlalchemy.sql import func
 from app.db import Base
+from app.models.fts import register_sqlite_fts
+from datetime import datetime, timezone
 import enum
 
 class Note(Base):
@@ -10,5 +12,20 @@ class Note(Base):
     title = Column(String(255), nullable=True, index=True)
     content = Column(Text, nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
\ No newline at end of file
+    # Bumped by every update, drives If-Match optimistic concurrency
+    version = Column(Integer, default=1, server_default="1", nullable=False)
+    # Python-side defaults keep sub-second precision on every backend so (created_at, id) and (updated_at, id) are stable sort keys
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        # Keyset pagination order for GET /notes/page
+        Index("ix_notes_created_at_id", "created_at", "id"),
+        # Incremental sync: GET /notes/changes walks (updated_at, id)
+        Index("ix_notes_updated_at_id", "updated_at", "id"),
+        # Owner-scoped listings ordered by creation time
+        Index("ix_notes_user_id_created_at", "user_id", "created_at"),
+    )
+
+# Full-text search on SQLite; Postgres has a generated search_vector column (see migrations)
+register_sqlite_fts(Note.__table__, ["title", "content"])
@@ -0,0 +1,76 @@
+from sqlalchemy import Column, Integer, Date, DDL, event
+from app.db import Base
+
+class StatCounter(Base):
+    """
+    Precomputed dashboard counters per scope: 0 for all rows, otherwise a user id
+    Kept up to date by database triggers on tasks and notes, so every write path (ORM, bulk,
+    COPY imports, raw SQL) is counted; rebuilt by app.jobs.stats_consistency
+    A scope's value is the sum over its shards: on Postgres every write touches scope 0, so its
+    deltas are spread over several rows by backend pid instead of queueing on one row lock
+    """
+    __tablename__ = "stat_counters"
+
+    scope = Column(Integer, primary_key=True, autoincrement=False)
+    shard = Column(Integer, primary_key=True, autoincrement=False, default=0, server_default="0")
+    tasks_total = Column(Integer, default=0, server_default="0", nullable=False)
+    tasks_completed = Column(Integer, default=0, server_default="0", nullable=False)
+    tasks_low = Column(Integer, default=0, server_default="0", nullable=False)
+    tasks_medium = Column(Integer, default=0, server_default="0", nullable=False)
+    tasks_high = Column(Integer, default=0, server_default="0", nullable=False)
+    notes_total = Column(Integer, default=0, server_default="0", nullable=False)
+
+class TaskDueCounter(Base):
+    """Open tasks per scope and due day, sharded like StatCounter; overdue = sum of the days before today"""
+    __tablename__ = "task_due_counters"
+
+    scope = Column(Integer, primary_key=True, autoincrement=False)
+    due_day = Column(Date, primary_key=True)
+    shard = Column(Integer, primary_key=True, autoincrement=False, default=0, server_default="0")
+    open_count = Column(Integer, default=0, server_default="0", nullable=False)
+
+def _sqlite_task_delta(ref: str, sign: int) -> str:
+    """Statements adding (sign=1) or removing (sign=-1) the task row `ref` (new/old) from the counters"""
+    scopes = f"(SELECT 0 AS scope UNION ALL SELECT {ref}.user_id WHERE {ref}.user_id IS NOT NULL)"
+    
+    def priority(value: str) -> str:
+        return f"{sign} * coalesce({ref}.priority = '{value}', 0)"
+    
+    return (
+        "INSERT INTO stat_counters (scope, tasks_total, tasks_completed, tasks_low, tasks_medium, tasks_high, notes_total) "
+        f"SELECT scope, {sign}, {sign} * {ref}.completed, {priority('low')}, {priority('medium')}, {priority('high')}, 0 "
+        f"FROM {scopes} WHERE true "
+        "ON CONFLICT (scope, shard) DO UPDATE SET "
+        "tasks_total = tasks_total + excluded.tasks_total, "
+        "tasks_completed = tasks_completed + excluded.tasks_completed, "
+        "tasks_low = tasks_low + excluded.tasks_low, "
+        "tasks_medium = tasks_medium + excluded.tasks_medium, "
+        "tasks_high = tasks_high + excluded.tasks_high; "
+        "INSERT INTO task_due_counters (scope, due_day, open_count) "
+        f"SELECT scope, date({ref}.due_date), {sign} FROM {scopes} "
+        f"WHERE NOT {ref}.completed AND {ref}.due_date IS NOT NULL "
+        "ON CONFLICT (scope, due_day, shard) DO UPDATE SET open_count = open_count + excluded.open_count; "
+    )
+
+def _sqlite_note_delta(ref: str, sign: int) -> str:
+    scopes = f"(SELECT 0 AS scope UNION ALL SELECT {ref}.user_id WHERE {ref}.user_id IS NOT NULL)"
+    return (
+        "INSERT INTO stat_counters (scope, tasks_total, tasks_completed, tasks_low, tasks_medium, tasks_high, notes_total) "
+        f"SELECT scope, 0, 0, 0, 0, 0, {sign} FROM {scopes} WHERE true "
+        "ON CONFLICT (scope, shard) DO UPDATE SET notes_total = notes_total + excluded.notes_total; "
+    )
+
+# SQLite triggers, created once every table exists; Postgres uses statement-level triggers from the migrations
+# SQLite has a single writer, so everything goes to shard 0
+_SQLITE_TRIGGERS = [
+    f"CREATE TRIGGER IF NOT EXISTS tasks_stats_ai AFTER INSERT ON tasks BEGIN {_sqlite_task_delta('new', 1)}END",
+    f"CREATE TRIGGER IF NOT EXISTS tasks_stats_ad AFTER DELETE ON tasks BEGIN {_sqlite_task_delta('old', -1)}END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_stats_au AFTER UPDATE OF completed, priority, due_date, user_id ON tasks "
+    f"BEGIN {_sqlite_task_delta('old', -1)}{_sqlite_task_delta('new', 1)}END",
+    f"CREATE TRIGGER IF NOT EXISTS notes_stats_ai AFTER INSERT ON notes BEGIN {_sqlite_note_delta('new', 1)}END",
+    f"CREATE TRIGGER IF NOT EXISTS notes_stats_ad AFTER DELETE ON notes BEGIN {_sqlite_note_delta('old', -1)}END",
+    "CREATE TRIGGER IF NOT EXISTS notes_stats_au AFTER UPDATE OF user_id ON notes "
+    f"BEGIN {_sqlite_note_delta('old', -1)}{_sqlite_note_delta('new', 1)}END",
+]
+for statement in _SQLITE_TRIGGERS:
+    event.listen(Base.metadata, "after_create", DDL(statement).execute_if(dialect="sqlite"))
@@ -1,6 +1,8 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Text, Enum
-from sqlalchemy.sql import func
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Text, Enum, Index
+from sqlalchemy.sql import func, text
 from app.db import Base
+from app.models.fts import register_sqlite_fts
+from datetime import datetime, timezone
 import enum
 
 class PriorityEnum(enum.Enum):
@@ -18,5 +20,36 @@ class Task(Base):
     priority = Column(Enum(PriorityEnum), default=PriorityEnum.medium, nullable=True)
     due_date = Column(DateTime, nullable=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
\ No newline at end of file
+    # Bumped by every update, drives If-Match optimistic concurrency
+    version = Column(Integer, default=1, server_default="1", nullable=False)
+    # Python-side defaults keep sub-second precision on every backend so (created_at, id) and (updated_at, id) are stable sort keys
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        # Keyset pagination order for GET /tasks/page
+        Index("ix_tasks_created_at_id", "created_at", "id"),
+        # Incremental sync: GET /tasks/changes walks (updated_at, id)
+        Index("ix_tasks_updated_at_id", "updated_at", "id"),
+        # Owner-scoped listings filtered by completion (open tasks included) and ordered by due date
+        Index("ix_tasks_user_id_completed_due_date", "user_id", "completed", "due_date"),
+        # GET /tasks/?completed= across all owners, read in the default (id) order
+        Index("ix_tasks_completed_id", "completed", "id"),
+        # GET /tasks/queue: open tasks per priority in due date order, read bucket by bucket without sorting
+        Index(
+            "ix_tasks_queue", "priority", "due_date", "id",
+            postgresql_where=text("completed = false"),
+            sqlite_where=text("completed = 0"),
+        ),
+        # Per-user work queue (GET /tasks/queue?user_id=): the same walk within one user's open tasks
+        # completed is constant here; leading with it after user_id makes SQLite prefer this index
+        # over ix_tasks_user_id_completed_due_date
+        Index(
+            "ix_tasks_queue_user", "user_id", "completed", "priority", "due_date", "id",
+            postgresql_where=text("completed = false"),
+            sqlite_where=text("completed = 0"),
+        ),
+    )
+
+# Full-text search on SQLite; Postgres has a generated search_vector column (see migrations)
+register_sqlite_fts(Task.__table__, ["title", "description"])
@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, String, DateTime, Index, DDL, event
+from sqlalchemy.sql import func
+from app.db import Base
+
+class Tombstone(Base):
+    """
+    Deletion log behind GET /tasks/changes and /notes/changes, so hard deletes still reach syncing clients
+    Written by database triggers on every delete path; pruned by app.jobs.prune_tombstones
+    """
+    __tablename__ = "tombstones"
+
+    id = Column(Integer, primary_key=True)
+    resource = Column(String(16), nullable=False)
+    item_id = Column(Integer, nullable=False)
+    user_id = Column(Integer, nullable=True)
+    deleted_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        # Keyset order of the deletions returned by the changes endpoints
+        Index("ix_tombstones_resource_deleted_at_id", "resource", "deleted_at", "id"),
+    )
+
+# SQLite triggers, same timestamp format (microseconds, UTC) as the values SQLAlchemy writes to updated_at
+# (DDL applies %-formatting, hence %%);
+# Postgres uses statement-level triggers from the migrations
+for table, resource in (("tasks", "task"), ("notes", "note")):
+    event.listen(Base.metadata, "after_create", DDL(
+        f"CREATE TRIGGER IF NOT EXISTS {table}_tombstones_ad AFTER DELETE ON {table} BEGIN "
+        "INSERT INTO tombstones (resource, item_id, user_id, deleted_at) "
+        f"VALUES ('{resource}', old.id, old.user_id, strftime('%%Y-%%m-%%d %%H:%%M:%%f', 'now') || '000'); END"
+    ).execute_if(dialect="sqlite"))
@@ -0,0 +1,22 @@
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Literal, Optional
+from app.utils.batch import BATCH_MAX_OPERATIONS
+
+class BatchOperation(BaseModel):
+    id: Optional[str] = Field(None, description="Client reference, echoed back in the result")
+    method: Literal["GET", "POST", "PUT", "PATCH", "DELETE"] = "GET"
+    path: str = Field(..., description="Path under /tasks, /notes or /auth, query string included", examples=["/tasks/42"])
+    headers: Dict[str, str] = Field(default_factory=dict, description="e.g. If-Match; the batch's Authorization applies to every operation")
+    body: Any = Field(None, description="JSON body; a string is sent as is (set its Content-Type in headers)")
+
+class BatchRequest(BaseModel):
+    operations: List[BatchOperation] = Field(..., min_length=1, max_length=BATCH_MAX_OPERATIONS)
+
+class BatchResult(BaseModel):
+    id: Optional[str] = None
+    status: int
+    headers: Dict[str, str] = Field(default_factory=dict, description="ETag, Cache-Control and X-Total-Count of the response")
+    body: Any = None
+
+class BatchResponse(BaseModel):
+    results: List[BatchResult] = Field(..., description="One per operation, in request order")
@@ -0,0 +1,14 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+class BulkError(BaseModel):
+    index: int = Field(..., description="Position of the row in the request")
+    id: Optional[int] = Field(None, description="Row ID, when the request had one")
+    detail: str
+
+class BulkDeleteRequest(BaseModel):
+    ids: List[int] = Field(..., min_length=1)
+
+class BulkDeleteResult(BaseModel):
+    deleted: List[int] = []
+    errors: List[BulkError] = []
@@ -0,0 +1,26 @@
+from enum import Enum
+from pydantic import BaseModel, Field
+from typing import Optional
+
+class EventResource(str, Enum):
+    task = "task"
+    note = "note"
+
+class EventAction(str, Enum):
+    created = "created"
+    updated = "updated"
+    deleted = "deleted"
+    imported = "imported"
+
+class ChangeEvent(BaseModel):
+    """
+    One committed change, small enough for a NOTIFY payload
+    Clients refetch the item (cheap thanks to the item cache and ETags) or the list
+    """
+    id: str = Field("", description="Event id, send it back as Last-Event-ID to resume")
+    resource: EventResource
+    action: EventAction
+    item_id: Optional[int] = Field(None, description="Changed task/note, None for imports")
+    user_id: Optional[int] = None
+    version: Optional[int] = None
+    count: Optional[int] = Field(None, description="Rows loaded, imports only")
@@ -0,0 +1,11 @@
+from pydantic import BaseModel, Field
+from typing import List
+from app.schemas.bulk_schemas import BulkError
+
+class ImportProgress(BaseModel):
+    import_id: str
+    processed: int = Field(0, description="Rows read from the upload so far")
+    imported: int = Field(0, description="Rows committed to the database")
+    rejected: int = Field(0, description="Rows that failed parsing or validation")
+    errors: List[BulkError] = Field([], description="First rejected rows, index is the row position in the upload")
+    done: bool = False
@@ -1,6 +1,8 @@
-from pydantic import BaseModel, Field
-from typing import Optional
+from pydantic import BaseModel, Field, TypeAdapter
+from typing import List, Optional
 from datetime import datetime
+from app.schemas.bulk_schemas import BulkError
+from app.schemas.sync_schemas import ChangesMeta
 
 class NoteBase(BaseModel):
     title: Optional[str] = Field(None, min_length=1, max_length=255)
@@ -17,8 +19,26 @@ class NoteUpdate(BaseModel):
 
 class NoteResponse(NoteBase):
     id: int
+    version: int
     created_at: datetime
     updated_at: datetime
 
     class Config:
         from_attributes = True
+
+# Whole-list validator/serializer for the fast list path (app.utils.fast_json)
+note_list_adapter = TypeAdapter(List[NoteResponse])
+
+class NoteChanges(ChangesMeta):
+    items: List[NoteResponse] = Field([], description="Notes created or updated since the token, oldest change first")
+
+class NotePage(BaseModel):
+    items: List[NoteResponse]
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, null on the last page")
+
+class NoteBulkUpdate(NoteUpdate):
+    id: int = Field(..., description="ID of the note to update")
+
+class NoteBulkResult(BaseModel):
+    items: List[NoteResponse] = []
+    errors: List[BulkError] = []
@@ -0,0 +1,15 @@
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
+
+SearchType = Literal["task", "note"]
+
+class SearchHit(BaseModel):
+    type: SearchType
+    id: int
+    title: Optional[str] = None
+    snippet: str = Field(..., description="Matching excerpt as HTML: the text is escaped, matches are wrapped in <mark></mark>")
+    rank: float = Field(..., description="Relevance, higher is better")
+
+class SearchResponse(BaseModel):
+    query: str
+    results: List[SearchHit]
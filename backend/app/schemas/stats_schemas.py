@@ -0,0 +1,27 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+class PriorityCounts(BaseModel):
+    low: int = 0
+    medium: int = 0
+    high: int = 0
+
+class TaskStats(BaseModel):
+    total: int = 0
+    completed: int = 0
+    open: int = 0
+    by_priority: PriorityCounts = PriorityCounts()
+    overdue: int = Field(0, description="Open tasks whose due date is before today (UTC)")
+    due_today: int = Field(0, description="Open tasks due today (UTC)")
+
+class NoteStats(BaseModel):
+    total: int = 0
+
+class UserNoteCount(BaseModel):
+    user_id: int
+    notes: int
+
+class DashboardStats(BaseModel):
+    tasks: TaskStats
+    notes: NoteStats
+    notes_per_user: Optional[List[UserNoteCount]] = Field(None, description="Users with the most notes, only on GET /stats")
@@ -0,0 +1,7 @@
+from pydantic import BaseModel, Field
+from typing import List
+
+class ChangesMeta(BaseModel):
+    deleted: List[int] = Field([], description="Ids deleted since the token, apply before items")
+    next: str = Field(..., description="Token for the next call (since=)")
+    has_more: bool = Field(False, description="More changes are waiting, call again right away")
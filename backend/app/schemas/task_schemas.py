@@ -1,7 +1,9 @@
-from pydantic import BaseModel, Field
-from typing import Optional
+from pydantic import BaseModel, Field, TypeAdapter
+from typing import List, Optional
 from datetime import datetime
 from enum import Enum
+from app.schemas.bulk_schemas import BulkError
+from app.schemas.sync_schemas import ChangesMeta
 
 class PriorityEnum(str, Enum):
     low = "low"
@@ -28,8 +30,37 @@ class TaskUpdate(BaseModel):
 
 class TaskResponse(TaskBase):
     id: int
+    version: int
     created_at: datetime
     updated_at: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+# Whole-list validator/serializer for the fast list path (app.utils.fast_json)
+task_list_adapter = TypeAdapter(List[TaskResponse])
+
+class TaskChanges(ChangesMeta):
+    items: List[TaskResponse] = Field([], description="Tasks created or updated since the token, oldest change first")
+
+class TaskPage(BaseModel):
+    items: List[TaskResponse]
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, null on the last page")
+
+class TaskListQuery(BaseModel):
+    """Filters and order of GET /tasks/; frozen so totals can be cached per query"""
+    completed: Optional[bool] = None
+    due_before: Optional[datetime] = Field(None, description="Only tasks due before this time")
+    due_after: Optional[datetime] = Field(None, description="Only tasks due at or after this time")
+    overdue: Optional[bool] = Field(None, description="Open tasks past their due date (false: everything else)")
+    sort: Optional[str] = Field(None, description="Comma-separated fields, - for descending, e.g. -priority,due_date")
+
+    class Config:
+        frozen = True
+
+class TaskBulkUpdate(TaskUpdate):
+    id: int = Field(..., description="ID of the task to update")
+
+class TaskBulkResult(BaseModel):
+    items: List[TaskResponse] = []
+    errors: List[BulkError] = []
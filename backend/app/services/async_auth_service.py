@@ -0,0 +1,116 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from typing import Optional
+from fastapi import HTTPException, status
+from app.models.user import User
+from app.schemas.user_schemas import UserCreate, UserLogin, UserResponse
+from app.services.auth_service import user_cache
+from app.utils.auth import verify_and_update_password, get_password_hash, create_token_for_user
+
+class AsyncAuthService:
+    """Async counterpart of AuthService, used when DB_ASYNC is enabled"""
+
+    @staticmethod
+    async def register_user(db: AsyncSession, user_data: UserCreate) -> User:
+        """
+        Register a new user
+        """
+        # Check if username already exists
+        if await AsyncAuthService.get_user_by_username(db, user_data.username):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Username already registered"
+            )
+        
+        # Check if email already exists
+        result = await db.execute(select(User).where(User.email == user_data.email))
+        if result.scalars().first():
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Email already registered"
+            )
+        
+        # Waits on the hashing process pool, keep it off the event loop
+        hashed_password = await run_in_threadpool(get_password_hash, user_data.password)
+        db_user = User(
+            username=user_data.username,
+            email=user_data.email,
+            hashed_password=hashed_password,
+            is_active=True
+        )
+        
+        db.add(db_user)
+        await db.commit()
+        await db.refresh(db_user)
+        return db_user
+    
+    @staticmethod
+    async def authenticate_user(db: AsyncSession, username: str, password: str) -> Optional[User]:
+        """
+        Authenticate user with username and password
+        Returns User if authentication successful, None otherwise
+        """
+        user = await AsyncAuthService.get_user_by_username(db, username)
+        if not user:
+            return None
+        valid, new_hash = await run_in_threadpool(verify_and_update_password, password, user.hashed_password)
+        if not valid:
+            return None
+        if new_hash:
+            # Hashed with an old BCRYPT_ROUNDS, upgrade it transparently
+            user.hashed_password = new_hash
+            await db.commit()
+        return user
+    
+    @staticmethod
+    async def login_user(db: AsyncSession, login_data: UserLogin) -> dict:
+        """
+        Login user and return access token
+        """
+        user = await AsyncAuthService.authenticate_user(db, login_data.username, login_data.password)
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Incorrect username or password",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        
+        if not user.is_active:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="User account is disabled"
+            )
+        
+        access_token = create_token_for_user(user.username)
+        return {
+            "access_token": access_token,
+            "token_type": "bearer",
+            "user": user
+        }
+    
+    @staticmethod
+    async def get_user_by_username(db: AsyncSession, username: str) -> Optional[User]:
+        """
+        Get user by username
+        """
+        result = await db.execute(select(User).where(User.username == username))
+        return result.scalars().first()
+    
+    @staticmethod
+    async def get_authenticated_user(db: AsyncSession, username: str) -> Optional[UserResponse]:
+        """
+        Get the user behind an authenticated request
+        Served from the shared user_cache when possible; returns a detached snapshot
+        """
+        cached = user_cache.get(username)
+        if cached is not None:
+            return cached
+        
+        user = await AsyncAuthService.get_user_by_username(db, username)
+        if user is None:
+            return None
+        
+        snapshot = UserResponse.model_validate(user)
+        user_cache.set(username, snapshot)
+        return snapshot
@@ -0,0 +1,137 @@
+from sqlalchemy import select, tuple_, update, delete
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.note_model import Note
+from app.schemas.note_schemas import NoteCreate, NoteUpdate, NoteResponse
+from app.services.event_service import note_feed
+from app.services.note_service import NoteService, note_cache, NOTE_RESPONSE_COLUMNS
+from app.utils.fieldsets import Fieldset
+from app.utils.pagination import encode_cursor, decode_cursor
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+class AsyncNoteService:
+    """Async counterpart of NoteService, used when DB_ASYNC is enabled"""
+
+    @staticmethod
+    async def _get_note_by_id(db: AsyncSession, note_id: int) -> Optional[Note]:
+        """Private helper method to get note by ID"""
+        return await db.get(Note, note_id)
+    
+    @staticmethod
+    async def get_note(db: AsyncSession, note_id: int) -> Optional[NoteResponse]:
+        """Served from the shared note_cache when possible; returns a detached snapshot"""
+        return await note_cache.aget_or_load(note_id, lambda: AsyncNoteService._get_note_by_id(db, note_id))
+    
+    @staticmethod
+    async def get_notes(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[Note]:
+        result = await db.execute(select(Note).order_by(Note.id).offset(skip).limit(limit))
+        return list(result.scalars().all())
+    
+    @staticmethod
+    def get_fieldset(fields: Optional[str] = None, preview_chars: Optional[int] = None) -> Fieldset:
+        """Same as NoteService.get_fieldset (no I/O)"""
+        return NoteService.get_fieldset(fields, preview_chars)
+    
+    @staticmethod
+    async def get_note_rows(db: AsyncSession, skip: int = 0, limit: int = 100, columns: tuple = NOTE_RESPONSE_COLUMNS) -> List[Dict[str, Any]]:
+        """Same page as get_notes as plain column dicts, for the fast JSON list path (columns: a sparse fieldset)"""
+        result = await db.execute(select(*columns).order_by(Note.id).offset(skip).limit(limit))
+        return [row._asdict() for row in result]
+    
+    @staticmethod
+    async def count_notes(db: AsyncSession) -> Tuple[int, bool]:
+        """NoteService.count_notes on the async session's connection"""
+        return await db.run_sync(NoteService.count_notes)
+    
+    @staticmethod
+    async def get_note_versions(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[Tuple[int, int]]:
+        """(id, version) of the rows get_notes would return, a cheap fingerprint for ETags"""
+        result = await db.execute(select(Note.id, Note.version).order_by(Note.id).offset(skip).limit(limit))
+        return [tuple(row) for row in result]
+    
+    @staticmethod
+    async def get_notes_page(db: AsyncSession, cursor: Optional[str] = None, limit: int = 100) -> Tuple[List[Note], Optional[str]]:
+        """Get a page of notes after the cursor, ordered by (created_at, id)"""
+        stmt = select(Note)
+        
+        if cursor:
+            created_at, note_id = decode_cursor(cursor)
+            stmt = stmt.where(tuple_(Note.created_at, Note.id) > tuple_(created_at, note_id))
+        
+        # Fetch one extra row to know whether another page exists
+        result = await db.execute(stmt.order_by(Note.created_at, Note.id).limit(limit + 1))
+        notes = list(result.scalars().all())
+        
+        next_cursor = None
+        if len(notes) > limit:
+            notes = notes[:limit]
+            next_cursor = encode_cursor(notes[-1].created_at, notes[-1].id)
+        return notes, next_cursor
+    
+    @staticmethod
+    async def get_user_notes(db: AsyncSession, user_id: int, skip: int = 0, limit: int = 100) -> List[Note]:
+        stmt = select(Note).where(Note.user_id == user_id).order_by(Note.created_at, Note.id)
+        result = await db.execute(stmt.offset(skip).limit(limit))
+        return list(result.scalars().all())
+    
+    @staticmethod
+    async def iter_note_batches(db: AsyncSession, **filters) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Stream matching notes as batches of column dicts (server-side cursor via yield_per)"""
+        result = await db.stream(NoteService.export_stmt(**filters))
+        async for partition in result.partitions():
+            yield [row._asdict() for row in partition]
+    
+    @staticmethod
+    async def create_note(db: AsyncSession, note: NoteCreate) -> Note:
+        db_note = Note(**note.model_dump())
+        db.add(db_note)
+        await db.commit()
+        await db.refresh(db_note)
+        note_cache.store(db_note)
+        note_feed.created(db_note)
+        return db_note
+    
+    @staticmethod
+    async def _raise_if_conflict(db: AsyncSession, note_id: int, expected_version: Optional[int]) -> None:
+        """Private helper: after a guarded statement matched nothing, tell a stale version from a missing note"""
+        if expected_version is not None and await db.scalar(select(Note.id).where(Note.id == note_id)):
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED,
+                detail="Note was modified by another request"
+            )
+    
+    @staticmethod
+    async def update_note(db: AsyncSession, note_id: int, note_update: NoteUpdate, expected_version: Optional[int] = None) -> Optional[Note]:
+        # Update only provided fields, in a single UPDATE ... RETURNING
+        update_data = note_update.model_dump(exclude_unset=True)
+        stmt = update(Note).where(Note.id == note_id).values(**update_data, version=Note.version + 1).returning(Note)
+        if expected_version is not None:
+            stmt = stmt.where(Note.version == expected_version)
+        
+        db_note = (await db.scalars(stmt)).first()
+        if not db_note:
+            await db.rollback()
+            await AsyncNoteService._raise_if_conflict(db, note_id, expected_version)
+            return None
+        
+        await db.commit()
+        note_cache.store(db_note)
+        note_feed.updated(db_note)
+        return db_note
+    
+    @staticmethod
+    async def delete_note(db: AsyncSession, note_id: int, expected_version: Optional[int] = None) -> bool:
+        stmt = delete(Note).where(Note.id == note_id).returning(Note.id, Note.user_id)
+        if expected_version is not None:
+            stmt = stmt.where(Note.version == expected_version)
+        
+        deleted = (await db.execute(stmt)).first()
+        if deleted is None:
+            await db.rollback()
+            await AsyncNoteService._raise_if_conflict(db, note_id, expected_version)
+            return False
+        
+        await db.commit()
+        note_cache.invalidate(note_id)
+        note_feed.deleted(deleted)
+        return True
@@ -0,0 +1,155 @@
+from sqlalchemy import select, tuple_, update, delete
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from app.models.task_model import Task
+from app.schemas.task_schemas import TaskCreate, TaskUpdate, TaskResponse, TaskListQuery
+from app.services.event_service import task_feed
+from app.services.task_service import TaskService, task_cache, TASK_RESPONSE_COLUMNS
+from app.utils.fieldsets import Fieldset
+from app.utils.pagination import encode_cursor, decode_cursor
+
+class AsyncTaskService:
+    """Async counterpart of TaskService, used when DB_ASYNC is enabled"""
+
+    @staticmethod
+    async def _get_task_by_id(db: AsyncSession, task_id: int) -> Optional[Task]:
+        """Private helper method to get task by ID"""
+        return await db.get(Task, task_id)
+    
+    @staticmethod
+    async def get_task(db: AsyncSession, task_id: int) -> Optional[TaskResponse]:
+        """
+        Get a single task by ID
+        Served from the shared task_cache when possible; returns a detached snapshot
+        """
+        return await task_cache.aget_or_load(task_id, lambda: AsyncTaskService._get_task_by_id(db, task_id))
+    
+    @staticmethod
+    async def get_tasks(db: AsyncSession, skip: int = 0, limit: int = 100, query: Optional[TaskListQuery] = None) -> List[Task]:
+        """Get all tasks with optional filtering and sorting"""
+        result = await db.execute(TaskService.list_stmt((Task,), skip, limit, query))
+        return list(result.scalars().all())
+    
+    @staticmethod
+    def get_fieldset(fields: Optional[str] = None, preview_chars: Optional[int] = None) -> Fieldset:
+        """Same as TaskService.get_fieldset (no I/O)"""
+        return TaskService.get_fieldset(fields, preview_chars)
+    
+    @staticmethod
+    async def get_task_rows(db: AsyncSession, skip: int = 0, limit: int = 100, query: Optional[TaskListQuery] = None, columns: tuple = TASK_RESPONSE_COLUMNS) -> List[Dict[str, Any]]:
+        """Same page as get_tasks as plain column dicts, for the fast JSON list path (columns: a sparse fieldset)"""
+        result = await db.execute(TaskService.list_stmt(columns, skip, limit, query))
+        return [row._asdict() for row in result]
+    
+    @staticmethod
+    async def count_tasks(db: AsyncSession, query: Optional[TaskListQuery] = None) -> Tuple[int, bool]:
+        """TaskService.count_tasks on the async session's connection"""
+        return await db.run_sync(TaskService.count_tasks, query)
+    
+    @staticmethod
+    async def get_task_versions(db: AsyncSession, skip: int = 0, limit: int = 100, query: Optional[TaskListQuery] = None) -> List[Tuple[int, int]]:
+        """(id, version) of the rows get_tasks would return, a cheap fingerprint for ETags"""
+        result = await db.execute(TaskService.list_stmt((Task.id, Task.version), skip, limit, query))
+        return [tuple(row) for row in result]
+    
+    @staticmethod
+    async def get_tasks_page(db: AsyncSession, cursor: Optional[str] = None, limit: int = 100, completed: Optional[bool] = None) -> Tuple[List[Task], Optional[str]]:
+        """Get a page of tasks after the cursor, ordered by (created_at, id)"""
+        stmt = select(Task)
+        
+        if completed is not None:
+            stmt = stmt.where(Task.completed == completed)
+        
+        if cursor:
+            created_at, task_id = decode_cursor(cursor)
+            stmt = stmt.where(tuple_(Task.created_at, Task.id) > tuple_(created_at, task_id))
+        
+        # Fetch one extra row to know whether another page exists
+        result = await db.execute(stmt.order_by(Task.created_at, Task.id).limit(limit + 1))
+        tasks = list(result.scalars().all())
+        
+        next_cursor = None
+        if len(tasks) > limit:
+            tasks = tasks[:limit]
+            next_cursor = encode_cursor(tasks[-1].created_at, tasks[-1].id)
+        return tasks, next_cursor
+    
+    @staticmethod
+    async def get_user_tasks(db: AsyncSession, user_id: int, skip: int = 0, limit: int = 100, completed: Optional[bool] = None) -> List[Task]:
+        """Get tasks owned by a user, ordered by due date"""
+        stmt = select(Task).where(Task.user_id == user_id)
+        
+        if completed is not None:
+            stmt = stmt.where(Task.completed == completed)
+        
+        result = await db.execute(stmt.order_by(Task.due_date, Task.id).offset(skip).limit(limit))
+        return list(result.scalars().all())
+    
+    @staticmethod
+    async def iter_task_batches(db: AsyncSession, **filters) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Stream matching tasks as batches of column dicts (server-side cursor via yield_per)"""
+        result = await db.stream(TaskService.export_stmt(**filters))
+        async for partition in result.partitions():
+            yield [row._asdict() for row in partition]
+    
+    @staticmethod
+    async def create_task(db: AsyncSession, task: TaskCreate) -> Task:
+        """Create a new task"""
+        db_task = Task(**task.model_dump())
+        db.add(db_task)
+        await db.commit()
+        await db.refresh(db_task)
+        task_cache.store(db_task)
+        task_feed.created(db_task)
+        return db_task
+    
+    @staticmethod
+    async def _raise_if_conflict(db: AsyncSession, task_id: int, expected_version: Optional[int]) -> None:
+        """Private helper: after a guarded statement matched nothing, tell a stale version from a missing task"""
+        if expected_version is not None and await db.scalar(select(Task.id).where(Task.id == task_id)):
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED,
+                detail="Task was modified by another request"
+            )
+    
+    @staticmethod
+    async def update_task(db: AsyncSession, task_id: int, task_update: TaskUpdate, expected_version: Optional[int] = None) -> Optional[Task]:
+        """
+        Update an existing task with a single UPDATE ... RETURNING
+        expected_version (from If-Match) makes the update conditional
+        """
+        # Update only provided fields
+        update_data = task_update.model_dump(exclude_unset=True)
+        stmt = update(Task).where(Task.id == task_id).values(**update_data, version=Task.version + 1).returning(Task)
+        if expected_version is not None:
+            stmt = stmt.where(Task.version == expected_version)
+        
+        db_task = (await db.scalars(stmt)).first()
+        if not db_task:
+            await db.rollback()
+            await AsyncTaskService._raise_if_conflict(db, task_id, expected_version)
+            return None
+        
+        await db.commit()
+        task_cache.store(db_task)
+        task_feed.updated(db_task)
+        return db_task
+    
+    @staticmethod
+    async def delete_task(db: AsyncSession, task_id: int, expected_version: Optional[int] = None) -> bool:
+        """Delete a task with a single DELETE ... RETURNING id, user_id"""
+        stmt = delete(Task).where(Task.id == task_id).returning(Task.id, Task.user_id)
+        if expected_version is not None:
+            stmt = stmt.where(Task.version == expected_version)
+        
+        deleted = (await db.execute(stmt)).first()
+        if deleted is None:
+            await db.rollback()
+            await AsyncTaskService._raise_if_conflict(db, task_id, expected_version)
+            return False
+        
+        await db.commit()
+        task_cache.invalidate(task_id)
+        task_feed.deleted(deleted)
+        return True
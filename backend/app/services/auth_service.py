@@ -1,9 +1,53 @@
+from sqlalchemy import event, inspect
 from sqlalchemy.orm import Session
 from typing import Optional
 from fastapi import HTTPException, status
 from app.models.user import User
-from app.schemas.user_schemas import UserCreate, UserLogin
-from app.utils.auth import verify_password, get_password_hash, create_token_for_user
+from app.schemas.user_schemas import UserCreate, UserLogin, UserResponse
+from app.utils.auth import verify_and_update_password, get_password_hash, create_token_for_user, AUTH_CACHE_SIZE, AUTH_CACHE_TTL
+from app.utils.ttl_cache import TTLCache
+
+# Snapshots of authenticated users keyed by username, saves a query per request
+user_cache = TTLCache(maxsize=AUTH_CACHE_SIZE, ttl=AUTH_CACHE_TTL)
+# Marks a transaction whose writes to users can't be traced to usernames
+ALL_USERS = object()
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _collect_changed_user(mapper, connection, target):
+    """Note users changed by a flush (deactivation, rename, delete), dropped from the cache on commit"""
+    session = inspect(target).session
+    if session is None:
+        return
+    changed = session.info.setdefault("changed_users", set())
+    if changed is not ALL_USERS:
+        history = inspect(target).attrs.username.history
+        changed.update({target.username, *(history.deleted or ())})
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_user_writes(orm_execute_state):
+    """update(User)/delete(User) statements don't say which rows they hit: the whole cache goes on commit"""
+    if (orm_execute_state.is_update or orm_execute_state.is_delete) and orm_execute_state.bind_mapper is inspect(User):
+        orm_execute_state.session.info["changed_users"] = ALL_USERS
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_users(session):
+    """
+    Invalidate after commit, not at flush: a concurrent request could otherwise re-cache the old
+    row in between. Only this worker's cache; other workers keep theirs up to AUTH_CACHE_TTL
+    """
+    changed = session.info.pop("changed_users", None)
+    if changed is ALL_USERS:
+        user_cache.clear()
+    elif changed:
+        for username in changed:
+            user_cache.delete(username)
+
+@event.listens_for(Session, "after_soft_rollback")
+def _forget_changed_users(session, previous_transaction):
+    # A rolled back savepoint leaves the outer transaction's changes pending
+    if previous_transaction.parent is None:
+        session.info.pop("changed_users", None)
 
 class AuthService:
     @staticmethod
@@ -50,8 +94,13 @@ class AuthService:
         user = db.query(User).filter(User.username == username).first()
         if not user:
             return None
-        if not verify_password(password, user.hashed_password):
+        valid, new_hash = verify_and_update_password(password, user.hashed_password)
+        if not valid:
             return None
+        if new_hash:
+            # Hashed with an old BCRYPT_ROUNDS, upgrade it transparently
+            user.hashed_password = new_hash
+            db.commit()
         return user
     
     @staticmethod
@@ -85,4 +134,30 @@ class AuthService:
         """
         Get user by username
         """
-        return db.query(User).filter(User.username == username).first()
\ No newline at end of file
+        return db.query(User).filter(User.username == username).first()
+    
+    @staticmethod
+    def get_authenticated_user(db: Session, username: str) -> Optional[UserResponse]:
+        """
+        Get the user behind an authenticated request
+        Served from user_cache when possible; returns a detached snapshot
+        """
+        cached = user_cache.get(username)
+        if cached is not None:
+            return cached
+        
+        user = AuthService.get_user_by_username(db, username)
+        if user is None:
+            return None
+        
+        snapshot = UserResponse.model_validate(user)
+        user_cache.set(username, snapshot)
+        return snapshot
+    
+    @staticmethod
+    def invalidate_user(username: str) -> None:
+        """
+        Drop a cached user snapshot
+        Needed after Core UPDATEs/DELETEs on users run on a bare connection, outside any Session
+        """
+        user_cache.delete(username)
@@ -0,0 +1,150 @@
+import asyncio
+import json
+import logging
+import re
+from typing import Any, Dict, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+from fastapi import Request
+from sqlalchemy import select
+from starlette.concurrency import run_in_threadpool
+from app.models.note_model import Note
+from app.models.task_model import Task
+from app.schemas.batch_schemas import BatchOperation, BatchResult
+from app.services.note_service import note_cache
+from app.services.task_service import task_cache
+from app.utils.batch import BatchContext, BATCH_CONCURRENCY, BATCH_PREFIXES, dispatch
+
+logger = logging.getLogger(__name__)
+
+# GET /tasks/{id} and /notes/{id}: loaded for a whole group of reads with one IN query
+ITEM_PATH = re.compile(r"^/(tasks|notes)/(\d+)/?$")
+ITEMS = {"tasks": (Task, task_cache), "notes": (Note, note_cache)}
+# Endpoints streaming their request or response body, which a batch can't carry
+STREAMED_ENDPOINTS = {"import", "export"}
+# Response headers passed on per operation, the others describe the batch response
+RESULT_HEADERS = ("etag", "cache-control", "x-total-count", "x-total-count-type", "www-authenticate")
+# Set by the batch itself
+DROPPED_HEADERS = {"authorization", "host", "content-length"}
+
+class BatchService:
+    @staticmethod
+    def rejection(operation: BatchOperation) -> Optional[str]:
+        """Why an operation can't be batched, None when it can"""
+        path = urlsplit(operation.path).path
+        if not any(path == prefix or path.startswith(prefix + "/") for prefix in BATCH_PREFIXES):
+            return f"Only {', '.join(BATCH_PREFIXES)} can be batched"
+        segments = path.strip("/").split("/")
+        if len(segments) == 2 and segments[1] in STREAMED_ENDPOINTS:
+            return f"{path} streams its body and can't be batched"
+        return None
+
+    @staticmethod
+    def groups(operations: List[BatchOperation]) -> List[Tuple[bool, List[int]]]:
+        """
+        Split operations into steps run in order: (True, indexes) for a run of consecutive reads,
+        run concurrently; (False, [index]) for each write, run alone
+        """
+        groups: List[Tuple[bool, List[int]]] = []
+        for index, operation in enumerate(operations):
+            reads = operation.method == "GET"
+            if reads and groups and groups[-1][0]:
+                groups[-1][1].append(index)
+            else:
+                groups.append((reads, [index]))
+        return groups
+
+    @staticmethod
+    def prefetch(batch: BatchContext, operations: List[BatchOperation]) -> None:
+        """
+        DataLoader-style: load the rows behind every uncached GET /tasks/{id} and /notes/{id}
+        of a read group with one WHERE id IN (...) query per resource. They land in the shared
+        session's identity map, where the services' db.get finds them without a query
+        """
+        wanted: Dict[str, Set[int]] = {}
+        for operation in operations:
+            match = ITEM_PATH.match(urlsplit(operation.path).path)
+            if match:
+                wanted.setdefault(match.group(1), set()).add(int(match.group(2)))
+        for resource, item_ids in wanted.items():
+            model, cache = ITEMS[resource]
+            item_ids = cache.missing(sorted(item_ids))
+            if item_ids:
+                batch.prefetched.extend(batch.session.scalars(select(model).where(model.id.in_(item_ids))))
+
+    @staticmethod
+    def _request(request: Request, operation: BatchOperation) -> Tuple[List[Tuple[bytes, bytes]], bytes]:
+        """Headers and body of a sub-request: the operation's, with the batch's Host and Authorization"""
+        headers = {name.lower(): value for name, value in operation.headers.items() if name.lower() not in DROPPED_HEADERS}
+        if operation.body is None:
+            body = b""
+        elif isinstance(operation.body, str):
+            body = operation.body.encode()
+        else:
+            body = json.dumps(operation.body).encode()
+            headers.setdefault("content-type", "application/json")
+        for name in ("host", "authorization"):
+            if name in request.headers:
+                headers[name] = request.headers[name]
+        headers["content-length"] = str(len(body))
+        return [(name.encode("latin-1"), value.encode("latin-1")) for name, value in headers.items()], body
+
+    @staticmethod
+    def _result(operation: BatchOperation, status_code: int, raw_headers: List[Tuple[bytes, bytes]], content: bytes) -> BatchResult:
+        headers = {name.decode("latin-1"): value.decode("latin-1") for name, value in raw_headers}
+        body: Any = None
+        if content:
+            if headers.get("content-type", "").startswith("application/json"):
+                body = json.loads(content)
+            else:
+                body = content.decode()
+        return BatchResult(
+            id=operation.id,
+            status=status_code,
+            headers={name: headers[name] for name in RESULT_HEADERS if name in headers},
+            body=body,
+        )
+
+    @staticmethod
+    async def run_operation(request: Request, batch: BatchContext, operation: BatchOperation) -> BatchResult:
+        """Run one operation through the app's router; its errors end up in its result only"""
+        reason = BatchService.rejection(operation)
+        if reason is not None:
+            return BatchResult(id=operation.id, status=400, body={"detail": reason})
+
+        url = urlsplit(operation.path)
+        headers, body = BatchService._request(request, operation)
+        try:
+            status_code, raw_headers, content = await dispatch(
+                request.app.router, request.scope, operation.method, url.path, url.query.encode(), headers, body
+            )
+        except Exception:
+            logger.exception("Batched %s %s failed", operation.method, operation.path)
+            status_code, raw_headers, content = 500, [(b"content-type", b"application/json")], b'{"detail":"Internal Server Error"}'
+        if operation.method != "GET" and status_code >= 400:
+            # Don't let a failed write's leftovers ride along with the next operation's commit
+            await run_in_threadpool(batch.session.rollback)
+        return BatchService._result(operation, status_code, raw_headers, content)
+
+    @staticmethod
+    async def run(request: Request, batch: BatchContext, operations: List[BatchOperation]) -> List[BatchResult]:
+        """
+        Run operations in order on the batch's session: each write on its own,
+        each run of reads at once (at most BATCH_CONCURRENCY) after one prefetch
+        """
+        results: List[Optional[BatchResult]] = [None] * len(operations)
+        semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+        async def run_one(index: int) -> None:
+            async with semaphore:
+                results[index] = await BatchService.run_operation(request, batch, operations[index])
+
+        for reads, indexes in BatchService.groups(operations):
+            if reads:
+                await run_in_threadpool(BatchService.prefetch, batch, [operations[index] for index in indexes])
+                await asyncio.gather(*(run_one(index) for index in indexes))
+                batch.prefetched.clear()
+            else:
+                # Writes see the rows as they are now, not as the previous reads loaded them
+                batch.session.expire_all()
+                await run_one(indexes[0])
+        return results
@@ -0,0 +1,384 @@
+import asyncio
+import os
+import threading
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Type
+from pydantic import BaseModel
+from app.utils.ttl_cache import TTLCache
+
+# Read-through cache for single-item GETs
+# ITEM_CACHE_BACKEND: "local" (in-process LRU, default), "redis" (shared between workers) or "none"
+ITEM_CACHE_BACKEND = os.getenv("ITEM_CACHE_BACKEND", "local").lower()
+ITEM_CACHE_URL = os.getenv("ITEM_CACHE_URL", "redis://localhost:6379/0")
+ITEM_CACHE_SIZE = int(os.getenv("ITEM_CACHE_SIZE", "10000"))
+ITEM_CACHE_TTL = float(os.getenv("ITEM_CACHE_TTL", "30"))
+TASK_CACHE_TTL = float(os.getenv("TASK_CACHE_TTL", str(ITEM_CACHE_TTL)))
+NOTE_CACHE_TTL = float(os.getenv("NOTE_CACHE_TTL", str(ITEM_CACHE_TTL)))
+# Invalidated keys stay blocked this long, so a loader that read the row before the write can't re-cache it
+ITEM_CACHE_TOMBSTONE_TTL = float(os.getenv("ITEM_CACHE_TOMBSTONE_TTL", "5"))
+
+# Stored in place of an invalidated item: a miss for get(), an existing key for add()
+TOMBSTONE = b"\x00tombstone"
+
+class CacheBackend(ABC):
+    """
+    Storage behind ItemCache, values are pydantic snapshots
+    schema is passed so backends that serialize know how to decode
+    """
+
+    @abstractmethod
+    def get(self, key: str, schema: Type[BaseModel]) -> Optional[BaseModel]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value: BaseModel, ttl: float) -> None:
+        ...
+
+    @abstractmethod
+    def add(self, key: str, value: BaseModel, ttl: float) -> bool:
+        """Store only if the key is absent, so a slow loader never overwrites a newer write"""
+
+    @abstractmethod
+    def set_if_newer(self, key: str, value: BaseModel, ttl: float) -> bool:
+        """
+        Store unless the key holds a tombstone or a snapshot with the same or a higher version,
+        so a write-through that lost a race never replaces the newer row
+        """
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        ...
+
+    @abstractmethod
+    def tombstone(self, key: str, ttl: float) -> None:
+        """Replace key with a marker that get() reports as a miss and add() won't overwrite"""
+
+    @abstractmethod
+    def clear(self) -> None:
+        ...
+
+    def stats(self) -> dict:
+        return {"backend": type(self).__name__}
+
+class NullCacheBackend(CacheBackend):
+    """Caching disabled, every read goes to the database"""
+
+    def get(self, key, schema):
+        return None
+
+    def set(self, key, value, ttl):
+        pass
+
+    def add(self, key, value, ttl):
+        return False
+
+    def set_if_newer(self, key, value, ttl):
+        return False
+
+    def delete(self, key):
+        pass
+
+    def tombstone(self, key, ttl):
+        pass
+
+    def clear(self):
+        pass
+
+class LocalCacheBackend(CacheBackend):
+    """In-process LRU, stores the snapshot objects themselves (no serialization)"""
+
+    def __init__(self, maxsize: int = ITEM_CACHE_SIZE):
+        # Per-entry TTLs come from the ItemCache namespaces
+        self._cache = TTLCache(maxsize=maxsize, ttl=float("inf"))
+        # Makes set_if_newer's read and write one step against the other writes
+        self._write_lock = threading.Lock()
+
+    def get(self, key, schema):
+        value = self._cache.get(key)
+        return None if value is TOMBSTONE else value
+
+    def set(self, key, value, ttl):
+        with self._write_lock:
+            self._cache.set(key, value, ttl)
+
+    def add(self, key, value, ttl):
+        with self._write_lock:
+            return self._cache.add(key, value, ttl)
+
+    def set_if_newer(self, key, value, ttl):
+        with self._write_lock:
+            current = self._cache.get(key)
+            if current is TOMBSTONE or (current is not None and current.version >= value.version):
+                return False
+            self._cache.set(key, value, ttl)
+            return True
+
+    def delete(self, key):
+        with self._write_lock:
+            self._cache.delete(key)
+
+    def tombstone(self, key, ttl):
+        with self._write_lock:
+            self._cache.set(key, TOMBSTONE, ttl)
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self) -> dict:
+        stats = self._cache.stats()
+        del stats["ttl"]
+        return {"backend": "local", **stats}
+
+# Compare and set in one round trip: KEYS[1], ARGV = snapshot JSON, its version, tombstone marker, TTL in ms
+SET_IF_NEWER_SCRIPT = """
+local current = redis.call('GET', KEYS[1])
+if current then
+    if current == ARGV[3] then return 0 end
+    local version = cjson.decode(current)['version']
+    if version and version >= tonumber(ARGV[2]) then return 0 end
+end
+redis.call('SET', KEYS[1], ARGV[1], 'PX', ARGV[4])
+return 1
+"""
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Shared cache for multi-worker deployments, snapshots are stored as JSON
+    Needs the optional redis package (pip install redis)
+    """
+
+    def __init__(self, url: str = ITEM_CACHE_URL, prefix: str = "tnd:"):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("ITEM_CACHE_BACKEND=redis requires the redis package")
+        self._client = redis.Redis.from_url(url)
+        self._prefix = prefix
+        self._set_if_newer = self._client.register_script(SET_IF_NEWER_SCRIPT)
+
+    def get(self, key, schema):
+        raw = self._client.get(self._prefix + key)
+        return schema.model_validate_json(raw) if raw is not None and raw != TOMBSTONE else None
+
+    def set(self, key, value, ttl):
+        self._client.set(self._prefix + key, value.model_dump_json(), px=int(ttl * 1000))
+
+    def add(self, key, value, ttl):
+        return bool(self._client.set(self._prefix + key, value.model_dump_json(), px=int(ttl * 1000), nx=True))
+
+    def set_if_newer(self, key, value, ttl):
+        return bool(self._set_if_newer(keys=[self._prefix + key], args=[value.model_dump_json(), value.version, TOMBSTONE, int(ttl * 1000)]))
+
+    def delete(self, key):
+        self._client.delete(self._prefix + key)
+
+    def tombstone(self, key, ttl):
+        self._client.set(self._prefix + key, TOMBSTONE, px=max(1, int(ttl * 1000)))
+
+    def clear(self):
+        for key in self._client.scan_iter(self._prefix + "*"):
+            self._client.delete(key)
+
+    def stats(self) -> dict:
+        return {"backend": "redis"}
+
+class FakeCacheBackend(CacheBackend):
+    """
+    Test double for the shared backend: round-trips values through JSON like Redis does,
+    records every operation and uses a manual clock (advance()) for TTL tests
+    """
+
+    def __init__(self):
+        self.now = 0.0
+        self.ops = []
+        self._data: Dict[str, tuple] = {}
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+    def get(self, key, schema):
+        self.ops.append(("get", key))
+        entry = self._data.get(key)
+        if entry is None or entry[1] <= self.now or entry[0] == TOMBSTONE:
+            return None
+        return schema.model_validate_json(entry[0])
+
+    def set(self, key, value, ttl):
+        self.ops.append(("set", key))
+        self._data[key] = (value.model_dump_json(), self.now + ttl)
+
+    def add(self, key, value, ttl):
+        self.ops.append(("add", key))
+        entry = self._data.get(key)
+        if entry is not None and entry[1] > self.now:
+            return False
+        self._data[key] = (value.model_dump_json(), self.now + ttl)
+        return True
+
+    def set_if_newer(self, key, value, ttl):
+        self.ops.append(("set_if_newer", key))
+        entry = self._data.get(key)
+        if entry is not None and entry[1] > self.now:
+            if entry[0] == TOMBSTONE or type(value).model_validate_json(entry[0]).version >= value.version:
+                return False
+        self._data[key] = (value.model_dump_json(), self.now + ttl)
+        return True
+
+    def delete(self, key):
+        self.ops.append(("delete", key))
+        self._data.pop(key, None)
+
+    def tombstone(self, key, ttl):
+        self.ops.append(("tombstone", key))
+        self._data[key] = (TOMBSTONE, self.now + ttl)
+
+    def clear(self):
+        self._data.clear()
+
+    def stats(self) -> dict:
+        return {"backend": "fake", "size": len(self._data)}
+
+def get_cache_backend(name: str = ITEM_CACHE_BACKEND) -> CacheBackend:
+    """Build the backend selected by ITEM_CACHE_BACKEND"""
+    if name == "local":
+        return LocalCacheBackend()
+    if name == "redis":
+        return RedisCacheBackend()
+    if name == "none":
+        return NullCacheBackend()
+    raise RuntimeError(f"Unknown ITEM_CACHE_BACKEND: {name}")
+
+# One store shared by every namespace, keys are "<namespace>:<id>"
+cache_backend = get_cache_backend()
+
+class ItemCache:
+    """
+    Read-through cache of one kind of item (tasks, notes) with single-flight loading:
+    concurrent misses on the same key wait for one loader instead of all hitting the database
+    Services write through / invalidate after their commits
+    """
+
+    def __init__(self, namespace: str, schema: Type[BaseModel], ttl: float, backend: Optional[CacheBackend] = None):
+        self.namespace = namespace
+        self.schema = schema
+        self.ttl = ttl
+        self.backend = backend or cache_backend
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, list] = {}
+        self._async_inflight: Dict[str, list] = {}
+
+    def _key(self, item_id: Any) -> str:
+        return f"{self.namespace}:{item_id}"
+
+    def _lookup(self, key: str) -> Optional[BaseModel]:
+        value = self.backend.get(key, self.schema)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    @contextmanager
+    def _flight(self, key: str):
+        """Per-key lock, dropped once the last waiter is done"""
+        with self._lock:
+            entry = self._inflight.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._inflight[key]
+
+    @asynccontextmanager
+    async def _async_flight(self, key: str):
+        """Per-key asyncio lock, only touched from the event loop thread"""
+        entry = self._async_inflight.setdefault(key, [asyncio.Lock(), 0])
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._async_inflight[key]
+
+    def _load(self, key: str, row: Any, publish: bool = True) -> Optional[BaseModel]:
+        """Snapshot a freshly loaded row and publish it unless a writer got there first"""
+        if row is None:
+            return None
+        snapshot = self.schema.model_validate(row)
+        if publish:
+            self.backend.add(key, snapshot, self.ttl)
+        return snapshot
+
+    def missing(self, item_ids: Iterable[Any]) -> List[Any]:
+        """Ids without a cached snapshot, for callers loading several items in one query"""
+        return [item_id for item_id in item_ids if self.backend.get(self._key(item_id), self.schema) is None]
+
+    def get_or_load(self, item_id: Any, loader: Callable[[], Any], publish: bool = True) -> Optional[BaseModel]:
+        """
+        Cached snapshot of an item, loader() (returning the ORM row or None) runs on a miss
+        publish=False for rows read from a replica: they may predate an invalidation and must not be cached
+        """
+        key = self._key(item_id)
+        value = self._lookup(key)
+        if value is not None:
+            return value
+
+        with self._flight(key):
+            # Another request may have loaded it while we waited
+            value = self.backend.get(key, self.schema)
+            if value is not None:
+                with self._lock:
+                    self.coalesced += 1
+                return value
+            return self._load(key, loader(), publish)
+
+    async def aget_or_load(self, item_id: Any, loader: Callable[[], Awaitable[Any]]) -> Optional[BaseModel]:
+        """Async get_or_load, waiters share one loader per key within the event loop"""
+        key = self._key(item_id)
+        value = self._lookup(key)
+        if value is not None:
+            return value
+
+        async with self._async_flight(key):
+            value = self.backend.get(key, self.schema)
+            if value is not None:
+                with self._lock:
+                    self.coalesced += 1
+                return value
+            return self._load(key, await loader())
+
+    def store(self, row: Any) -> None:
+        """
+        Write through a row just committed by a create/update
+        Racing updates can call this out of commit order: only a higher version replaces the cached one
+        """
+        self.backend.set_if_newer(self._key(row.id), self.schema.model_validate(row), self.ttl)
+
+    def invalidate(self, *item_ids: Any) -> None:
+        """
+        Drop items changed or deleted by a committed write
+        Leaves a tombstone rather than an empty key: a loader that read the old row before this
+        write would otherwise add() it back and serve it (a deleted row even) for the whole TTL
+        """
+        for item_id in item_ids:
+            self.backend.tombstone(self._key(item_id), ITEM_CACHE_TOMBSTONE_TTL)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+            }
@@ -0,0 +1,59 @@
+import os
+from typing import Callable, Hashable, Optional, Sequence, Tuple, Type
+from sqlalchemy import func, select, text
+from sqlalchemy.orm import Session
+from app.db import Base
+from app.models.stats_model import StatCounter
+from app.services.stats_service import StatsService, ALL_SCOPE
+from app.utils.replicas import is_replica_session
+from app.utils.ttl_cache import TTLCache
+
+# Totals of list endpoints (X-Total-Count) are cached per worker for this many seconds
+COUNT_CACHE_TTL = float(os.getenv("COUNT_CACHE_TTL", "5"))
+# Unfiltered tables without a counter are estimated from planner statistics above this many rows
+COUNT_ESTIMATE_THRESHOLD = int(os.getenv("COUNT_ESTIMATE_THRESHOLD", "100000"))
+
+count_cache = TTLCache(maxsize=1000, ttl=COUNT_CACHE_TTL)
+
+class CountService:
+    @staticmethod
+    def get_total(db: Session, model: Type[Base], key: Hashable, filters: Sequence = (), counter: Optional[Callable[[StatCounter], int]] = None) -> Tuple[int, bool]:
+        """
+        Total rows of a list, cheapest source first:
+        the trigger-maintained stat counters (exact), a planner estimate for large unfiltered tables,
+        else COUNT(*)
+        Returns: (total, exact)
+        """
+        # Totals read on a lagging replica are cached apart: a client kept on the primary after
+        # its write must never get one (in X-Total-Count or the list ETag)
+        if is_replica_session(db):
+            key = ("replica", key)
+        cached = count_cache.get(key)
+        if cached is not None:
+            return cached
+
+        result = None
+        if counter is not None:
+            counters = StatsService.get_counters(db, ALL_SCOPE)
+            if counters is not None:
+                result = (counter(counters), True)
+        if result is None and not filters:
+            estimate = CountService.estimate_rows(db, model)
+            if estimate is not None and estimate >= COUNT_ESTIMATE_THRESHOLD:
+                result = (estimate, False)
+        if result is None:
+            result = (db.scalar(select(func.count()).select_from(model).where(*filters)), True)
+
+        count_cache.set(key, result)
+        return result
+
+    @staticmethod
+    def estimate_rows(db: Session, model: Type[Base]) -> Optional[int]:
+        """Row estimate kept by VACUUM/ANALYZE (Postgres only, None when never analyzed)"""
+        if db.get_bind().dialect.name != "postgresql":
+            return None
+        estimate = db.scalar(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"),
+            {"table": model.__tablename__}
+        )
+        return estimate if estimate is not None and estimate >= 0 else None
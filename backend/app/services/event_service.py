@@ -0,0 +1,257 @@
+import asyncio
+import logging
+import os
+import queue
+import select
+import threading
+import uuid
+from collections import deque
+from itertools import count
+from typing import Iterable, List, Optional, Tuple
+from app.schemas.event_schemas import ChangeEvent, EventAction, EventResource
+
+logger = logging.getLogger(__name__)
+
+# Change feed behind GET /events
+# EVENTS_BACKEND: "local" (in-process, one worker) or "postgres" (LISTEN/NOTIFY fan-out across workers)
+EVENTS_BACKEND = os.getenv("EVENTS_BACKEND", "local").lower()
+EVENTS_CHANNEL = os.getenv("EVENTS_CHANNEL", "change_events")
+# Recent events kept per worker for Last-Event-ID resumes
+EVENTS_BACKLOG_SIZE = int(os.getenv("EVENTS_BACKLOG_SIZE", "1000"))
+# Events buffered per connection; a client this far behind gets a reset instead
+EVENTS_QUEUE_SIZE = int(os.getenv("EVENTS_QUEUE_SIZE", "256"))
+
+class Subscription:
+    """
+    One open /events stream: an asyncio queue on the stream's event loop plus its filters
+    None in the queue means events were dropped and the client must refetch
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, resource: Optional[EventResource] = None, user_id: Optional[int] = None):
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=EVENTS_QUEUE_SIZE)
+        self.resource = resource
+        self.user_id = user_id
+
+    def matches(self, event: ChangeEvent) -> bool:
+        if self.resource is not None and event.resource != self.resource:
+            return False
+        # Imports may span users, every user-filtered stream hears about them
+        if self.user_id is not None and event.user_id != self.user_id and event.action != EventAction.imported:
+            return False
+        return True
+
+    def put(self, event: ChangeEvent) -> None:
+        """Runs on the subscriber's loop"""
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+class Broadcaster:
+    """
+    In-process fan-out of change events to open streams, with a bounded backlog for resumes
+    publish() is thread-safe: sync services call it from the threadpool, async ones from the loop
+    """
+
+    def __init__(self, backlog_size: int = EVENTS_BACKLOG_SIZE):
+        self._lock = threading.Lock()
+        self._subscribers: List[Subscription] = []
+        self._backlog: deque = deque(maxlen=backlog_size)
+        # Ids restart with the process, the prefix keeps a stale Last-Event-ID from matching
+        self._epoch = uuid.uuid4().hex[:8]
+        self._ids = count(1)
+        self.published = 0
+        self.dropped = 0
+
+    def publish(self, events: Iterable[ChangeEvent]) -> None:
+        for event in events:
+            self._dispatch(event.model_copy(update={"id": f"{self._epoch}-{next(self._ids)}"}))
+
+    def _dispatch(self, event: ChangeEvent) -> None:
+        with self._lock:
+            self._backlog.append(event)
+            self.published += 1
+            for subscription in self._subscribers:
+                if subscription.matches(event):
+                    try:
+                        subscription.loop.call_soon_threadsafe(subscription.put, event)
+                    except RuntimeError:
+                        # Loop already closed, the stream's cleanup will unsubscribe it
+                        self.dropped += 1
+
+    def subscribe(self, subscription: Subscription, last_event_id: Optional[str] = None) -> Tuple[List[ChangeEvent], bool]:
+        """
+        Register a stream and return the backlog to replay before live events
+        Returns: (missed events, whether the client must refetch because last_event_id is gone)
+        """
+        with self._lock:
+            self._subscribers.append(subscription)
+            if last_event_id is None:
+                return [], False
+            missed = []
+            for event in reversed(self._backlog):
+                if event.id == last_event_id:
+                    missed.reverse()
+                    return [event for event in missed if subscription.matches(event)], False
+                missed.append(event)
+            return [], True
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            if subscription in self._subscribers:
+                self._subscribers.remove(subscription)
+
+    def close(self) -> None:
+        pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "backend": type(self).__name__,
+                "subscribers": len(self._subscribers),
+                "backlog": len(self._backlog),
+                "published": self.published,
+                "dropped": self.dropped,
+            }
+
+class PostgresBroadcaster(Broadcaster):
+    """
+    Fan-out across workers through LISTEN/NOTIFY on one dedicated connection per worker
+    Published events go out as NOTIFY and come back to every worker (this one included),
+    so all workers share event ids from the change_event_ids sequence and can resume each other's streams
+    Needs psycopg2; events published while the connection is down are lost (clients get a reset on resume)
+    """
+
+    def __init__(self, url: str, channel: str = EVENTS_CHANNEL, backlog_size: int = EVENTS_BACKLOG_SIZE):
+        try:
+            import psycopg2
+        except ImportError:
+            raise RuntimeError("EVENTS_BACKEND=postgres requires the psycopg2 package")
+        super().__init__(backlog_size)
+        self._psycopg2 = psycopg2
+        self._url = url
+        self._channel = channel
+        self._outbox: queue.Queue = queue.Queue()
+        # Self-pipe wakes the listener thread as soon as something is published
+        self._wakeup_read, self._wakeup_write = os.pipe()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _ensure_started(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="events-listener", daemon=True)
+                self._thread.start()
+
+    def publish(self, events: Iterable[ChangeEvent]) -> None:
+        self._ensure_started()
+        for event in events:
+            self._outbox.put(event)
+        os.write(self._wakeup_write, b"x")
+
+    def subscribe(self, subscription, last_event_id=None):
+        self._ensure_started()
+        return super().subscribe(subscription, last_event_id)
+
+    def close(self) -> None:
+        self._stop.set()
+        os.write(self._wakeup_write, b"x")
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            conn = None
+            try:
+                conn = self._psycopg2.connect(self._url)
+                conn.autocommit = True
+                with conn.cursor() as cursor:
+                    cursor.execute(f"LISTEN {self._channel}")
+                self._listen(conn)
+            except self._psycopg2.Error:
+                logger.exception("Change feed connection failed, reconnecting")
+                self._stop.wait(1)
+            finally:
+                if conn is not None:
+                    conn.close()
+
+    def _listen(self, conn) -> None:
+        while not self._stop.is_set():
+            self._flush(conn)
+            readable, _, _ = select.select([conn, self._wakeup_read], [], [], 5)
+            if self._wakeup_read in readable:
+                os.read(self._wakeup_read, 4096)
+            if conn in readable:
+                conn.poll()
+                while conn.notifies:
+                    event_id, payload = conn.notifies.pop(0).payload.split(" ", 1)
+                    self._dispatch(ChangeEvent.model_validate_json(payload).model_copy(update={"id": event_id}))
+
+    def _flush(self, conn) -> None:
+        """NOTIFY everything in the outbox with one statement"""
+        payloads = []
+        while True:
+            try:
+                payloads.append(self._outbox.get_nowait().model_dump_json(exclude={"id"}))
+            except queue.Empty:
+                break
+        if payloads:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    "SELECT pg_notify(%s, nextval('change_event_ids') || ' ' || payload) FROM unnest(%s::text[]) AS payload",
+                    (self._channel, payloads),
+                )
+
+def get_broadcaster(name: str = EVENTS_BACKEND) -> Broadcaster:
+    """Build the broadcaster selected by EVENTS_BACKEND"""
+    if name == "local":
+        return Broadcaster()
+    if name == "postgres":
+        from app.db import SQLALCHEMY_DATABASE_URL
+        from sqlalchemy.engine import make_url
+        url = make_url(SQLALCHEMY_DATABASE_URL).set(drivername="postgresql")
+        return PostgresBroadcaster(url.render_as_string(hide_password=False))
+    raise RuntimeError(f"Unknown EVENTS_BACKEND: {name}")
+
+broadcaster = get_broadcaster()
+
+class ChangeFeed:
+    """
+    Publishes the committed changes of one resource; services call it next to their cache updates
+    """
+
+    def __init__(self, resource: EventResource, target: Optional[Broadcaster] = None):
+        self.resource = resource
+        self._broadcaster = target
+
+    @property
+    def broadcaster(self) -> Broadcaster:
+        return self._broadcaster or broadcaster
+
+    def _publish(self, action: EventAction, rows) -> None:
+        events = [
+            ChangeEvent(resource=self.resource, action=action, item_id=row.id, user_id=row.user_id, version=getattr(row, "version", None))
+            for row in rows
+        ]
+        if events:
+            self.broadcaster.publish(events)
+
+    def created(self, *rows) -> None:
+        self._publish(EventAction.created, rows)
+
+    def updated(self, *rows) -> None:
+        self._publish(EventAction.updated, rows)
+
+    def deleted(self, *rows) -> None:
+        """rows: anything with id and user_id, e.g. DELETE ... RETURNING id, user_id"""
+        self._publish(EventAction.deleted, rows)
+
+    def imported(self, count: int) -> None:
+        if count:
+            self.broadcaster.publish([ChangeEvent(resource=self.resource, action=EventAction.imported, count=count)])
+
+task_feed = ChangeFeed(EventResource.task)
+note_feed = ChangeFeed(EventResource.note)
@@ -0,0 +1,184 @@
+import asyncio
+import threading
+import uuid
+from datetime import datetime, timezone
+from enum import Enum
+from io import StringIO
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Type
+from fastapi import HTTPException, status
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from app.db import Base
+from app.models.user import User
+from app.schemas.bulk_schemas import BulkError
+from app.schemas.import_schemas import ImportProgress
+from app.services.event_service import ChangeFeed
+from app.utils.bulk import format_validation_error
+from app.utils.importer import Record, IMPORT_CHUNK_SIZE, IMPORT_MAX_ERRORS
+from app.utils.ttl_cache import TTLCache
+
+# Progress of running and recent imports by (user id, import_id), polled through GET /<resource>/import/{import_id}
+# Per worker: poll the worker that runs the import (or run a single worker for onboarding loads)
+import_progress = TTLCache(maxsize=1000, ttl=3600)
+_start_lock = threading.Lock()
+
+def _copy_value(value: Any) -> str:
+    """Encode a value for COPY ... FROM STDIN in text format"""
+    if value is None:
+        return "\\N"
+    if isinstance(value, Enum):
+        value = value.value
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+class ImportService:
+    @staticmethod
+    def start(owner_id: int, import_id: Optional[str] = None) -> ImportProgress:
+        """
+        Register a new import so its owner can poll its progress while the upload streams in
+        Raises: HTTPException 409 if the owner is already running an import with this id
+        """
+        progress = ImportProgress(import_id=import_id or uuid.uuid4().hex)
+        key = (owner_id, progress.import_id)
+        with _start_lock:
+            running = import_progress.get(key)
+            if running is not None and not running.done:
+                raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"Import {progress.import_id} is already running")
+            import_progress.set(key, progress)
+        return progress
+
+    @staticmethod
+    def get_progress(owner_id: int, import_id: str) -> Optional[ImportProgress]:
+        """Progress of one of the owner's imports, other users' imports are never visible"""
+        return import_progress.get((owner_id, import_id))
+
+    @staticmethod
+    def _reject(progress: ImportProgress, index: int, detail: str) -> None:
+        progress.rejected += 1
+        if len(progress.errors) < IMPORT_MAX_ERRORS:
+            progress.errors.append(BulkError(index=index, detail=detail))
+
+    @staticmethod
+    def _validate_chunk(adapter: TypeAdapter, schema: Type[BaseModel], chunk: List[Tuple[int, Dict[str, Any]]], progress: ImportProgress) -> List[Tuple[int, Dict[str, Any]]]:
+        """Validate a chunk in one call, falling back to row by row to pinpoint bad rows"""
+        try:
+            rows = adapter.dump_python(adapter.validate_python([row for _, row in chunk]))
+            return [(index, row) for (index, _), row in zip(chunk, rows)]
+        except ValidationError:
+            pass
+        
+        valid = []
+        for index, row in chunk:
+            try:
+                valid.append((index, schema.model_validate(row).model_dump()))
+            except ValidationError as exc:
+                ImportService._reject(progress, index, format_validation_error(exc))
+        return valid
+
+    @staticmethod
+    async def import_records(db: Session, records: AsyncIterator[Record], model: Type[Base], schema: Type[BaseModel], progress: ImportProgress, feed: Optional[ChangeFeed] = None) -> ImportProgress:
+        """
+        Validate parsed rows against schema and load them chunk by chunk
+        Parsing the next chunk overlaps with loading the previous one; memory stays at two chunks
+        Each chunk is committed on its own, so progress is durable (and announced on feed, one event per chunk)
+        """
+        adapter = TypeAdapter(List[schema])
+        loading: Optional[asyncio.Future] = None
+
+        async def flush(chunk):
+            nonlocal loading
+            # Validating a chunk takes a while: keep it off the event loop, like the load
+            valid = await run_in_threadpool(ImportService._validate_chunk, adapter, schema, chunk, progress)
+            if loading is not None:
+                ImportService._apply(progress, await loading, feed)
+                loading = None
+            if valid:
+                loading = asyncio.ensure_future(run_in_threadpool(ImportService.load_chunk, db, model, valid))
+
+        chunk: List[Tuple[int, Dict[str, Any]]] = []
+        try:
+            async for index, row, error in records:
+                progress.processed += 1
+                if error is not None:
+                    ImportService._reject(progress, index, error)
+                    continue
+                chunk.append((index, row))
+                if len(chunk) >= IMPORT_CHUNK_SIZE:
+                    await flush(chunk)
+                    chunk = []
+            await flush(chunk)
+        finally:
+            # Never leave a load running on the session after the request ends
+            if loading is not None:
+                ImportService._apply(progress, await loading, feed)
+            # No longer running (a failed upload too), its import_id can be reused
+            progress.done = True
+        return progress
+
+    @staticmethod
+    def _apply(progress: ImportProgress, result: Tuple[int, List[Tuple[int, str]]], feed: Optional[ChangeFeed] = None) -> None:
+        """Record the outcome of load_chunk (run on the event loop, not in the loader thread)"""
+        imported, rejects = result
+        progress.imported += imported
+        if feed is not None:
+            feed.imported(imported)
+        for index, detail in rejects:
+            ImportService._reject(progress, index, detail)
+
+    @staticmethod
+    def load_chunk(db: Session, model: Type[Base], chunk: List[Tuple[int, Dict[str, Any]]]) -> Tuple[int, List[Tuple[int, str]]]:
+        """
+        Load one validated chunk: COPY on Postgres (psycopg2), executemany elsewhere
+        Returns: (rows imported, [(index, reason)] for rejected rows)
+        """
+        rejects = []
+        # Reject rows pointing at unknown users up front, one IN query per chunk
+        user_ids = {row["user_id"] for _, row in chunk if row.get("user_id") is not None}
+        if user_ids:
+            known = set(db.scalars(select(User.id).where(User.id.in_(user_ids))))
+            rejects = [
+                (index, f"user_id: unknown user {row['user_id']}")
+                for index, row in chunk if row.get("user_id") is not None and row["user_id"] not in known
+            ]
+            chunk = [(index, row) for index, row in chunk if row.get("user_id") is None or row["user_id"] in known]
+        if not chunk:
+            return 0, rejects
+
+        # Python-side timestamps, keep sub-second precision like the ORM inserts
+        now = datetime.now(timezone.utc)
+        rows = [{**row, "created_at": now, "updated_at": now} for _, row in chunk]
+        bind = db.get_bind()
+        try:
+            if bind.dialect.name == "postgresql" and bind.dialect.driver == "psycopg2":
+                ImportService._copy_rows(db, model, rows)
+            else:
+                # Core insert on the table: plain executemany, no ORM bookkeeping per row
+                db.execute(insert(model.__table__), rows)
+            db.commit()
+        # COPY goes through the raw driver cursor, whose errors SQLAlchemy doesn't wrap
+        except (IntegrityError, bind.dialect.dbapi.IntegrityError) as exc:
+            db.rollback()
+            return 0, rejects + [(index, f"Chunk rolled back: {getattr(exc, 'orig', exc)}") for index, _ in chunk]
+        return len(rows), rejects
+
+    @staticmethod
+    def _copy_rows(db: Session, model: Type[Base], rows: List[Dict[str, Any]]) -> None:
+        """COPY ... FROM STDIN in the session's transaction"""
+        columns = list(rows[0])
+        buffer = StringIO()
+        for row in rows:
+            buffer.write("\t".join(_copy_value(row[column]) for column in columns))
+            buffer.write("\n")
+        buffer.seek(0)
+
+        cursor = db.connection().connection.driver_connection.cursor()
+        try:
+            cursor.copy_expert(f"COPY {model.__tablename__} ({', '.join(columns)}) FROM STDIN", buffer)
+        finally:
+            cursor.close()
@@ -1,21 +1,123 @@
+from sqlalchemy import select, tuple_, insert, update, delete
 from sqlalchemy.orm import Session
+from fastapi import HTTPException, status
 from app.models.note_model import Note
-from app.schemas.note_schemas import NoteCreate, NoteUpdate, NoteResponse
-from typing import List, Optional
+from app.schemas.note_schemas import NoteCreate, NoteUpdate, NoteResponse, NoteBulkUpdate, note_list_adapter
+from app.schemas.bulk_schemas import BulkError
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.utils.bulk import validate_rows, group_updates, bulk_transaction, check_bulk_size
+from app.utils.export import EXPORT_BATCH_SIZE
+from app.utils.importer import Record
+from app.schemas.import_schemas import ImportProgress
+from app.services.import_service import ImportService
+from app.services.sync_service import SyncService
+from app.services.event_service import note_feed
+from app.services.cache_service import ItemCache, NOTE_CACHE_TTL
+from app.utils.replicas import is_replica_session
+from app.utils.fieldsets import Fieldset, get_fieldset
+from app.services.count_service import CountService
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+# Read-through cache of single notes for GET /notes/{id}
+note_cache = ItemCache("note", NoteResponse, NOTE_CACHE_TTL)
+
+# Columns behind NoteResponse, lets list endpoints skip ORM hydration
+NOTE_RESPONSE_COLUMNS = tuple(getattr(Note, name) for name in NoteResponse.model_fields)
 
 class NoteService:
     @staticmethod
     def _get_note_by_id(db: Session, note_id: int) -> Optional[Note]:
-        """Private helper method to get note by ID"""
-        return db.query(Note).filter(Note.id == note_id).first()
+        """Private helper method to get note by ID (from the identity map when already loaded, e.g. by POST /batch)"""
+        return db.get(Note, note_id)
     
     @staticmethod
-    def get_note(db: Session, note_id: int) -> Optional[Note]:
-        return NoteService._get_note_by_id(db, note_id)
+    def get_note(db: Session, note_id: int) -> Optional[NoteResponse]:
+        """Served from note_cache when possible; returns a detached snapshot"""
+        return note_cache.get_or_load(note_id, lambda: NoteService._get_note_by_id(db, note_id), publish=not is_replica_session(db))
     
     @staticmethod
     def get_notes(db: Session, skip: int = 0, limit: int = 100) -> List[Note]:
-        return db.query(Note).offset(skip).limit(limit).all()
+        return db.query(Note).order_by(Note.id).offset(skip).limit(limit).all()
+    
+    @staticmethod
+    def get_fieldset(fields: Optional[str] = None, preview_chars: Optional[int] = None) -> Fieldset:
+        """Columns and serializer for GET /notes/?fields=...; preview_chars truncates content"""
+        return get_fieldset(NoteResponse, Note, note_list_adapter, fields, "content", preview_chars)
+    
+    @staticmethod
+    def get_note_rows(db: Session, skip: int = 0, limit: int = 100, columns: tuple = NOTE_RESPONSE_COLUMNS) -> List[Dict[str, Any]]:
+        """Same page as get_notes as plain column dicts, for the fast JSON list path (columns: a sparse fieldset)"""
+        query = db.query(*columns).order_by(Note.id).offset(skip).limit(limit)
+        return [row._asdict() for row in query]
+    
+    @staticmethod
+    def count_notes(db: Session) -> Tuple[int, bool]:
+        """Total behind GET /notes/ from the stat counters (cached), returns (total, exact)"""
+        return CountService.get_total(db, Note, ("notes",), (), lambda counters: counters.notes_total)
+    
+    @staticmethod
+    def get_note_versions(db: Session, skip: int = 0, limit: int = 100) -> List[Tuple[int, int]]:
+        """(id, version) of the rows get_notes would return, a cheap fingerprint for ETags"""
+        query = db.query(Note.id, Note.version).order_by(Note.id).offset(skip).limit(limit)
+        return [tuple(row) for row in query]
+    
+    @staticmethod
+    def get_note_changes(db: Session, since: Optional[str] = None, limit: int = 500, user_id: Optional[int] = None) -> dict:
+        """Notes changed and ids deleted since the sync token (see SyncService.get_changes)"""
+        return SyncService.get_changes(db, Note, "note", since, limit, user_id)
+    
+    @staticmethod
+    def get_notes_page(db: Session, cursor: Optional[str] = None, limit: int = 100) -> Tuple[List[Note], Optional[str]]:
+        """Get a page of notes after the cursor, ordered by (created_at, id)"""
+        query = db.query(Note)
+        
+        if cursor:
+            created_at, note_id = decode_cursor(cursor)
+            query = query.filter(tuple_(Note.created_at, Note.id) > tuple_(created_at, note_id))
+        
+        # Fetch one extra row to know whether another page exists
+        notes = query.order_by(Note.created_at, Note.id).limit(limit + 1).all()
+        
+        next_cursor = None
+        if len(notes) > limit:
+            notes = notes[:limit]
+            next_cursor = encode_cursor(notes[-1].created_at, notes[-1].id)
+        return notes, next_cursor
+    
+    @staticmethod
+    def _user_notes_query(db: Session, user_id: int):
+        """Private helper building the owner-scoped note query"""
+        return db.query(Note).filter(Note.user_id == user_id).order_by(Note.created_at, Note.id)
+    
+    @staticmethod
+    def get_user_notes(db: Session, user_id: int, skip: int = 0, limit: int = 100) -> List[Note]:
+        return NoteService._user_notes_query(db, user_id).offset(skip).limit(limit).all()
+    
+    @staticmethod
+    def export_stmt(user_id: Optional[int] = None, created_from: Optional[datetime] = None, created_to: Optional[datetime] = None):
+        """Export statement, shared with AsyncNoteService; created_from is inclusive, created_to exclusive"""
+        stmt = select(*NOTE_RESPONSE_COLUMNS)
+        
+        if user_id is not None:
+            stmt = stmt.where(Note.user_id == user_id)
+        if created_from is not None:
+            stmt = stmt.where(Note.created_at >= created_from)
+        if created_to is not None:
+            stmt = stmt.where(Note.created_at < created_to)
+        
+        return stmt.order_by(Note.id).execution_options(yield_per=EXPORT_BATCH_SIZE)
+    
+    @staticmethod
+    def iter_note_batches(db: Session, **filters) -> Iterator[List[Dict[str, Any]]]:
+        """Stream matching notes as batches of column dicts (server-side cursor via yield_per)"""
+        for partition in db.execute(NoteService.export_stmt(**filters)).partitions():
+            yield [row._asdict() for row in partition]
+    
+    @staticmethod
+    async def import_notes(db: Session, records: AsyncIterator[Record], progress: ImportProgress) -> ImportProgress:
+        """Validate streamed rows against NoteCreate and load them in chunks (COPY on Postgres)"""
+        return await ImportService.import_records(db, records, Note, NoteCreate, progress, note_feed)
     
     @staticmethod
     def create_note(db: Session, note: NoteCreate) -> Note:
@@ -23,32 +125,114 @@ class NoteService:
         db.add(db_note)
         db.commit()
         db.refresh(db_note)
+        note_cache.store(db_note)
+        note_feed.created(db_note)
         return db_note
     
     @staticmethod
-    def update_note(db: Session, note_id: int, note_update: NoteUpdate) -> Optional[Note]:
-        db_note = NoteService._get_note_by_id(db, note_id)
-
+    def _raise_if_conflict(db: Session, note_id: int, expected_version: Optional[int]) -> None:
+        """Private helper: after a guarded statement matched nothing, tell a stale version from a missing note"""
+        if expected_version is not None and db.query(Note.id).filter(Note.id == note_id).first():
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED,
+                detail="Note was modified by another request"
+            )
+    
+    @staticmethod
+    def update_note(db: Session, note_id: int, note_update: NoteUpdate, expected_version: Optional[int] = None) -> Optional[Note]:
+        # Update only provided fields, in a single UPDATE ... RETURNING
+        update_data = note_update.model_dump(exclude_unset=True)
+        stmt = update(Note).where(Note.id == note_id).values(**update_data, version=Note.version + 1).returning(Note)
+        if expected_version is not None:
+            stmt = stmt.where(Note.version == expected_version)
+        
+        db_note = db.scalars(stmt).first()
         if not db_note:
+            db.rollback()
+            NoteService._raise_if_conflict(db, note_id, expected_version)
             return None
         
-        # Update only provided fields
-        update_data = note_update.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_note, field, value)
-        
+        # Built from the RETURNING row, detach so commit doesn't expire it
+        db.expunge(db_note)
         db.commit()
-        db.refresh(db_note)
+        note_cache.store(db_note)
+        note_feed.updated(db_note)
         return db_note
     
     @staticmethod
-    def delete_note(db: Session, note_id: int) -> bool:
-        db_note = NoteService._get_note_by_id(db, note_id)
+    def delete_note(db: Session, note_id: int, expected_version: Optional[int] = None) -> bool:
+        stmt = delete(Note).where(Note.id == note_id).returning(Note.id, Note.user_id)
+        if expected_version is not None:
+            stmt = stmt.where(Note.version == expected_version)
         
-        if not db_note:
+        deleted = db.execute(stmt).first()
+        if deleted is None:
+            db.rollback()
+            NoteService._raise_if_conflict(db, note_id, expected_version)
             return False
         
-        db.delete(db_note)
         db.commit()
+        note_cache.invalidate(note_id)
+        note_feed.deleted(deleted)
         return True
-        
\ No newline at end of file
+    
+    @staticmethod
+    def bulk_create_notes(db: Session, rows: List[Dict[str, Any]]) -> Tuple[List[Note], List[BulkError]]:
+        """Create many notes with multi-row INSERT ... RETURNING in one transaction"""
+        valid, errors = validate_rows(rows, NoteCreate)
+        notes = []
+        
+        with bulk_transaction(db):
+            if valid:
+                stmt = insert(Note).returning(Note, sort_by_parameter_order=True)
+                notes = list(db.scalars(stmt, [note.model_dump() for _, note in valid]))
+                # Detach so commit doesn't expire them (re-selecting every row)
+                for note in notes:
+                    db.expunge(note)
+        note_feed.created(*notes)
+        return notes, errors
+    
+    @staticmethod
+    def bulk_update_notes(db: Session, rows: List[Dict[str, Any]]) -> Tuple[List[Note], List[BulkError]]:
+        """Update many notes with one UPDATE ... WHERE id IN (...) per distinct change set"""
+        valid, errors = validate_rows(rows, NoteBulkUpdate)
+        groups, group_errors = group_updates(valid)
+        errors.extend(group_errors)
+        notes = []
+        
+        with bulk_transaction(db):
+            for changes, targets in groups.items():
+                ids = [note_id for _, note_id in targets]
+                stmt = update(Note).where(Note.id.in_(ids)).values(**dict(changes), version=Note.version + 1).returning(Note)
+                updated = list(db.scalars(stmt))
+                found = {note.id for note in updated}
+                errors.extend(
+                    BulkError(index=index, id=note_id, detail="Note not found")
+                    for index, note_id in targets if note_id not in found
+                )
+                notes.extend(updated)
+            for note in notes:
+                db.expunge(note)
+        note_cache.invalidate(*(note.id for note in notes))
+        note_feed.updated(*notes)
+        
+        errors.sort(key=lambda error: error.index)
+        return notes, errors
+    
+    @staticmethod
+    def bulk_delete_notes(db: Session, ids: List[int]) -> Tuple[List[int], List[BulkError]]:
+        """Delete many notes with one DELETE ... WHERE id IN (...) RETURNING id, user_id"""
+        check_bulk_size(len(ids))
+        
+        with bulk_transaction(db):
+            rows = db.execute(delete(Note).where(Note.id.in_(ids)).returning(Note.id, Note.user_id)).all()
+        deleted = {row.id for row in rows}
+        note_cache.invalidate(*deleted)
+        note_feed.deleted(*rows)
+        
+        errors = [
+            BulkError(index=index, id=note_id, detail="Note not found")
+            for index, note_id in enumerate(ids) if note_id not in deleted
+        ]
+        return sorted(deleted), errors
+
@@ -0,0 +1,87 @@
+import html
+import re
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from app.schemas.search_schemas import SearchHit, SearchType
+
+# (table, snippet column) per searchable type; titles are searched too
+SEARCHABLE = {
+    "task": ("tasks", "description"),
+    "note": ("notes", "content"),
+}
+
+# Match delimiters asked from the database (private use characters), turned into <mark> tags
+# once the snippet text is HTML-escaped
+MARK_START, MARK_STOP = "\ue000", "\ue001"
+
+class SearchService:
+    @staticmethod
+    def search(db: Session, q: str, limit: int = 20, type: Optional[SearchType] = None) -> List[SearchHit]:
+        """
+        Full-text search over task titles/descriptions and note titles/contents
+        Postgres: search_vector + GIN index; SQLite: FTS5 tables
+        """
+        search = SearchService._search_postgres if db.bind.dialect.name == "postgresql" else SearchService._search_sqlite
+        hits = []
+        for kind in ([type] if type else SEARCHABLE):
+            hits.extend(search(db, kind, q, limit))
+        hits.sort(key=lambda hit: hit.rank, reverse=True)
+        return hits[:limit]
+
+    @staticmethod
+    def _search_postgres(db: Session, kind: str, q: str, limit: int) -> List[SearchHit]:
+        table, body = SEARCHABLE[kind]
+        # ts_headline is expensive, only run it on the top rows
+        rows = db.execute(text(f"""
+            WITH query AS (SELECT websearch_to_tsquery('english', :q) AS q),
+            top AS (
+                SELECT t.id, t.title, t.{body} AS body, ts_rank(t.search_vector, query.q) AS rank
+                FROM {table} t, query
+                WHERE t.search_vector @@ query.q
+                ORDER BY rank DESC
+                LIMIT :limit
+            )
+            SELECT top.id, top.title, top.rank,
+                   ts_headline('english', coalesce(top.body, top.title, ''), query.q, :options) AS snippet
+            FROM top, query
+            ORDER BY top.rank DESC
+        """), {"q": q, "limit": limit, "options": f"StartSel={MARK_START}, StopSel={MARK_STOP}, MaxFragments=2, MaxWords=20, MinWords=5"})
+        return [SearchHit(type=kind, id=row.id, title=row.title, snippet=SearchService._highlight(row.snippet), rank=row.rank) for row in rows]
+
+    @staticmethod
+    def _search_sqlite(db: Session, kind: str, q: str, limit: int) -> List[SearchHit]:
+        match = SearchService._fts5_query(q)
+        if not match:
+            return []
+        table, _ = SEARCHABLE[kind]
+        fts = f"{table}_fts"
+        # bm25 is lower-is-better, titles weigh twice as much as the body
+        rows = db.execute(text(f"""
+            SELECT t.id, t.title, -bm25({fts}, 2.0, 1.0) AS rank,
+                   snippet({fts}, -1, :start, :stop, '…', 12) AS snippet
+            FROM {fts} JOIN {table} t ON t.id = {fts}.rowid
+            WHERE {fts} MATCH :match
+            ORDER BY rank DESC
+            LIMIT :limit
+        """), {"match": match, "limit": limit, "start": MARK_START, "stop": MARK_STOP})
+        return [SearchHit(type=kind, id=row.id, title=row.title, snippet=SearchService._highlight(row.snippet), rank=row.rank) for row in rows]
+
+    @staticmethod
+    def _highlight(snippet: Optional[str]) -> str:
+        """HTML-escape a snippet, then turn its match delimiters into <mark> tags"""
+        escaped = html.escape(snippet or "")
+        return escaped.replace(MARK_START, "<mark>").replace(MARK_STOP, "</mark>")
+
+    @staticmethod
+    def _fts5_query(q: str) -> str:
+        """
+        Turn free text into a safe FTS5 query: every word must match,
+        the last one as a prefix so search-as-you-type works
+        """
+        words = re.findall(r"\w+", q)
+        if not words:
+            return ""
+        terms = [f'"{word}"' for word in words]
+        terms[-1] += "*"
+        return " ".join(terms)
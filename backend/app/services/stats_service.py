@@ -0,0 +1,148 @@
+from collections import defaultdict
+from datetime import date, datetime, timezone
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import case, delete, func, select, text
+from sqlalchemy.orm import Session
+from app.models.task_model import Task, PriorityEnum
+from app.models.note_model import Note
+from app.models.stats_model import StatCounter, TaskDueCounter
+
+# Scope of the counters covering every row, other scopes are user ids
+ALL_SCOPE = 0
+COUNTER_FIELDS = ("tasks_total", "tasks_completed", "tasks_low", "tasks_medium", "tasks_high", "notes_total")
+
+class StatsService:
+    @staticmethod
+    def get_stats(db: Session, scope: int = ALL_SCOPE, top_users: int = 0) -> dict:
+        """
+        Dashboard statistics from the trigger-maintained counters
+        Cost depends on the number of distinct due days with open tasks, not on the number of tasks
+        """
+        counters = StatsService.get_counters(db, scope)
+        values = {field: getattr(counters, field) if counters else 0 for field in COUNTER_FIELDS}
+        
+        today = datetime.now(timezone.utc).date()
+        overdue, due_today = db.execute(
+            select(
+                func.coalesce(func.sum(case((TaskDueCounter.due_day < today, TaskDueCounter.open_count), else_=0)), 0),
+                func.coalesce(func.sum(case((TaskDueCounter.due_day == today, TaskDueCounter.open_count), else_=0)), 0),
+            ).where(TaskDueCounter.scope == scope, TaskDueCounter.due_day <= today)
+        ).one()
+        
+        stats = {
+            "tasks": {
+                "total": values["tasks_total"],
+                "completed": values["tasks_completed"],
+                "open": values["tasks_total"] - values["tasks_completed"],
+                "by_priority": {"low": values["tasks_low"], "medium": values["tasks_medium"], "high": values["tasks_high"]},
+                "overdue": overdue,
+                "due_today": due_today,
+            },
+            "notes": {"total": values["notes_total"]},
+        }
+        if top_users:
+            # User scopes are never sharded, one row each
+            rows = db.execute(
+                select(StatCounter.scope, StatCounter.notes_total)
+                .where(StatCounter.scope != ALL_SCOPE, StatCounter.notes_total > 0)
+                .order_by(StatCounter.notes_total.desc(), StatCounter.scope)
+                .limit(top_users)
+            )
+            stats["notes_per_user"] = [{"user_id": user_id, "notes": notes} for user_id, notes in rows]
+        return stats
+    
+    @staticmethod
+    def get_counters(db: Session, scope: int = ALL_SCOPE) -> Optional[StatCounter]:
+        """Counters of one scope summed over its shards (a transient StatCounter), None before any write"""
+        totals = db.execute(
+            select(func.count(), *(func.coalesce(func.sum(getattr(StatCounter, field)), 0) for field in COUNTER_FIELDS))
+            .where(StatCounter.scope == scope)
+        ).one()
+        if not totals[0]:
+            return None
+        return StatCounter(scope=scope, **dict(zip(COUNTER_FIELDS, totals[1:])))
+    
+    @staticmethod
+    def compute_counters(db: Session) -> Tuple[Dict[int, Dict[str, int]], Dict[Tuple[int, date], int]]:
+        """Recompute every counter from the base tables (full scans, for the consistency job only)"""
+        counters = defaultdict(lambda: dict.fromkeys(COUNTER_FIELDS, 0))
+        due = defaultdict(int)
+        
+        def is_(condition):
+            return func.sum(case((condition, 1), else_=0))
+        
+        task_rows = db.execute(
+            select(
+                Task.user_id, func.count(), is_(Task.completed),
+                is_(Task.priority == PriorityEnum.low), is_(Task.priority == PriorityEnum.medium), is_(Task.priority == PriorityEnum.high),
+            ).group_by(Task.user_id)
+        )
+        for user_id, *totals in task_rows:
+            for scope in (ALL_SCOPE, user_id):
+                if scope is None:
+                    continue
+                for field, value in zip(COUNTER_FIELDS, totals):
+                    counters[scope][field] += value
+        
+        for user_id, notes in db.execute(select(Note.user_id, func.count()).group_by(Note.user_id)):
+            for scope in (ALL_SCOPE, user_id):
+                if scope is not None:
+                    counters[scope]["notes_total"] += notes
+        
+        due_rows = db.execute(
+            select(Task.user_id, func.date(Task.due_date), func.count())
+            .where(Task.completed.is_(False), Task.due_date.isnot(None))
+            .group_by(Task.user_id, func.date(Task.due_date))
+        )
+        for user_id, day, count in due_rows:
+            day = date.fromisoformat(str(day))
+            for scope in (ALL_SCOPE, user_id):
+                if scope is not None:
+                    due[(scope, day)] += count
+        
+        return dict(counters), dict(due)
+    
+    @staticmethod
+    def check(db: Session) -> List[str]:
+        """Compare the stored counters with a recount, returns one line per drifted counter"""
+        expected, expected_due = StatsService.compute_counters(db)
+        # Summed over shards
+        stored = defaultdict(lambda: dict.fromkeys(COUNTER_FIELDS, 0))
+        for row in db.scalars(select(StatCounter)):
+            for field in COUNTER_FIELDS:
+                stored[row.scope][field] += getattr(row, field)
+        stored_due = defaultdict(int)
+        for row in db.scalars(select(TaskDueCounter)):
+            stored_due[(row.scope, row.due_day)] += row.open_count
+        
+        drift = []
+        for scope in sorted(expected.keys() | stored.keys()):
+            for field in COUNTER_FIELDS:
+                want, have = expected.get(scope, {}).get(field, 0), stored.get(scope, {}).get(field, 0)
+                if want != have:
+                    drift.append(f"scope {scope} {field}: stored {have}, actual {want}")
+        for key in sorted(expected_due.keys() | stored_due.keys()):
+            want, have = expected_due.get(key, 0), stored_due.get(key, 0)
+            if want != have:
+                drift.append(f"scope {key[0]} open tasks due {key[1]}: stored {have}, actual {want}")
+        return drift
+    
+    @staticmethod
+    def rebuild(db: Session) -> int:
+        """
+        Replace every counter with a recount in one transaction (all in shard 0)
+        On Postgres, writes to tasks/notes wait for the rebuild (SHARE lock), reads don't
+        Returns: number of counter rows written
+        """
+        if db.get_bind().dialect.name == "postgresql":
+            db.execute(text("LOCK TABLE tasks, notes IN SHARE MODE"))
+        counters, due = StatsService.compute_counters(db)
+        
+        db.execute(delete(StatCounter))
+        db.execute(delete(TaskDueCounter))
+        if counters:
+            db.execute(StatCounter.__table__.insert(), [{"scope": scope, **values} for scope, values in counters.items()])
+        if due:
+            db.execute(TaskDueCounter.__table__.insert(), [{"scope": scope, "due_day": day, "open_count": count} for (scope, day), count in due.items()])
+        db.commit()
+        return len(counters) + len(due)
@@ -0,0 +1,92 @@
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple, Type
+from fastapi import HTTPException, status
+from sqlalchemy import delete, select, tuple_
+from sqlalchemy.orm import Session
+from app.db import Base
+from app.models.tombstone_model import Tombstone
+from app.utils.pagination import encode_sync_token, decode_sync_token
+
+# Incremental sync for GET /tasks/changes and /notes/changes
+# Changes younger than SYNC_LAG seconds are sent again on the next call: a transaction that
+# stamped updated_at before a sync but committed after it is still picked up
+SYNC_LAG = float(os.getenv("SYNC_LAG", "5"))
+# Tombstones are kept this long; older tokens get 410 and the client refetches everything
+SYNC_RETENTION_DAYS = int(os.getenv("SYNC_RETENTION_DAYS", "30"))
+
+# Position before every row, the start of a full sync
+EPOCH = (datetime(1970, 1, 1, tzinfo=timezone.utc), 0)
+
+def _at(moment: datetime, position: Tuple[datetime, int]) -> Tuple[datetime, int]:
+    """Position at the start of moment, comparable with position (SQLite hands back naive UTC timestamps)"""
+    return (moment.replace(tzinfo=None) if position[0].tzinfo is None else moment), 0
+
+def _clamp(position: Tuple[datetime, int], horizon: datetime) -> Tuple[datetime, int]:
+    """Move a caught-up position back to the horizon, so the recent window is read again"""
+    return min(position, _at(horizon, position))
+
+def _advance(rows: list, position: Tuple[datetime, int], limit: int, horizon: datetime, key) -> Tuple[list, Tuple[datetime, int], bool]:
+    """Trim the extra row and move the position past the last row returned"""
+    more = len(rows) > limit
+    rows = rows[:limit]
+    if rows:
+        position = key(rows[-1])
+    if not more:
+        position = _clamp(position, horizon)
+    return rows, position, more
+
+class SyncService:
+    @staticmethod
+    def get_changes(db: Session, model: Type[Base], resource: str, since: Optional[str] = None, limit: int = 500, user_id: Optional[int] = None) -> dict:
+        """
+        Rows changed and ids deleted after the since token, each walked by keyset on (timestamp, id)
+        Costs one index range scan per side, proportional to the changes rather than the table
+        Returns: {"items", "deleted", "next", "has_more"}
+        Raises: HTTPException 410 when the token is older than the tombstone retention
+        """
+        now = datetime.now(timezone.utc)
+        horizon = now - timedelta(seconds=SYNC_LAG)
+        if since:
+            items_position, deleted_position = decode_sync_token(since)
+            # Tombstones past the retention may be pruned already, deletions would go unnoticed
+            if deleted_position < _at(now - timedelta(days=SYNC_RETENTION_DAYS), deleted_position):
+                raise HTTPException(
+                    status_code=status.HTTP_410_GONE,
+                    detail="Sync token expired, refetch everything"
+                )
+        else:
+            # A full sync has nothing to delete yet, only deletions from now on matter
+            items_position, deleted_position = EPOCH, (horizon, 0)
+        
+        query = select(model).where(tuple_(model.updated_at, model.id) > tuple_(*items_position))
+        if user_id is not None:
+            query = query.where(model.user_id == user_id)
+        # Fetch one extra row to know whether more changes are waiting
+        items = db.scalars(query.order_by(model.updated_at, model.id).limit(limit + 1)).all()
+        
+        tombstones = select(Tombstone).where(
+            Tombstone.resource == resource,
+            tuple_(Tombstone.deleted_at, Tombstone.id) > tuple_(*deleted_position),
+        )
+        if user_id is not None:
+            tombstones = tombstones.where(Tombstone.user_id == user_id)
+        deleted = db.scalars(tombstones.order_by(Tombstone.deleted_at, Tombstone.id).limit(limit + 1)).all()
+        
+        items, items_position, more_items = _advance(items, items_position, limit, horizon, lambda row: (row.updated_at, row.id))
+        deleted, deleted_position, more_deleted = _advance(deleted, deleted_position, limit, horizon, lambda row: (row.deleted_at, row.id))
+        
+        return {
+            "items": items,
+            "deleted": [tombstone.item_id for tombstone in deleted],
+            "next": encode_sync_token(items_position, deleted_position),
+            "has_more": more_items or more_deleted,
+        }
+    
+    @staticmethod
+    def prune_tombstones(db: Session, older_than_days: int = SYNC_RETENTION_DAYS) -> int:
+        """Delete tombstones past the retention; returns how many were removed"""
+        cutoff = datetime.now(timezone.utc) - timedelta(days=older_than_days)
+        removed = db.execute(delete(Tombstone).where(Tombstone.deleted_at < cutoff)).rowcount
+        db.commit()
+        return removed
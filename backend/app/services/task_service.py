@@ -1,28 +1,250 @@
+from sqlalchemy import select, tuple_, insert, update, delete, case, and_, or_, false
 from sqlalchemy.orm import Session
-from typing import List, Optional
-from app.models.task_model import Task
-from app.schemas.task_schemas import TaskCreate, TaskUpdate
+from fastapi import HTTPException, status
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+from app.models.task_model import Task, PriorityEnum
+from app.schemas.task_schemas import TaskCreate, TaskUpdate, TaskBulkUpdate, TaskResponse, TaskListQuery, task_list_adapter
+from app.schemas.bulk_schemas import BulkError
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.utils.bulk import validate_rows, group_updates, bulk_transaction, check_bulk_size
+from app.utils.export import EXPORT_BATCH_SIZE
+from app.utils.importer import Record
+from app.schemas.import_schemas import ImportProgress
+from app.services.import_service import ImportService
+from app.services.sync_service import SyncService
+from app.services.event_service import task_feed
+from app.services.cache_service import ItemCache, TASK_CACHE_TTL
+from app.utils.replicas import is_replica_session
+from app.utils.fieldsets import Fieldset, get_fieldset
+from app.services.count_service import CountService
+
+# Read-through cache of single tasks for GET /tasks/{id}
+task_cache = ItemCache("task", TaskResponse, TASK_CACHE_TTL)
+
+# Columns behind TaskResponse, lets list endpoints skip ORM hydration
+TASK_RESPONSE_COLUMNS = tuple(getattr(Task, name) for name in TaskResponse.model_fields)
+
+# Semantic order of PriorityEnum (low < medium < high), the database would compare the names alphabetically
+PRIORITY_RANK = case(*((Task.priority == priority, rank) for rank, priority in enumerate(PriorityEnum, 1)))
+SORT_COLUMNS = {
+    "id": Task.id,
+    "title": Task.title,
+    "completed": Task.completed,
+    "priority": PRIORITY_RANK,
+    "due_date": Task.due_date,
+    "created_at": Task.created_at,
+    "updated_at": Task.updated_at,
+}
+NULLABLE_SORT_COLUMNS = {"priority", "due_date"}
+
+# GET /tasks/queue walks ix_tasks_queue bucket by bucket: most urgent priority first, dated tasks before undated ones
+QUEUE_PRIORITIES = (PriorityEnum.high, PriorityEnum.medium, PriorityEnum.low, None)
+
+def _naive_utc(value: datetime) -> datetime:
+    """due_date is a naive UTC column"""
+    return value.astimezone(timezone.utc).replace(tzinfo=None) if value.tzinfo else value
 
 class TaskService:
     @staticmethod
     def _get_task_by_id(db: Session, task_id: int) -> Optional[Task]:
-        """Private helper method to get task by ID"""
-        return db.query(Task).filter(Task.id == task_id).first()
+        """Private helper method to get task by ID (from the identity map when already loaded, e.g. by POST /batch)"""
+        return db.get(Task, task_id)
+    
+    @staticmethod
+    def get_task(db: Session, task_id: int) -> Optional[TaskResponse]:
+        """
+        Get a single task by ID
+        Served from task_cache when possible; returns a detached snapshot
+        """
+        return task_cache.get_or_load(task_id, lambda: TaskService._get_task_by_id(db, task_id), publish=not is_replica_session(db))
+    
+    @staticmethod
+    def list_filters(query: TaskListQuery) -> tuple:
+        """WHERE criteria of GET /tasks/"""
+        filters = []
+        if query.completed is not None:
+            filters.append(Task.completed == query.completed)
+        if query.due_before is not None:
+            filters.append(Task.due_date < _naive_utc(query.due_before))
+        if query.due_after is not None:
+            filters.append(Task.due_date >= _naive_utc(query.due_after))
+        if query.overdue is not None:
+            now = datetime.now(timezone.utc).replace(tzinfo=None)
+            overdue = and_(Task.completed == False, Task.due_date < now)
+            filters.append(overdue if query.overdue else or_(Task.completed == True, Task.due_date.is_(None), Task.due_date >= now))
+        return tuple(filters)
+    
+    @staticmethod
+    def list_order(sort: Optional[str]) -> tuple:
+        """
+        ORDER BY of GET /tasks/ from sort=-priority,due_date; id breaks ties so offsets stay stable
+        Empty values go last either way
+        Raises: HTTPException 400 on unknown fields
+        """
+        order, names = [], []
+        for part in (sort or "").split(","):
+            name = part.strip().lstrip("+-")
+            if not name:
+                continue
+            if name not in SORT_COLUMNS:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Unknown sort field: {name}. Available: {', '.join(SORT_COLUMNS)}"
+                )
+            clause = SORT_COLUMNS[name].desc() if part.strip().startswith("-") else SORT_COLUMNS[name].asc()
+            order.append(clause.nulls_last() if name in NULLABLE_SORT_COLUMNS else clause)
+            names.append(name)
+        if "id" not in names:
+            order.append(Task.id)
+        return tuple(order)
+    
+    @staticmethod
+    def list_stmt(entities, skip: int, limit: int, query: Optional[TaskListQuery] = None):
+        """GET /tasks/ page statement for the given columns/entities, shared with AsyncTaskService"""
+        query = query or TaskListQuery()
+        return (
+            select(*entities).where(*TaskService.list_filters(query))
+            .order_by(*TaskService.list_order(query.sort)).offset(skip).limit(limit)
+        )
+    
+    @staticmethod
+    def get_tasks(db: Session, skip: int = 0, limit: int = 100, query: Optional[TaskListQuery] = None) -> List[Task]:
+        """Get all tasks with optional filtering and sorting"""
+        return list(db.scalars(TaskService.list_stmt((Task,), skip, limit, query)))
+    
+    @staticmethod
+    def get_fieldset(fields: Optional[str] = None, preview_chars: Optional[int] = None) -> Fieldset:
+        """Columns and serializer for GET /tasks/?fields=...; preview_chars truncates description"""
+        return get_fieldset(TaskResponse, Task, task_list_adapter, fields, "description", preview_chars)
     
     @staticmethod
-    def get_task(db: Session, task_id: int) -> Optional[Task]:
-        """Get a single task by ID"""
-        return TaskService._get_task_by_id(db, task_id)
+    def get_task_rows(db: Session, skip: int = 0, limit: int = 100, query: Optional[TaskListQuery] = None, columns: tuple = TASK_RESPONSE_COLUMNS) -> List[Dict[str, Any]]:
+        """Same page as get_tasks as plain column dicts, for the fast JSON list path (columns: a sparse fieldset)"""
+        return [row._asdict() for row in db.execute(TaskService.list_stmt(columns, skip, limit, query))]
     
     @staticmethod
-    def get_tasks(db: Session, skip: int = 0, limit: int = 100, completed: Optional[bool] = None) -> List[Task]:
-        """Get all tasks with optional filtering"""
+    def count_tasks(db: Session, query: Optional[TaskListQuery] = None) -> Tuple[int, bool]:
+        """
+        Total behind GET /tasks/ (cached), returns (total, exact)
+        The stat counters cover the completed filter, due date filters are counted
+        """
+        query = query or TaskListQuery()
+        counter = None
+        if query.due_before is None and query.due_after is None and query.overdue is None:
+            if query.completed is None:
+                counter = lambda counters: counters.tasks_total
+            elif query.completed:
+                counter = lambda counters: counters.tasks_completed
+            else:
+                counter = lambda counters: counters.tasks_total - counters.tasks_completed
+        # Sorting doesn't change the total
+        key = ("tasks", query.model_copy(update={"sort": None}))
+        return CountService.get_total(db, Task, key, TaskService.list_filters(query), counter)
+    
+    @staticmethod
+    def get_task_versions(db: Session, skip: int = 0, limit: int = 100, query: Optional[TaskListQuery] = None) -> List[Tuple[int, int]]:
+        """(id, version) of the rows get_tasks would return, a cheap fingerprint for ETags"""
+        return [tuple(row) for row in db.execute(TaskService.list_stmt((Task.id, Task.version), skip, limit, query))]
+    
+    @staticmethod
+    def _queue_stmt(priority: Optional[PriorityEnum], dated: bool, limit: int, user_id: Optional[int] = None, columns: tuple = TASK_RESPONSE_COLUMNS):
+        """One bucket of the work queue: an index range of ix_tasks_queue (ix_tasks_queue_user for one user) read in order, no sort"""
+        # Literal false, so SQLite can match the partial index predicate too
+        stmt = select(*columns).where(
+            Task.completed == false(),
+            Task.priority == priority if priority is not None else Task.priority.is_(None),
+            Task.due_date.is_not(None) if dated else Task.due_date.is_(None),
+        )
+        if user_id is not None:
+            stmt = stmt.where(Task.user_id == user_id)
+        return stmt.order_by(Task.due_date, Task.id).limit(limit)
+    
+    @staticmethod
+    def get_queue(db: Session, limit: int = 20, user_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Next open tasks to work on: highest priority first, then nearest due date, undated last
+        Reads at most limit rows per bucket and stops once the queue is full
+        """
+        rows: List[Dict[str, Any]] = []
+        for priority in QUEUE_PRIORITIES:
+            for dated in (True, False):
+                stmt = TaskService._queue_stmt(priority, dated, limit - len(rows), user_id)
+                rows.extend(row._asdict() for row in db.execute(stmt))
+                if len(rows) >= limit:
+                    return rows
+        return rows
+    
+    @staticmethod
+    def get_task_changes(db: Session, since: Optional[str] = None, limit: int = 500, user_id: Optional[int] = None) -> dict:
+        """Tasks changed and ids deleted since the sync token (see SyncService.get_changes)"""
+        return SyncService.get_changes(db, Task, "task", since, limit, user_id)
+    
+    @staticmethod
+    def get_tasks_page(db: Session, cursor: Optional[str] = None, limit: int = 100, completed: Optional[bool] = None) -> Tuple[List[Task], Optional[str]]:
+        """Get a page of tasks after the cursor, ordered by (created_at, id)"""
         query = db.query(Task)
         
         if completed is not None:
             query = query.filter(Task.completed == completed)
         
-        return query.offset(skip).limit(limit).all()
+        if cursor:
+            created_at, task_id = decode_cursor(cursor)
+            query = query.filter(tuple_(Task.created_at, Task.id) > tuple_(created_at, task_id))
+        
+        # Fetch one extra row to know whether another page exists
+        tasks = query.order_by(Task.created_at, Task.id).limit(limit + 1).all()
+        
+        next_cursor = None
+        if len(tasks) > limit:
+            tasks = tasks[:limit]
+            next_cursor = encode_cursor(tasks[-1].created_at, tasks[-1].id)
+        return tasks, next_cursor
+    
+    @staticmethod
+    def _user_tasks_query(db: Session, user_id: int, completed: Optional[bool] = None):
+        """Private helper building the owner-scoped task query"""
+        query = db.query(Task).filter(Task.user_id == user_id)
+        
+        if completed is not None:
+            query = query.filter(Task.completed == completed)
+        
+        return query.order_by(Task.due_date, Task.id)
+    
+    @staticmethod
+    def get_user_tasks(db: Session, user_id: int, skip: int = 0, limit: int = 100, completed: Optional[bool] = None) -> List[Task]:
+        """Get tasks owned by a user, ordered by due date"""
+        return TaskService._user_tasks_query(db, user_id, completed).offset(skip).limit(limit).all()
+    
+    @staticmethod
+    def export_stmt(completed: Optional[bool] = None, user_id: Optional[int] = None, created_from: Optional[datetime] = None, created_to: Optional[datetime] = None):
+        """Export statement, shared with AsyncTaskService; created_from is inclusive, created_to exclusive"""
+        stmt = select(*TASK_RESPONSE_COLUMNS)
+        
+        if completed is not None:
+            stmt = stmt.where(Task.completed == completed)
+        if user_id is not None:
+            stmt = stmt.where(Task.user_id == user_id)
+        if created_from is not None:
+            stmt = stmt.where(Task.created_at >= created_from)
+        if created_to is not None:
+            stmt = stmt.where(Task.created_at < created_to)
+        
+        return stmt.order_by(Task.id).execution_options(yield_per=EXPORT_BATCH_SIZE)
+    
+    @staticmethod
+    def iter_task_batches(db: Session, **filters) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Stream matching tasks as batches of column dicts
+        yield_per uses a server-side cursor where the driver has one, so memory stays flat
+        """
+        for partition in db.execute(TaskService.export_stmt(**filters)).partitions():
+            yield [row._asdict() for row in partition]
+    
+    @staticmethod
+    async def import_tasks(db: Session, records: AsyncIterator[Record], progress: ImportProgress) -> ImportProgress:
+        """Validate streamed rows against TaskCreate and load them in chunks (COPY on Postgres)"""
+        return await ImportService.import_records(db, records, Task, TaskCreate, progress, task_feed)
     
     @staticmethod
     def create_task(db: Session, task: TaskCreate) -> Task:
@@ -31,33 +253,119 @@ class TaskService:
         db.add(db_task)
         db.commit()
         db.refresh(db_task)
+        task_cache.store(db_task)
+        task_feed.created(db_task)
         return db_task
     
     @staticmethod
-    def update_task(db: Session, task_id: int, task_update: TaskUpdate) -> Optional[Task]:
-        """Update an existing task"""
-        db_task = TaskService._get_task_by_id(db, task_id)
+    def _raise_if_conflict(db: Session, task_id: int, expected_version: Optional[int]) -> None:
+        """Private helper: after a guarded statement matched nothing, tell a stale version from a missing task"""
+        if expected_version is not None and db.query(Task.id).filter(Task.id == task_id).first():
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED,
+                detail="Task was modified by another request"
+            )
+    
+    @staticmethod
+    def update_task(db: Session, task_id: int, task_update: TaskUpdate, expected_version: Optional[int] = None) -> Optional[Task]:
+        """
+        Update an existing task with a single UPDATE ... RETURNING
+        expected_version (from If-Match) makes the update conditional
+        """
+        # Update only provided fields
+        update_data = task_update.model_dump(exclude_unset=True)
+        stmt = update(Task).where(Task.id == task_id).values(**update_data, version=Task.version + 1).returning(Task)
+        if expected_version is not None:
+            stmt = stmt.where(Task.version == expected_version)
         
+        db_task = db.scalars(stmt).first()
         if not db_task:
+            db.rollback()
+            TaskService._raise_if_conflict(db, task_id, expected_version)
             return None
         
-        # Update only provided fields
-        update_data = task_update.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_task, field, value)
-        
+        # Built from the RETURNING row, detach so commit doesn't expire it
+        db.expunge(db_task)
         db.commit()
-        db.refresh(db_task)
+        task_cache.store(db_task)
+        task_feed.updated(db_task)
         return db_task
     
     @staticmethod
-    def delete_task(db: Session, task_id: int) -> bool:
-        """Delete a task"""
-        db_task = TaskService._get_task_by_id(db, task_id)
+    def delete_task(db: Session, task_id: int, expected_version: Optional[int] = None) -> bool:
+        """Delete a task with a single DELETE ... RETURNING id, user_id"""
+        stmt = delete(Task).where(Task.id == task_id).returning(Task.id, Task.user_id)
+        if expected_version is not None:
+            stmt = stmt.where(Task.version == expected_version)
         
-        if not db_task:
+        deleted = db.execute(stmt).first()
+        if deleted is None:
+            db.rollback()
+            TaskService._raise_if_conflict(db, task_id, expected_version)
             return False
         
-        db.delete(db_task)
         db.commit()
+        task_cache.invalidate(task_id)
+        task_feed.deleted(deleted)
         return True
+    
+    @staticmethod
+    def bulk_create_tasks(db: Session, rows: List[Dict[str, Any]]) -> Tuple[List[Task], List[BulkError]]:
+        """Create many tasks with multi-row INSERT ... RETURNING in one transaction"""
+        valid, errors = validate_rows(rows, TaskCreate)
+        tasks = []
+        
+        with bulk_transaction(db):
+            if valid:
+                stmt = insert(Task).returning(Task, sort_by_parameter_order=True)
+                tasks = list(db.scalars(stmt, [task.model_dump() for _, task in valid]))
+                # Detach so commit doesn't expire them (re-selecting every row)
+                for task in tasks:
+                    db.expunge(task)
+        task_feed.created(*tasks)
+        return tasks, errors
+    
+    @staticmethod
+    def bulk_update_tasks(db: Session, rows: List[Dict[str, Any]]) -> Tuple[List[Task], List[BulkError]]:
+        """Update many tasks with one UPDATE ... WHERE id IN (...) per distinct change set"""
+        valid, errors = validate_rows(rows, TaskBulkUpdate)
+        groups, group_errors = group_updates(valid)
+        errors.extend(group_errors)
+        tasks = []
+        
+        with bulk_transaction(db):
+            for changes, targets in groups.items():
+                ids = [task_id for _, task_id in targets]
+                stmt = update(Task).where(Task.id.in_(ids)).values(**dict(changes), version=Task.version + 1).returning(Task)
+                updated = list(db.scalars(stmt))
+                found = {task.id for task in updated}
+                errors.extend(
+                    BulkError(index=index, id=task_id, detail="Task not found")
+                    for index, task_id in targets if task_id not in found
+                )
+                tasks.extend(updated)
+            for task in tasks:
+                db.expunge(task)
+        task_cache.invalidate(*(task.id for task in tasks))
+        task_feed.updated(*tasks)
+        
+        errors.sort(key=lambda error: error.index)
+        return tasks, errors
+    
+    @staticmethod
+    def bulk_delete_tasks(db: Session, ids: List[int]) -> Tuple[List[int], List[BulkError]]:
+        """Delete many tasks with one DELETE ... WHERE id IN (...) RETURNING id, user_id"""
+        check_bulk_size(len(ids))
+        
+        with bulk_transaction(db):
+            rows = db.execute(delete(Task).where(Task.id.in_(ids)).returning(Task.id, Task.user_id)).all()
+        deleted = {row.id for row in rows}
+        task_cache.invalidate(*deleted)
+        task_feed.deleted(*rows)
+        
+        errors = [
+            BulkError(index=index, id=task_id, detail="Task not found")
+            for index, task_id in enumerate(ids) if task_id not in deleted
+        ]
+        return sorted(deleted), errors
+
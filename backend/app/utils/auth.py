@@ -1,36 +1,125 @@
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
+import multiprocessing
+import threading
+import time
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status
 from app.schemas.user_schemas import TokenData
+from app.utils.ttl_cache import TTLCache
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-# JWT settings
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# bcrypt cost; changing it rehashes existing passwords on their next login
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+# Password hashing context. min/max pinned to the configured cost so that
+# needs_update() flags hashes made with any other cost
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+    bcrypt__max_rounds=BCRYPT_ROUNDS,
+)
+
+# Processes used for bcrypt (0 = hash in the calling thread)
+HASH_WORKERS = int(os.getenv("HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Hash jobs allowed in flight; further callers wait up to HASH_QUEUE_TIMEOUT seconds, then get a 503
+HASH_MAX_PENDING = int(os.getenv("HASH_MAX_PENDING", str(max(HASH_WORKERS, 1) * 4)))
+HASH_QUEUE_TIMEOUT = float(os.getenv("HASH_QUEUE_TIMEOUT", "5"))
+
+_hash_executor: Optional[ProcessPoolExecutor] = None
+_hash_executor_lock = threading.Lock()
+_hash_slots = threading.BoundedSemaphore(HASH_MAX_PENDING)
+
+# JWT settings
+
 SECRET_KEY = os.getenv("SECRET_KEY", "fallback-secret-key-for-development")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# Verified-token and authenticated-user caches (AUTH_CACHE_TTL=0 disables them)
+# Per worker: a commit that deactivates, renames or deletes a user evicts it in its own worker only,
+# other workers keep authenticating the old user for up to AUTH_CACHE_TTL seconds
+AUTH_CACHE_SIZE = int(os.getenv("AUTH_CACHE_SIZE", "10000"))
+AUTH_CACHE_TTL = float(os.getenv("AUTH_CACHE_TTL", "60"))
+
+# Decoded tokens, so repeat requests skip the JWT decode and signature check
+token_cache = TTLCache(maxsize=AUTH_CACHE_SIZE, ttl=AUTH_CACHE_TTL)
+
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+def _verify(plain_password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(plain_password, hashed_password)
+
+def _verify_and_update(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+def _get_hash_executor() -> ProcessPoolExecutor:
+    global _hash_executor
+    with _hash_executor_lock:
+        if _hash_executor is None:
+            # spawn: forking a process that already runs threads is unsafe
+            _hash_executor = ProcessPoolExecutor(
+                max_workers=HASH_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _hash_executor
+
+def shutdown_hash_executor() -> None:
+    """Stop the hashing processes (called on application shutdown)"""
+    global _hash_executor
+    with _hash_executor_lock:
+        if _hash_executor is not None:
+            _hash_executor.shutdown(cancel_futures=True)
+            _hash_executor = None
+
+def _run_hash_job(fn, *args):
+    """
+    Run a bcrypt job in the hashing process pool so it uses other cores
+    instead of holding the GIL. At most HASH_MAX_PENDING jobs are in flight
+    Raises: HTTPException 503 when no slot frees up in time
+    """
+    if not _hash_slots.acquire(timeout=HASH_QUEUE_TIMEOUT):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server busy, please retry",
+            headers={"Retry-After": "1"},
+        )
+    try:
+        if HASH_WORKERS <= 0:
+            return fn(*args)
+        return _get_hash_executor().submit(fn, *args).result()
+    finally:
+        _hash_slots.release()
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verify a plain password against its hash
     Returns True if password matches, False otherwise
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return _run_hash_job(_verify, plain_password, hashed_password)
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and rehash it if it was hashed with another bcrypt cost
+    Returns (matches, new_hash); new_hash is None when no update is needed
+    """
+    return _run_hash_job(_verify_and_update, plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
     """
     Hash a password for storing in database
     Returns hashed password string
     """
-    return pwd_context.hash(password)
+    return _run_hash_job(_hash, password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
@@ -57,6 +146,10 @@ def verify_token(token: str) -> TokenData:
     Returns: TokenData object with username
     Raises: HTTPException if token is invalid
     """
+    cached = token_cache.get(token)
+    if cached is not None:
+        return cached
+    
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -72,6 +165,9 @@ def verify_token(token: str) -> TokenData:
     except JWTError:
         raise credentials_exception
     
+    # Never keep a token cached past its own expiry
+    exp = payload.get("exp")
+    token_cache.set(token, token_data, ttl=exp - time.time() if exp else None)
     return token_data
 
 def create_token_for_user(username: str) -> str:
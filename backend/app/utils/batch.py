@@ -0,0 +1,103 @@
+import os
+import threading
+from contextlib import nullcontext
+from contextvars import ContextVar
+from typing import Any, List, Optional, Tuple
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+# Most operations one POST /batch may carry
+BATCH_MAX_OPERATIONS = int(os.getenv("BATCH_MAX_OPERATIONS", "50"))
+# Consecutive reads of a batch dispatched at once
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "8"))
+
+# Routers a batch may call
+BATCH_PREFIXES = ("/tasks", "/notes", "/auth")
+
+class BatchContext:
+    """
+    State shared by the sub-requests of one POST /batch: the DB session and the user resolved
+    for the batch's token, plus rows loaded ahead for them (held here, the session's identity
+    map only keeps weak references)
+    """
+
+    def __init__(self, session: Session, token: Optional[str] = None, user: Any = None):
+        self.session = session
+        self.token = token
+        self.user = user
+        # Why the token didn't resolve: re-raised by every operation instead of looking it up again
+        self.auth_error: Optional[HTTPException] = None
+        self.prefetched: List[Any] = []
+        # A Session isn't thread-safe: concurrent sub-requests take turns in their endpoints
+        self.lock = threading.Lock()
+
+# Set while POST /batch dispatches its sub-requests; threadpool calls see it too
+current_batch: ContextVar[Optional[BatchContext]] = ContextVar("current_batch", default=None)
+
+def batch_user(token: str):
+    """
+    The user the enclosing POST /batch resolved for token, None outside a batch or for another token
+    Raises: the batch's authentication error, so concurrent operations never repeat the lookup
+    """
+    batch = current_batch.get()
+    if batch is None or batch.token != token:
+        return None
+    if batch.auth_error is not None:
+        error = batch.auth_error
+        raise HTTPException(status_code=error.status_code, detail=error.detail, headers=error.headers)
+    return batch.user
+
+def session_turn():
+    """Held by a batched sub-request's endpoint while it uses the shared session"""
+    batch = current_batch.get()
+    return batch.lock if batch is not None else nullcontext()
+
+async def dispatch(app, parent: dict, method: str, path: str, query_string: bytes, headers: List[Tuple[bytes, bytes]], body: bytes) -> Tuple[int, List[Tuple[bytes, bytes]], bytes]:
+    """
+    Run one request through app (usually the router) in-process: routing, validation, dependencies
+    and serialization as over HTTP, without the middleware stack
+    parent: scope of the enclosing request, its exception handlers and connection details are reused
+    Returns: (status, headers, body)
+    """
+    scope = {
+        "type": "http",
+        "asgi": parent.get("asgi", {"version": "3.0"}),
+        "http_version": parent.get("http_version", "1.1"),
+        "method": method,
+        "scheme": parent.get("scheme", "http"),
+        "server": parent.get("server"),
+        "client": parent.get("client"),
+        "root_path": parent.get("root_path", ""),
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query_string,
+        "headers": headers,
+        "app": parent.get("app"),
+    }
+    # Installed by ExceptionMiddleware: turns HTTPException and validation errors into responses
+    if "starlette.exception_handlers" in parent:
+        scope["starlette.exception_handlers"] = parent["starlette.exception_handlers"]
+
+    sent_body = False
+
+    async def receive():
+        nonlocal sent_body
+        if sent_body:
+            return {"type": "http.disconnect"}
+        sent_body = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    status_code = 500
+    response_headers: List[Tuple[bytes, bytes]] = []
+    chunks: List[bytes] = []
+
+    async def send(message):
+        nonlocal status_code, response_headers
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+            response_headers = list(message.get("headers", []))
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return status_code, response_headers, b"".join(chunks)
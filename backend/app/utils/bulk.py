@@ -0,0 +1,75 @@
+import os
+from contextlib import contextmanager
+from typing import Any, Dict, List, Tuple, Type
+from fastapi import HTTPException, status
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.schemas.bulk_schemas import BulkError
+
+# Upper bound on rows per bulk request
+BULK_MAX_ROWS = int(os.getenv("BULK_MAX_ROWS", "10000"))
+
+def check_bulk_size(count: int) -> None:
+    """
+    Reject bulk requests that are empty or larger than BULK_MAX_ROWS
+    """
+    if count == 0 or count > BULK_MAX_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE if count else status.HTTP_400_BAD_REQUEST,
+            detail=f"Bulk requests take between 1 and {BULK_MAX_ROWS} rows"
+        )
+
+def format_validation_error(exc: ValidationError) -> str:
+    """Flatten a pydantic ValidationError into one readable line"""
+    return "; ".join(f"{'.'.join(str(part) for part in err['loc']) or 'row'}: {err['msg']}" for err in exc.errors())
+
+def validate_rows(rows: List[Dict[str, Any]], schema: Type[BaseModel]) -> Tuple[List[Tuple[int, BaseModel]], List[BulkError]]:
+    """
+    Validate each row on its own so one bad row doesn't reject the batch
+    Returns: ([(index, model)], [BulkError])
+    """
+    check_bulk_size(len(rows))
+    valid, errors = [], []
+    for index, row in enumerate(rows):
+        try:
+            valid.append((index, schema.model_validate(row)))
+        except ValidationError as exc:
+            row_id = row.get("id") if isinstance(row, dict) else None
+            errors.append(BulkError(index=index, id=row_id if isinstance(row_id, int) else None, detail=format_validation_error(exc)))
+    return valid, errors
+
+def group_updates(valid: List[Tuple[int, BaseModel]]) -> Tuple[Dict[tuple, List[Tuple[int, int]]], List[BulkError]]:
+    """
+    Group update rows that carry identical changes, so each group becomes one
+    UPDATE ... WHERE id IN (...) statement
+    Returns: ({changes: [(index, id)]}, [BulkError])
+    """
+    groups, seen, errors = {}, set(), []
+    for index, item in valid:
+        if item.id in seen:
+            errors.append(BulkError(index=index, id=item.id, detail="Duplicate id in request"))
+            continue
+        seen.add(item.id)
+        changes = item.model_dump(exclude_unset=True, exclude={"id"})
+        if not changes:
+            errors.append(BulkError(index=index, id=item.id, detail="No fields to update"))
+            continue
+        groups.setdefault(tuple(sorted(changes.items())), []).append((index, item.id))
+    return groups, errors
+
+@contextmanager
+def bulk_transaction(db: Session):
+    """
+    Run a bulk operation as one transaction
+    Commits on success; a constraint violation rolls back the whole batch (409)
+    """
+    try:
+        yield
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Bulk operation rolled back: a row violates a database constraint"
+        )
@@ -0,0 +1,134 @@
+import threading
+import time
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+from app.utils.request_metrics import current_timings
+
+# Upper bounds (seconds) of the connection wait time histogram buckets
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, float("inf"))
+
+class PoolStats:
+    """
+    Connection pool counters for one engine
+    Checkout/checkin/connect counts come from SQLAlchemy pool events,
+    wait times and timeouts from TimedQueuePool
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.wait_counts = [0] * len(WAIT_BUCKETS)
+        self.wait_sum = 0.0
+
+    def attach(self, engine) -> None:
+        """Register pool event listeners on a sync Engine"""
+        event.listen(engine, "connect", lambda *args: self._incr("connects"))
+        event.listen(engine, "checkout", lambda *args: self._incr("checkouts"))
+        event.listen(engine, "checkin", lambda *args: self._incr("checkins"))
+        event.listen(engine, "invalidate", lambda *args: self._incr("invalidations"))
+        if isinstance(engine.pool, TimedPoolMixin):
+            engine.pool.stats = self
+
+    def _incr(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def record_wait(self, seconds: float) -> None:
+        """Record how long a caller waited to get a connection"""
+        with self._lock:
+            self.wait_sum += seconds
+            for i, bound in enumerate(WAIT_BUCKETS):
+                if seconds <= bound:
+                    self.wait_counts[i] += 1
+                    break
+
+    def record_timeout(self) -> None:
+        self._incr("timeouts")
+
+    def snapshot(self, pool) -> dict:
+        """
+        Counters plus the live pool state
+        Histogram buckets are cumulative, Prometheus style
+        """
+        live = {}
+        for key, method in (("size", "size"), ("checked_out", "checkedout"), ("overflow", "overflow"), ("checked_in", "checkedin")):
+            if callable(getattr(pool, method, None)):
+                live[key] = getattr(pool, method)()
+
+        with self._lock:
+            buckets, running = {}, 0
+            for bound, count in zip(WAIT_BUCKETS, self.wait_counts):
+                running += count
+                buckets["+Inf" if bound == float("inf") else str(bound)] = running
+            return {
+                **live,
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "wait_seconds": {"buckets": buckets, "sum": round(self.wait_sum, 6), "count": running},
+            }
+
+class TimedPoolMixin:
+    """Times Pool.connect(), i.e. how long a checkout waited for a free connection"""
+    stats: Optional[PoolStats] = None
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            if self.stats:
+                self.stats.record_timeout()
+            raise
+        if self.stats:
+            self.stats.record_wait(time.perf_counter() - start)
+        return connection
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool; keep reporting to the same stats
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+class TimedQueuePool(TimedPoolMixin, QueuePool):
+    pass
+
+class TimedAsyncAdaptedQueuePool(TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+def attach_query_timer(engine) -> None:
+    """
+    Time every statement on a sync Engine (for async engines pass engine.sync_engine)
+    and add it to the current request's timings; statements outside a request are ignored
+    """
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if current_timings.get() is not None:
+            conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        timings = current_timings.get()
+        starts = conn.info.get("query_start")
+        if timings is not None and starts:
+            timings.record_query(time.perf_counter() - starts.pop())
+
+    def handle_error(exception_context):
+        # A failed statement never reaches after_cursor_execute: pop its start (and count it) here
+        if exception_context.connection is not None:
+            after_cursor_execute(exception_context.connection, None, None, None, None, None)
+
+    def checkin(dbapi_connection, connection_record):
+        # Anything left over belongs to a request that's gone
+        connection_record.info.pop("query_start", None)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", after_cursor_execute)
+    event.listen(engine, "handle_error", handle_error)
+    event.listen(engine, "checkin", checkin)
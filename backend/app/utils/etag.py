@@ -0,0 +1,72 @@
+import hashlib
+from typing import Iterable, Optional, Tuple
+from fastapi import HTTPException, Response, status
+
+# Cache-Control policy per kind of route. Lists and items must be revalidated
+# every time (cheap thanks to ETag/304); search results and stats may be reused briefly
+CACHE_CONTROL = {
+    "list": "private, no-cache",
+    "item": "private, no-cache",
+    "search": "private, max-age=10",
+    "stats": "private, max-age=5",
+}
+
+def version_etag(version: int) -> str:
+    """
+    Strong ETag of a single task/note, derived from its version column
+    """
+    return f'"{version}"'
+
+def parse_if_match(if_match: Optional[str]) -> Optional[int]:
+    """
+    Parse an If-Match header into the expected row version
+    Returns: None when the header is missing or "*" (no version check)
+    Raises: HTTPException if the header isn't a single version ETag
+    """
+    if if_match is None or if_match.strip() == "*":
+        return None
+    value = if_match.strip()
+    if value.startswith("W/"):
+        value = value[2:]
+    try:
+        return int(value.strip('"'))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid If-Match header, expected a single version ETag"
+        )
+
+def collection_etag(versions: Iterable[Tuple[int, int]], variant: str = "") -> str:
+    """
+    Weak ETag of a list response from the (id, version) pairs of its rows
+    Every write bumps version, so any change to the page changes the ETag
+    variant tells apart representations of the same rows (sparse fieldsets)
+    """
+    digest = hashlib.sha1((repr(list(versions)) + variant).encode()).hexdigest()
+    return f'W/"{digest[:24]}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    If-None-Match check using weak comparison (RFC 9110)
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    
+    def opaque(tag: str) -> str:
+        tag = tag.strip()
+        return tag[2:] if tag.startswith("W/") else tag
+    
+    return opaque(etag) in {opaque(tag) for tag in if_none_match.split(",")}
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    """304 response carrying the validators the client should keep"""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag, "Cache-Control": cache_control})
+
+def set_cache_headers(response: Response, etag: Optional[str], cache_control: str) -> None:
+    """Attach ETag (when known) and Cache-Control to a regular response"""
+    if etag:
+        response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+
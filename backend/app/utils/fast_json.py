@@ -0,0 +1,18 @@
+from typing import Any, Dict, List
+from fastapi import Response
+from pydantic import TypeAdapter
+
+class PydanticJSONResponse(Response):
+    """
+    JSON response whose body was already serialized to bytes by pydantic-core
+    Skips FastAPI's response_model validation, jsonable_encoder and json.dumps
+    """
+    media_type = "application/json"
+
+def list_response(adapter: TypeAdapter, rows: List[Dict[str, Any]]) -> PydanticJSONResponse:
+    """
+    Validate column rows and serialize them in one pass
+    Rows must be dicts: validating Row objects with from_attributes is slower than the ORM path
+    """
+    items = adapter.validate_python(rows)
+    return PydanticJSONResponse(adapter.dump_json(items))
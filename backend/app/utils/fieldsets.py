@@ -0,0 +1,60 @@
+from functools import lru_cache
+from typing import List, Optional, Tuple, Type
+from fastapi import HTTPException, status
+from pydantic import BaseModel, TypeAdapter, create_model
+from sqlalchemy import func
+
+# Always selected: the list ETag is computed from them, they're only returned when asked for
+ETAG_FIELDS = ("id", "version")
+
+class Fieldset:
+    """
+    Columns to select and the list serializer for a `fields=` / `preview_chars=` request
+    Only the requested columns are read (large text ones truncated by the database when previewed)
+    """
+
+    def __init__(self, names: Tuple[str, ...], columns: tuple, adapter: TypeAdapter, key: str):
+        self.names = names
+        self.columns = columns
+        self.adapter = adapter
+        # Distinguishes this representation in the list ETag
+        self.key = key
+
+@lru_cache(maxsize=256)
+def _subset_adapter(schema: Type[BaseModel], names: Tuple[str, ...]) -> TypeAdapter:
+    """List serializer of a response model generated for the chosen fields"""
+    subset = create_model(
+        f"{schema.__name__}[{','.join(names)}]",
+        **{name: (schema.model_fields[name].annotation, schema.model_fields[name]) for name in names}
+    )
+    return TypeAdapter(List[subset])
+
+@lru_cache(maxsize=256)
+def get_fieldset(schema: Type[BaseModel], model, full_adapter: TypeAdapter, fields: Optional[str], preview_field: str, preview_chars: Optional[int]) -> Fieldset:
+    """
+    Parse fields (comma-separated names of schema) for a list endpoint
+    preview_chars: return at most that many leading characters of preview_field, cut with substr in SQL
+    Raises: HTTPException 400 on unknown fields
+    """
+    available = tuple(schema.model_fields)
+    if fields:
+        names = tuple(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+        unknown = [name for name in names if name not in schema.model_fields]
+        if unknown or not names:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown fields: {', '.join(unknown) or fields}. Available: {', '.join(available)}"
+            )
+    else:
+        names = available
+
+    columns = []
+    for name in names + tuple(name for name in ETAG_FIELDS if name not in names):
+        column = getattr(model, name)
+        if name == preview_field and preview_chars:
+            column = func.substr(column, 1, preview_chars).label(name)
+        columns.append(column)
+
+    adapter = full_adapter if names == available else _subset_adapter(schema, names)
+    key = "" if names == available and not preview_chars else f"{','.join(names)};{preview_chars or ''}"
+    return Fieldset(names, tuple(columns), adapter, key)
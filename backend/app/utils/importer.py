@@ -0,0 +1,76 @@
+import codecs
+import csv
+import json
+import os
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+from app.utils.export import ExportFormat
+
+# Rows validated and loaded per round trip, bounds import memory
+IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", "5000"))
+# Rejected rows kept in the summary (the rejected counter keeps counting past it)
+IMPORT_MAX_ERRORS = int(os.getenv("IMPORT_MAX_ERRORS", "100"))
+
+# (row index, parsed row or None, parse error or None)
+Record = Tuple[int, Optional[Dict[str, Any]], Optional[str]]
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Split a streamed UTF-8 body into lines, newline included, without buffering the whole body"""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line + "\n"
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+async def iter_ndjson(lines: AsyncIterator[str]) -> AsyncIterator[Record]:
+    """One JSON object per line, blank lines are skipped"""
+    index = 0
+    async for line in lines:
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+            yield (index, row, None) if isinstance(row, dict) else (index, None, "Expected a JSON object")
+        except ValueError as exc:
+            yield index, None, f"Invalid JSON: {exc}"
+        index += 1
+
+async def iter_csv_records(lines: AsyncIterator[str]) -> AsyncIterator[str]:
+    """
+    Regroup lines into CSV records, a quoted field may span several lines
+    A record is complete once it holds an even number of quote characters ("" escapes count twice)
+    """
+    record = ""
+    async for line in lines:
+        record += line
+        if record.count('"') % 2 == 0:
+            yield record
+            record = ""
+    if record:
+        yield record
+
+async def iter_csv(lines: AsyncIterator[str]) -> AsyncIterator[Record]:
+    """CSV with a header row; empty cells are left out so schema defaults apply"""
+    header = None
+    index = 0
+    async for record in iter_csv_records(lines):
+        if not record.strip():
+            continue
+        values = next(csv.reader([record]))
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        if len(values) != len(header):
+            yield index, None, f"Expected {len(header)} columns, got {len(values)}"
+        else:
+            yield index, {name: value for name, value in zip(header, values) if value != ""}, None
+        index += 1
+
+def iter_records(chunks: AsyncIterator[bytes], fmt: ExportFormat) -> AsyncIterator[Record]:
+    """Parse a streamed NDJSON or CSV upload (the export formats) row by row"""
+    lines = iter_lines(chunks)
+    return iter_ndjson(lines) if fmt == ExportFormat.ndjson else iter_csv(lines)
@@ -0,0 +1,60 @@
+import base64
+import json
+from datetime import datetime
+from typing import Tuple
+from fastapi import HTTPException, status
+
+def encode_cursor(created_at: datetime, item_id: int) -> str:
+    """
+    Encode the (created_at, id) keyset position of the last row of a page
+    Returns: opaque url-safe cursor string
+    """
+    raw = json.dumps([created_at.isoformat(), item_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a cursor produced by encode_cursor
+    Returns: (created_at, id) tuple
+    Raises: HTTPException if the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, item_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(item_id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+def encode_sync_token(items: Tuple[datetime, int], deleted: Tuple[datetime, int]) -> str:
+    """
+    Encode the positions reached in the changed rows and in the tombstones
+    Returns: opaque url-safe token for GET /<resource>/changes?since=
+    """
+    raw = json.dumps([[items[0].isoformat(), items[1]], [deleted[0].isoformat(), deleted[1]]]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_sync_token(token: str) -> Tuple[Tuple[datetime, int], Tuple[datetime, int]]:
+    """
+    Decode a token produced by encode_sync_token
+    Returns: ((updated_at, id), (deleted_at, tombstone id))
+    Raises: HTTPException if the token is malformed
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        (items_at, item_id), (deleted_at, tombstone_id) = json.loads(base64.urlsafe_b64decode(padded))
+        return (datetime.fromisoformat(items_at), int(item_id)), (datetime.fromisoformat(deleted_at), int(tombstone_id))
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid sync token"
+        )
+
+def set_total_count(response, total: int, exact: bool) -> None:
+    """
+    X-Total-Count of a list response, X-Total-Count-Type says whether it is exact or an estimate
+    """
+    response.headers["X-Total-Count"] = str(total)
+    response.headers["X-Total-Count-Type"] = "exact" if exact else "estimate"
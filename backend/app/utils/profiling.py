@@ -0,0 +1,169 @@
+import hmac
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional, Set
+
+# Opt-in profiling for production incidents; nothing is installed unless PROFILING_ENABLED=true
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+# Shared secret sent as X-Profiling-Token, required for every profiling request
+PROFILING_TOKEN = os.getenv("PROFILING_TOKEN", "")
+# Seconds between stack samples
+PROFILE_INTERVAL = float(os.getenv("PROFILE_INTERVAL", "0.001"))
+PROFILE_MAX_SECONDS = float(os.getenv("PROFILE_MAX_SECONDS", "60"))
+
+# Leaf frames of threads that are waiting, not working (locks, queues, the event loop's select)
+IDLE_FRAMES = {("threading.py", "wait"), ("selectors.py", "select"), ("queue.py", "get")}
+
+def token_valid(token: Optional[str]) -> bool:
+    return bool(PROFILING_TOKEN) and token is not None and hmac.compare_digest(token, PROFILING_TOKEN)
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+class StackSampler:
+    """
+    Statistical profiler: a background thread records the Python stacks of the watched threads
+    every interval seconds (all other threads when thread_ids is None). Costs nothing while stopped
+    """
+
+    def __init__(self, interval: float = PROFILE_INTERVAL, thread_ids: Optional[Set[int]] = None, include_idle: bool = False):
+        self.interval = interval
+        self.thread_ids = thread_ids
+        self.include_idle = include_idle
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.started = self.elapsed = 0.0
+
+    def start(self) -> "StackSampler":
+        self.started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> "StackSampler":
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.elapsed = time.perf_counter() - self.started
+        return self
+
+    def run(self, seconds: float) -> "StackSampler":
+        """Sample for a fixed window, blocking the calling thread"""
+        self.start()
+        self._stop.wait(seconds)
+        return self.stop()
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval):
+            self.samples += 1
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own or (self.thread_ids is not None and thread_id not in self.thread_ids):
+                    continue
+                if not self.include_idle and (os.path.basename(frame.f_code.co_filename), frame.f_code.co_name) in IDLE_FRAMES:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                if thread_id not in names:
+                    names = {thread.ident: thread.name for thread in threading.enumerate()}
+                stack.append(names.get(thread_id, str(thread_id)))
+                self.stacks[tuple(reversed(stack))] += 1
+
+    def collapsed(self) -> str:
+        """Brendan Gregg's collapsed format: flamegraph.pl, speedscope and inferno read it"""
+        return "".join(f"{';'.join(stack)} {count}\n" for stack, count in self.stacks.most_common())
+
+    def report(self, top: int = 40) -> str:
+        """Text summary: functions by inclusive and self samples, pyinstrument-style"""
+        total = sum(self.stacks.values())
+        inclusive: Counter = Counter()
+        own: Counter = Counter()
+        for stack, count in self.stacks.items():
+            for label in set(stack[1:]):
+                inclusive[label] += count
+            own[stack[-1]] += count
+
+        lines = [f"Profile: {total} stack samples over {self.elapsed * 1000:.1f} ms (every {self.interval * 1000:g} ms)", ""]
+        lines.append(f"{'total %':>8} {'self %':>8}  function")
+        for label, count in inclusive.most_common(top):
+            lines.append(f"{count / total * 100:>8.1f} {own[label] / total * 100:>8.1f}  {label}")
+        return "\n".join(lines) + "\n"
+
+# Sampler of the request being profiled; sync endpoints add the threadpool thread they run in
+current_sampler: ContextVar[Optional[StackSampler]] = ContextVar("current_sampler", default=None)
+
+@contextmanager
+def watch_current_thread():
+    """Let the request's profile (if any) sample the current thread too"""
+    sampler = current_sampler.get()
+    if sampler is not None and sampler.thread_ids is not None:
+        sampler.thread_ids.add(threading.get_ident())
+    yield
+
+# One profile at a time: samplers are cheap, but overlapping ones would attribute each other's work
+profile_lock = threading.Lock()
+
+class ProfilingMiddleware:
+    """
+    Profiles a single request sent with a valid X-Profiling-Token header
+    The response body is replaced by the profile (X-Profile-Format: text or collapsed),
+    the original status goes to X-Profiled-Status. Only installed when PROFILING_ENABLED
+    """
+
+    def __init__(self, app):
+        if not PROFILING_TOKEN:
+            raise RuntimeError("PROFILING_ENABLED requires PROFILING_TOKEN")
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        headers = dict(scope.get("headers", [])) if scope["type"] == "http" else {}
+        token = headers.get(b"x-profiling-token")
+        if token is None or scope["path"].startswith("/admin/profile"):
+            await self.app(scope, receive, send)
+            return
+        if not token_valid(token.decode("latin-1")):
+            await _plain_response(send, 403, "Invalid profiling token\n")
+            return
+        if not profile_lock.acquire(blocking=False):
+            await _plain_response(send, 409, "Another profile is running\n")
+            return
+        
+        fmt = headers.get(b"x-profile-format", b"text").decode("latin-1")
+        sampler = StackSampler(thread_ids={threading.get_ident()})
+        status = 500
+
+        async def capture(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+        
+        reset = current_sampler.set(sampler)
+        sampler.start()
+        try:
+            await self.app(scope, receive, capture)
+        finally:
+            sampler.stop()
+            current_sampler.reset(reset)
+            profile_lock.release()
+        body = sampler.collapsed() if fmt == "collapsed" else sampler.report()
+        await _plain_response(send, 200, body, [(b"x-profiled-status", str(status).encode())])
+
+async def _plain_response(send, status: int, body: str, extra_headers=()) -> None:
+    data = body.encode()
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"text/plain; charset=utf-8"), (b"content-length", str(len(data)).encode()), *extra_headers],
+    })
+    await send({"type": "http.response.body", "body": data})
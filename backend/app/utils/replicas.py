@@ -0,0 +1,145 @@
+import hashlib
+import itertools
+import logging
+import os
+import threading
+import time
+from typing import List, Optional
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+from app.utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Read-your-writes: a client's reads go to the primary for this long after its last write
+REPLICA_STICKY_SECONDS = float(os.getenv("REPLICA_STICKY_SECONDS", "5"))
+# Replicas further behind than this (seconds) are skipped until they catch up
+REPLICA_MAX_LAG = float(os.getenv("REPLICA_MAX_LAG", "10"))
+# How often each worker re-measures a replica's lag, and how long an unreachable one is skipped
+REPLICA_CHECK_INTERVAL = float(os.getenv("REPLICA_CHECK_INTERVAL", "1"))
+REPLICA_RETRY_SECONDS = float(os.getenv("REPLICA_RETRY_SECONDS", "30"))
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+# Seconds since the last replayed transaction, 0 when the standby has replayed all it received
+# (an idle primary would otherwise look like a lagging replica)
+POSTGRES_LAG_QUERY = text(
+    "SELECT CASE WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE coalesce(extract(epoch FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+class ReplicaState:
+    """Health of one replica as last measured by this worker"""
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.lag: Optional[float] = None
+        self.checked_at = float("-inf")
+        self.down_until = float("-inf")
+        self.reads = 0
+        self.failures = 0
+        self.lock = threading.Lock()
+
+class ReplicaRouter:
+    """
+    Sends reads to replicas (round robin) and everything else to the primary
+    Falls back to the primary while a client is sticky after a write, and when every replica is
+    down or lagging. Stickiness and health are per worker, keyed by bearer token (else client host)
+    """
+
+    def __init__(self, primary: sessionmaker, replicas: List[Engine], sticky_seconds: float = REPLICA_STICKY_SECONDS):
+        self.primary = primary
+        self.replicas = [ReplicaState(engine) for engine in replicas]
+        self._sessions = [sessionmaker(autocommit=False, autoflush=False, bind=engine) for engine in replicas]
+        self._turn = itertools.count()
+        self.sticky = TTLCache(maxsize=100000, ttl=sticky_seconds)
+        self.primary_reads = 0
+
+    @staticmethod
+    def client_keys(request) -> List[str]:
+        """Stickiness keys of a request: its bearer token (hashed) and its client host"""
+        keys = []
+        authorization = request.headers.get("authorization")
+        if authorization:
+            keys.append("token:" + hashlib.sha256(authorization.encode()).hexdigest())
+        if request.client is not None:
+            keys.append(f"host:{request.client.host}")
+        return keys
+
+    def mark_write(self, request) -> None:
+        """
+        Make the client's next reads hit the primary; keyed by token when there is one, so only
+        anonymous writes (register, login) make a whole host sticky
+        """
+        if request.method in SAFE_METHODS or not self.replicas:
+            return
+        keys = self.client_keys(request)
+        if keys:
+            self.sticky.set(keys[0], True)
+
+    def is_sticky(self, request) -> bool:
+        return any(self.sticky.get(key) for key in self.client_keys(request))
+
+    @staticmethod
+    def measure_lag(engine: Engine) -> float:
+        """Replication lag in seconds; other databases can't tell, a successful query counts as 0"""
+        with engine.connect() as connection:
+            if engine.dialect.name == "postgresql":
+                return float(connection.execute(POSTGRES_LAG_QUERY).scalar())
+            connection.execute(text("SELECT 1"))
+            return 0.0
+
+    def _healthy(self, replica: ReplicaState) -> bool:
+        now = time.monotonic()
+        if now < replica.down_until:
+            return False
+        if now - replica.checked_at >= REPLICA_CHECK_INTERVAL and replica.lock.acquire(blocking=False):
+            # One request re-measures, the others use the previous reading meanwhile
+            try:
+                replica.lag = self.measure_lag(replica.engine)
+            except Exception as exc:
+                replica.failures += 1
+                replica.lag = None
+                replica.down_until = now + REPLICA_RETRY_SECONDS
+                logger.warning("Replica %s unreachable, reading from the primary for %ss: %s", replica.engine.url, REPLICA_RETRY_SECONDS, exc)
+                return False
+            finally:
+                replica.checked_at = now
+                replica.lock.release()
+        return replica.lag is not None and replica.lag <= REPLICA_MAX_LAG
+
+    def read_session(self, request) -> Session:
+        """Session for a read-only request: a healthy replica unless the client just wrote"""
+        if self.replicas and not self.is_sticky(request):
+            start = next(self._turn)
+            for offset in range(len(self.replicas)):
+                index = (start + offset) % len(self.replicas)
+                replica = self.replicas[index]
+                if self._healthy(replica):
+                    replica.reads += 1
+                    db = self._sessions[index]()
+                    # Services check this before publishing possibly stale rows to shared caches
+                    db.info["replica"] = True
+                    return db
+        self.primary_reads += 1
+        return self.primary()
+
+    def stats(self) -> dict:
+        return {
+            "primary_reads": self.primary_reads,
+            "sticky_clients": self.sticky.stats()["size"],
+            "replicas": [
+                {
+                    "url": replica.engine.url.render_as_string(hide_password=True),
+                    "healthy": time.monotonic() >= replica.down_until and replica.lag is not None and replica.lag <= REPLICA_MAX_LAG,
+                    "lag": replica.lag,
+                    "reads": replica.reads,
+                    "failures": replica.failures,
+                }
+                for replica in self.replicas
+            ],
+        }
+
+def is_replica_session(db: Session) -> bool:
+    return db.info.get("replica", False)
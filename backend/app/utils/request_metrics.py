@@ -0,0 +1,228 @@
+import asyncio
+import functools
+import logging
+import os
+import threading
+import time
+from contextlib import ExitStack
+from contextvars import ContextVar
+from typing import Callable, ContextManager, Dict, List, Optional, Tuple
+from fastapi.routing import APIRoute
+
+logger = logging.getLogger(__name__)
+
+# Per-request timing: Server-Timing headers and Prometheus histograms at /metrics
+REQUEST_METRICS = os.getenv("REQUEST_METRICS", "true").lower() == "true"
+SERVER_TIMING = os.getenv("SERVER_TIMING", "true").lower() == "true"
+# Requests running more queries than this are logged and counted: the usual sign of an N+1
+QUERY_COUNT_LIMIT = int(os.getenv("QUERY_COUNT_LIMIT", "20"))
+
+# Upper bounds of the histogram buckets, Prometheus style
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float("inf"))
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, float("inf"))
+
+class RequestTimings:
+    """What one request spent where; filled by TimedRoute and the engine's cursor hooks"""
+
+    __slots__ = ("start", "db", "queries", "handler", "serialize", "endpoint_end")
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.db = 0.0
+        self.queries = 0
+        self.handler = 0.0
+        self.serialize = 0.0
+        self.endpoint_end: Optional[float] = None
+
+    def record_query(self, seconds: float) -> None:
+        self.db += seconds
+        self.queries += 1
+
+    def server_timing(self) -> str:
+        total = time.perf_counter() - self.start
+        return ", ".join((
+            f'db;dur={self.db * 1000:.1f};desc="{self.queries} queries"',
+            f"handler;dur={self.handler * 1000:.1f}",
+            f"serialize;dur={self.serialize * 1000:.1f}",
+            f"total;dur={total * 1000:.1f}",
+        ))
+
+# Set by the middleware; thread pool calls see it too (the context is copied into the worker thread)
+current_timings: ContextVar[Optional[RequestTimings]] = ContextVar("current_timings", default=None)
+
+# Context managers entered around every sync endpoint call, in its threadpool thread (see main.py)
+sync_endpoint_contexts: List[Callable[[], ContextManager]] = []
+
+def add_sync_endpoint_context(context: Callable[[], ContextManager]) -> None:
+    """Run every sync endpoint of the TimedRoute routers inside context() (once, however often it's added)"""
+    if context not in sync_endpoint_contexts:
+        sync_endpoint_contexts.append(context)
+
+class TimedRoute(APIRoute):
+    """
+    APIRoute that splits the handler time from response serialization:
+    the endpoint function is timed on its own, whatever follows until the response is built is serialization
+    """
+
+    def get_route_handler(self):
+        call = self.dependant.call
+        if asyncio.iscoroutinefunction(call):
+            @functools.wraps(call)
+            async def timed_endpoint(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return await call(*args, **kwargs)
+                finally:
+                    _endpoint_done(start)
+        else:
+            @functools.wraps(call)
+            def timed_endpoint(*args, **kwargs):
+                with ExitStack() as stack:
+                    for context in sync_endpoint_contexts:
+                        stack.enter_context(context())
+                    start = time.perf_counter()
+                    try:
+                        return call(*args, **kwargs)
+                    finally:
+                        _endpoint_done(start)
+        self.dependant.call = timed_endpoint
+        handler = super().get_route_handler()
+
+        async def timed_handler(request):
+            response = await handler(request)
+            timings = current_timings.get()
+            if timings is not None and timings.endpoint_end is not None:
+                timings.serialize = time.perf_counter() - timings.endpoint_end
+            return response
+        return timed_handler
+
+def _endpoint_done(start: float) -> None:
+    timings = current_timings.get()
+    if timings is not None:
+        timings.endpoint_end = time.perf_counter()
+        timings.handler = timings.endpoint_end - start
+
+class Histogram:
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.sum += value
+        self.count += 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+class RequestMetrics:
+    """Per-route counters and histograms, rendered in the Prometheus text format"""
+
+    HISTOGRAMS = {
+        "http_request_duration_seconds": ("Time from request to the end of the response body", DURATION_BUCKETS),
+        "http_request_handler_seconds": ("Time in the endpoint function, database included", DURATION_BUCKETS),
+        "http_request_db_seconds": ("Time executing SQL statements", DURATION_BUCKETS),
+        "http_request_serialize_seconds": ("Time validating and encoding the response", DURATION_BUCKETS),
+        "http_request_queries": ("SQL statements per request", QUERY_BUCKETS),
+    }
+    COUNTERS = {
+        "http_requests_total": "Requests by route and status",
+        "http_requests_query_limit_exceeded_total": "Requests over QUERY_COUNT_LIMIT queries (likely N+1)",
+    }
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, Tuple], Histogram] = {}
+        self._counters: Dict[Tuple[str, Tuple], int] = {}
+
+    def _observe(self, name: str, labels: Tuple, value: float) -> None:
+        histogram = self._histograms.get((name, labels))
+        if histogram is None:
+            histogram = self._histograms[(name, labels)] = Histogram(self.HISTOGRAMS[name][1])
+        histogram.observe(value)
+
+    def _incr(self, name: str, labels: Tuple) -> None:
+        self._counters[(name, labels)] = self._counters.get((name, labels), 0) + 1
+
+    def record(self, method: str, route: str, status: int, timings: RequestTimings) -> None:
+        labels = (("method", method), ("route", route))
+        with self._lock:
+            self._incr("http_requests_total", labels + (("status", str(status)),))
+            self._observe("http_request_duration_seconds", labels, time.perf_counter() - timings.start)
+            self._observe("http_request_handler_seconds", labels, timings.handler)
+            self._observe("http_request_db_seconds", labels, timings.db)
+            self._observe("http_request_serialize_seconds", labels, timings.serialize)
+            self._observe("http_request_queries", labels, timings.queries)
+            if timings.queries > QUERY_COUNT_LIMIT:
+                self._incr("http_requests_query_limit_exceeded_total", labels)
+
+    def render(self) -> str:
+        def label_text(labels, extra=()):
+            pairs = labels + extra
+            return "{" + ",".join(f'{key}="{value}"' for key, value in pairs) + "}" if pairs else ""
+
+        lines = []
+        with self._lock:
+            for name, help_text in self.COUNTERS.items():
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+                lines += [f"{name}{label_text(labels)} {value}" for (key, labels), value in sorted(self._counters.items()) if key == name]
+            for name, (help_text, _) in self.HISTOGRAMS.items():
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+                for (key, labels), histogram in sorted(self._histograms.items(), key=lambda item: item[0]):
+                    if key != name:
+                        continue
+                    running = 0
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        running += count
+                        le = "+Inf" if bound == float("inf") else str(bound)
+                        lines.append(f"{name}_bucket{label_text(labels, (('le', le),))} {running}")
+                    lines.append(f"{name}_sum{label_text(labels)} {histogram.sum:.6f}")
+                    lines.append(f"{name}_count{label_text(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+request_metrics = RequestMetrics()
+
+class RequestMetricsMiddleware:
+    """
+    ASGI middleware timing every HTTP request
+    Adds Server-Timing to the response and feeds request_metrics once the body is sent;
+    long-lived event streams are left out of the histograms
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not REQUEST_METRICS:
+            await self.app(scope, receive, send)
+            return
+        
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        status = 500
+        streaming = False
+
+        async def send_with_timing(message):
+            nonlocal status, streaming
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+                streaming = any(key == b"content-type" and value.startswith(b"text/event-stream") for key, value in headers)
+                if SERVER_TIMING:
+                    headers.append((b"server-timing", timings.server_timing().encode()))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_timings.reset(token)
+            if not streaming:
+                route = scope.get("route")
+                # Route templates, not raw paths, keep the label set bounded
+                route_path = getattr(route, "path", None) or "unmatched"
+                request_metrics.record(scope["method"], route_path, status, timings)
+                if timings.queries > QUERY_COUNT_LIMIT:
+                    logger.warning("%s %s ran %d queries (QUERY_COUNT_LIMIT=%d)", scope["method"], route_path, timings.queries, QUERY_COUNT_LIMIT)
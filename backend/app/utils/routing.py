@@ -0,0 +1,15 @@
+from fastapi import APIRouter
+
+def override_routes(base: APIRouter, overrides: APIRouter) -> APIRouter:
+    """
+    Build a router from base where every route that overrides also defines
+    (same path and methods) is swapped for the override.
+    base's route order is kept, so static paths like /page still match
+    before /{task_id}; routes without an override stay as they are.
+    """
+    replacements = {(route.path, frozenset(route.methods)): route for route in overrides.routes}
+    merged = APIRouter()
+    for route in base.routes:
+        merged.routes.append(replacements.pop((route.path, frozenset(route.methods)), route))
+    merged.routes.extend(replacements.values())
+    return merged
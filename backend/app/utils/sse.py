@@ -0,0 +1,20 @@
+from typing import Optional
+
+# Server-sent events wire format (text/event-stream), one block per message
+
+def sse_message(data: str, event: Optional[str] = None, id: Optional[str] = None) -> str:
+    lines = []
+    if id is not None:
+        lines.append(f"id: {id}")
+    if event is not None:
+        lines.append(f"event: {event}")
+    lines.extend(f"data: {line}" for line in data.split("\n"))
+    return "\n".join(lines) + "\n\n"
+
+def sse_comment(text: str) -> str:
+    """Ignored by clients, keeps proxies from closing an idle stream"""
+    return f": {text}\n\n"
+
+def sse_retry(milliseconds: int) -> str:
+    """Reconnect delay used by EventSource after the stream ends"""
+    return f"retry: {milliseconds}\n\n"
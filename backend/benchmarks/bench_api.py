@@ -0,0 +1,188 @@
+"""
+API hot-path benchmarks: p50/p95/p99 latency and requests/s per scenario (benchmarks/scenarios.py)
+
+Usage (from backend/):
+    python -m benchmarks.bench_api --scale 100k --output baseline.json
+    python -m benchmarks.bench_api --scale 100k --mode uvicorn --workers 4 --concurrency 32
+    python -m benchmarks.bench_api --no-seed --baseline baseline.json --threshold 0.2
+    BENCH_DATABASE_URL=postgresql://... python -m benchmarks.bench_api --scale 1m
+    DB_ASYNC=true python -m benchmarks.bench_api        # the async routes
+
+--mode asgi drives the app in-process through httpx's ASGI transport (no sockets: the app's
+own cost); --mode uvicorn starts a real server and measures over HTTP.
+With --baseline the run is compared against a stored result and exits 1 on a regression.
+Runs against a throwaway SQLite file unless BENCH_DATABASE_URL is set.
+Tables are dropped and reseeded unless --no-seed, so never point it at real data.
+"""
+import argparse
+import asyncio
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+
+# Never the app's own DATABASE_URL (docker-compose, dev shells): seeding drops every table
+os.environ["DATABASE_URL"] = os.getenv("BENCH_DATABASE_URL", "sqlite:///./bench.db")
+
+import httpx
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+from app.models.task_model import Task
+from app.models.user import User
+from benchmarks.results import check, load, save, summarize
+from benchmarks.scenarios import SCENARIOS, Context, Scenario
+from benchmarks.seed import SCALES, BENCH_PASSWORD, seed
+
+# Unmeasured requests per scenario: connection setup, caches, JIT-ish first-call costs
+WARMUP = 20
+
+async def run_scenario(client: httpx.AsyncClient, scenario: Scenario, context: Context, requests: int, concurrency: int, rng: random.Random) -> dict:
+    latencies, errors = [], 0
+    remaining = WARMUP + requests
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            measured = remaining < requests
+            kwargs = {"headers": context.headers()} if scenario.auth else {}
+            if scenario.json is not None:
+                kwargs["json"] = scenario.json(rng, context)
+            if scenario.form is not None:
+                kwargs["data"] = scenario.form(rng, context)
+            path = scenario.path(rng, context)
+
+            start = time.perf_counter()
+            response = await client.request(scenario.method, path, **kwargs)
+            await response.aread()
+            if measured:
+                latencies.append(time.perf_counter() - start)
+                errors += response.status_code >= 400
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    # Warmup requests overlap the start a little with high concurrency; close enough for relative numbers
+    return summarize(latencies, errors, time.perf_counter() - start)
+
+@asynccontextmanager
+async def asgi_client(concurrency: int):
+    from main import app
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+            yield client
+
+@asynccontextmanager
+async def uvicorn_client(concurrency: int, workers: int, port: int):
+    command = [
+        sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+        "--workers", str(workers), "--log-level", "warning", "--no-access-log",
+    ]
+    server = subprocess.Popen(command, env=os.environ.copy())
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        async with httpx.AsyncClient(base_url=base_url, timeout=120, limits=limits) as client:
+            deadline = time.monotonic() + 60
+            while True:
+                if server.poll() is not None:
+                    raise RuntimeError("uvicorn exited during startup")
+                try:
+                    if (await client.get("/health")).status_code == 200:
+                        break
+                except httpx.TransportError:
+                    pass
+                if time.monotonic() > deadline:
+                    raise RuntimeError("uvicorn didn't start within 60s")
+                await asyncio.sleep(0.2)
+            yield client
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+async def run(args, context: Context, scenarios) -> dict:
+    if args.mode == "uvicorn":
+        client_context = uvicorn_client(args.concurrency, args.workers, args.port)
+    else:
+        client_context = asgi_client(args.concurrency)
+
+    results = {}
+    async with client_context as client:
+        login = await client.post("/auth/login", data={"username": "bench0", "password": BENCH_PASSWORD})
+        login.raise_for_status()
+        context.token = login.json()["access_token"]
+
+        print(f"{'scenario':<18} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+        for scenario in scenarios:
+            # Per-scenario RNG: adding a scenario doesn't change the requests of the others
+            rng = random.Random(f"{args.seed}:{scenario.name}")
+            requests = args.login_requests if scenario.name == "auth.login" else args.requests
+            result = await run_scenario(client, scenario, context, requests, args.concurrency, rng)
+            results[scenario.name] = result
+            print(f"{scenario.name:<18} {result['rps']:>8.0f} {result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} {result['p99_ms']:>8.2f} {result['errors']:>7}")
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", choices=SCALES, default="1k", help="tasks and notes to seed")
+    parser.add_argument("--no-seed", action="store_true", help="reuse the data of a previous run")
+    parser.add_argument("--mode", choices=["asgi", "uvicorn"], default="asgi")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--requests", type=int, default=500, help="measured requests per scenario")
+    parser.add_argument("--login-requests", type=int, default=50, help="login is bcrypt-bound, fewer requests")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--scenario", action="append", help="only these scenarios (prefix match, repeatable)")
+    parser.add_argument("--read-only", action="store_true", help="skip scenarios that write")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="bench-results.json")
+    parser.add_argument("--baseline", help="stored result to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed p95/rps change, 0.2 = 20%%")
+    args = parser.parse_args()
+
+    engine = create_engine(os.environ["DATABASE_URL"])
+    if not args.no_seed:
+        start = time.perf_counter()
+        counts = seed(engine, SCALES[args.scale], args.seed)
+        print(f"seeded {counts} on {engine.url.get_backend_name()} in {time.perf_counter() - start:.1f}s")
+    with Session(engine) as db:
+        context = Context(rows=db.scalar(select(func.max(Task.id))) or 0, users=db.scalar(select(func.count()).select_from(User)))
+    engine.dispose()
+
+    scenarios = [
+        scenario for scenario in SCENARIOS
+        if (not args.scenario or any(scenario.name.startswith(prefix) for prefix in args.scenario))
+        and not (args.read_only and scenario.writes)
+    ]
+    results = asyncio.run(run(args, context, scenarios))
+
+    output = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "database": engine.url.get_backend_name(),
+            "config": {
+                "scale": args.scale, "mode": args.mode, "workers": args.workers, "requests": args.requests,
+                "concurrency": args.concurrency, "db_async": os.getenv("DB_ASYNC", "false").lower() == "true",
+            },
+        },
+        "results": results,
+    }
+    save(args.output, output)
+    print(f"results written to {args.output}")
+    if args.baseline:
+        sys.exit(check(load(args.baseline), output, args.threshold))
+
+if __name__ == "__main__":
+    main()
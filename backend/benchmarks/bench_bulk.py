@@ -0,0 +1,63 @@
+"""
+Bulk insert/update/delete vs. the single-row service loop
+
+Usage (from backend/):
+    python -m benchmarks.bench_bulk --rows 10000
+    BENCH_DATABASE_URL=postgresql://... python -m benchmarks.bench_bulk
+
+Runs against a throwaway SQLite file unless BENCH_DATABASE_URL is set.
+Tables are created and dropped by the script, so never point it at real data.
+"""
+import argparse
+import os
+import time
+
+# Never the app's own DATABASE_URL (docker-compose, dev shells): this benchmark drops every table
+os.environ["DATABASE_URL"] = os.getenv("BENCH_DATABASE_URL", "sqlite:///./bench.db")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.db import Base
+from app.models import task_model, user, note_model
+from app.schemas.task_schemas import TaskCreate, TaskUpdate
+from app.services.task_service import TaskService
+
+def timed(label: str, rows: int, fn) -> float:
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed:8.3f}s  {rows / elapsed:10.0f} rows/s")
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=2000)
+    args = parser.parse_args()
+
+    engine = create_engine(os.environ["DATABASE_URL"])
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    rows = [{"title": f"Imported task {i}", "description": "from tracker", "priority": "low"} for i in range(args.rows)]
+
+    with SessionLocal() as db:
+        loop_ids = []
+        print(f"{args.rows} rows on {engine.url.get_backend_name()}")
+        single = timed("create: single-row loop", args.rows, lambda: loop_ids.extend(TaskService.create_task(db, TaskCreate(**row)).id for row in rows))
+        bulk_ids = []
+        bulk = timed("create: bulk", args.rows, lambda: bulk_ids.extend(task.id for task in TaskService.bulk_create_tasks(db, rows)[0]))
+        print(f"{'speedup':<28} {single / bulk:8.1f}x\n")
+
+        single = timed("update: single-row loop", args.rows, lambda: [TaskService.update_task(db, task_id, TaskUpdate(completed=True)) for task_id in loop_ids])
+        bulk = timed("update: bulk", args.rows, lambda: TaskService.bulk_update_tasks(db, [{"id": task_id, "completed": True} for task_id in bulk_ids]))
+        print(f"{'speedup':<28} {single / bulk:8.1f}x\n")
+
+        single = timed("delete: single-row loop", args.rows, lambda: [TaskService.delete_task(db, task_id) for task_id in loop_ids])
+        bulk = timed("delete: bulk", args.rows, lambda: TaskService.bulk_delete_tasks(db, bulk_ids))
+        print(f"{'speedup':<28} {single / bulk:8.1f}x")
+
+    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Streaming import throughput (parse + validate + COPY / executemany)
+
+Usage (from backend/):
+    python -m benchmarks.bench_import --rows 100000 --format csv
+    BENCH_DATABASE_URL=postgresql://... python -m benchmarks.bench_import
+
+Runs against a throwaway SQLite file unless BENCH_DATABASE_URL is set.
+Tables are created and dropped by the script, so never point it at real data.
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+
+# Never the app's own DATABASE_URL (docker-compose, dev shells): this benchmark drops every table
+os.environ["DATABASE_URL"] = os.getenv("BENCH_DATABASE_URL", "sqlite:///./bench.db")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.db import Base
+from app.models import task_model, user, note_model
+from app.schemas.import_schemas import ImportProgress
+from app.services.task_service import TaskService
+from app.utils.export import ExportFormat
+from app.utils.importer import iter_records
+
+async def upload(rows: int, fmt: ExportFormat, chunk_size: int = 64 * 1024):
+    """Generate the upload body on the fly in network-sized chunks"""
+    if fmt == ExportFormat.csv:
+        lines = ("title,description,priority,completed\n",)
+        lines += tuple(f"Imported task {i},from tracker,low,false\n" for i in range(rows))
+    else:
+        lines = tuple(json.dumps({"title": f"Imported task {i}", "description": "from tracker", "priority": "low"}) + "\n" for i in range(rows))
+    body = "".join(lines).encode()
+    for start in range(0, len(body), chunk_size):
+        yield body[start:start + chunk_size]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--format", type=ExportFormat, default=ExportFormat.ndjson)
+    args = parser.parse_args()
+
+    engine = create_engine(os.environ["DATABASE_URL"])
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    with SessionLocal() as db:
+        # Nobody polls it, so it isn't registered with ImportService.start
+        progress = ImportProgress(import_id="bench")
+        start = time.perf_counter()
+        asyncio.run(TaskService.import_tasks(db, iter_records(upload(args.rows, args.format), args.format), progress))
+        elapsed = time.perf_counter() - start
+
+    print(f"{args.rows} {args.format.value} rows on {engine.url.get_backend_name()}")
+    print(f"imported {progress.imported}, rejected {progress.rejected} in {elapsed:.2f}s ({progress.imported / elapsed:,.0f} rows/s)")
+
+    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+
+if __name__ == "__main__":
+    main()
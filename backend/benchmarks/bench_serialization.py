@@ -0,0 +1,85 @@
+"""
+GET /tasks/ list serialization: ORM objects + response_model vs. the fast column-row path
+
+Usage (from backend/):
+    python -m benchmarks.bench_serialization --rows 5000 --limit 100 --requests 200
+    BENCH_DATABASE_URL=postgresql://... python -m benchmarks.bench_serialization
+
+Both paths are served by the same in-process app through TestClient, so the numbers
+include routing and HTTP overhead exactly like a real request.
+Runs against a throwaway SQLite file unless BENCH_DATABASE_URL is set.
+Tables are created and dropped by the script, so never point it at real data.
+"""
+import argparse
+import os
+import time
+
+# Never the app's own DATABASE_URL (docker-compose, dev shells): this benchmark drops every table
+os.environ["DATABASE_URL"] = os.getenv("BENCH_DATABASE_URL", "sqlite:///./bench.db")
+
+from typing import List
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from app.db import Base
+from app.models import task_model, user, note_model
+from app.schemas.task_schemas import TaskResponse, task_list_adapter
+from app.services.task_service import TaskService
+from app.utils.fast_json import list_response
+
+def build_app(SessionLocal) -> FastAPI:
+    app = FastAPI()
+
+    def get_session():
+        with SessionLocal() as db:
+            yield db
+
+    @app.get("/orm", response_model=List[TaskResponse])
+    def orm_path(limit: int, db: Session = Depends(get_session)):
+        return TaskService.get_tasks(db, 0, limit)
+
+    @app.get("/fast", response_model=List[TaskResponse])
+    def fast_path(limit: int, db: Session = Depends(get_session)):
+        return list_response(task_list_adapter, TaskService.get_task_rows(db, 0, limit))
+
+    return app
+
+def timed(client: TestClient, path: str, limit: int, requests: int) -> float:
+    start = time.perf_counter()
+    for _ in range(requests):
+        client.get(path, params={"limit": limit})
+    elapsed = time.perf_counter() - start
+    print(f"{path:<8} {elapsed / requests * 1000:8.2f} ms/request")
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    engine = create_engine(os.environ["DATABASE_URL"])
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with SessionLocal() as db:
+        TaskService.bulk_create_tasks(db, [
+            {"title": f"Task {i}", "description": "x" * 200, "priority": "high", "completed": i % 2 == 0}
+            for i in range(args.rows)
+        ])
+
+    with TestClient(build_app(SessionLocal)) as client:
+        # Same payload from both paths
+        assert client.get("/orm", params={"limit": args.limit}).json() == client.get("/fast", params={"limit": args.limit}).json()
+        print(f"{args.requests} requests of {args.limit} rows on {engine.url.get_backend_name()}")
+        orm = timed(client, "/orm", args.limit, args.requests)
+        fast = timed(client, "/fast", args.limit, args.requests)
+        print(f"{'speedup':<8} {orm / fast:8.1f}x")
+
+    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+
+if __name__ == "__main__":
+    main()
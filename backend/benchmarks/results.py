@@ -0,0 +1,90 @@
+"""
+Stored benchmark results and regression checks
+
+Usage (from backend/):
+    python -m benchmarks.results baseline.json current.json --threshold 0.2
+
+Prints a per-scenario diff and exits 1 when any scenario regressed.
+"""
+import argparse
+import json
+import sys
+from typing import Dict, List
+
+# Latencies below this many ms are noise: a 0.3 -> 0.5 ms move isn't a regression
+NOISE_FLOOR_MS = 1.0
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict[str, float]:
+    """Latencies in seconds -> the numbers stored per scenario"""
+    ordered = sorted(latencies)
+    to_ms = 1000
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "mean_ms": round(sum(ordered) / len(ordered) * to_ms, 3) if ordered else 0.0,
+        "p50_ms": round(percentile(ordered, 0.50) * to_ms, 3),
+        "p95_ms": round(percentile(ordered, 0.95) * to_ms, 3),
+        "p99_ms": round(percentile(ordered, 0.99) * to_ms, 3),
+    }
+
+def load(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+def save(path: str, results: dict) -> None:
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+def compare(baseline: dict, current: dict, threshold: float) -> List[str]:
+    """
+    Scenarios whose p95 grew or throughput dropped by more than threshold (0.2 = 20%)
+    Returns: one line per regression
+    """
+    regressions = []
+    for name, now in sorted(current["results"].items()):
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        if now["p95_ms"] > before["p95_ms"] * (1 + threshold) and now["p95_ms"] - before["p95_ms"] > NOISE_FLOOR_MS:
+            regressions.append(f"{name}: p95 {before['p95_ms']:.2f} -> {now['p95_ms']:.2f} ms")
+        if before["rps"] and now["rps"] < before["rps"] * (1 - threshold):
+            regressions.append(f"{name}: {before['rps']:.0f} -> {now['rps']:.0f} requests/s")
+        if now["errors"] > before["errors"]:
+            regressions.append(f"{name}: errors {before['errors']} -> {now['errors']}")
+    return regressions
+
+def print_diff(baseline: dict, current: dict) -> None:
+    print(f"{'scenario':<18} {'p95 before':>11} {'p95 now':>9} {'rps before':>11} {'rps now':>9}")
+    for name, now in sorted(current["results"].items()):
+        before = baseline["results"].get(name, {})
+        print(f"{name:<18} {before.get('p95_ms', float('nan')):>11.2f} {now['p95_ms']:>9.2f} {before.get('rps', float('nan')):>11.0f} {now['rps']:>9.0f}")
+
+def check(baseline: dict, current: dict, threshold: float) -> int:
+    """Print the diff and regressions, returns the exit code"""
+    if baseline.get("meta", {}).get("config") != current.get("meta", {}).get("config"):
+        print("warning: runs used different settings (scale, mode, concurrency...), numbers may not compare")
+    print_diff(baseline, current)
+    regressions = compare(baseline, current, threshold)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    return 1 if regressions else 0
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args()
+    sys.exit(check(load(args.baseline), load(args.current), args.threshold))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Requests measured by bench_api, at least one per router in app/api
+
+Paths are built per request from a seeded RNG, so runs are repeatable and
+item lookups spread over the whole table instead of hitting one cached row.
+"""
+import random
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+from benchmarks.seed import WORDS
+
+@dataclass
+class Context:
+    """What the scenarios need to know about the seeded data"""
+    rows: int
+    users: int
+    token: str = ""
+
+    def headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.token}"}
+
+@dataclass
+class Scenario:
+    name: str
+    method: str
+    path: Callable[[random.Random, Context], str]
+    auth: bool = False
+    json: Optional[Callable[[random.Random, Context], object]] = None
+    form: Optional[Callable[[random.Random, Context], Dict[str, str]]] = None
+    # Scenarios that change data are skipped with --read-only
+    writes: bool = False
+
+def _id(rng: random.Random, context: Context) -> int:
+    return rng.randint(1, context.rows)
+
+SCENARIOS = [
+    # tasks
+    Scenario("tasks.list", "GET", lambda rng, c: "/tasks/?limit=100"),
+    Scenario("tasks.list_skip", "GET", lambda rng, c: f"/tasks/?limit=100&skip={rng.randint(0, max(0, c.rows - 100))}"),
+    Scenario("tasks.page", "GET", lambda rng, c: "/tasks/page?limit=100"),
+    Scenario("tasks.sorted", "GET", lambda rng, c: "/tasks/?limit=100&completed=false&sort=-priority,due_date"),
+    Scenario("tasks.queue", "GET", lambda rng, c: "/tasks/queue?limit=20"),
+    Scenario("tasks.queue_user", "GET", lambda rng, c: f"/tasks/queue?limit=20&user_id={rng.randint(1, c.users)}"),
+    Scenario("tasks.item", "GET", lambda rng, c: f"/tasks/{_id(rng, c)}"),
+    Scenario("tasks.mine", "GET", lambda rng, c: "/tasks/mine?completed=false", auth=True),
+    Scenario("tasks.changes", "GET", lambda rng, c: f"/tasks/changes?user_id={rng.randint(1, c.users)}&limit=100"),
+    Scenario(
+        "tasks.create", "POST", lambda rng, c: "/tasks/", auth=True, writes=True,
+        json=lambda rng, c: {"title": f"Bench {rng.choice(WORDS)}", "priority": "high", "user_id": rng.randint(1, c.users)},
+    ),
+    Scenario(
+        "tasks.update", "PUT", lambda rng, c: f"/tasks/{_id(rng, c)}", auth=True, writes=True,
+        json=lambda rng, c: {"completed": rng.random() < 0.5},
+    ),
+    # notes
+    Scenario("notes.list", "GET", lambda rng, c: "/notes/?limit=100"),
+    Scenario("notes.item", "GET", lambda rng, c: f"/notes/{_id(rng, c)}"),
+    Scenario("notes.mine", "GET", lambda rng, c: "/notes/mine", auth=True),
+    Scenario(
+        "notes.create", "POST", lambda rng, c: "/notes/", auth=True, writes=True,
+        json=lambda rng, c: {"title": "Bench", "content": " ".join(rng.choice(WORDS) for _ in range(50))},
+    ),
+    # auth
+    Scenario(
+        "auth.login", "POST", lambda rng, c: "/auth/login",
+        form=lambda rng, c: {"username": f"bench{rng.randint(0, c.users - 1)}", "password": "benchpass123"},
+    ),
+    Scenario("auth.me", "GET", lambda rng, c: "/auth/me", auth=True),
+    # search
+    Scenario("search.query", "GET", lambda rng, c: f"/search?q={rng.choice(WORDS)}+{rng.choice(WORDS)}"),
+    # stats
+    Scenario("stats.global", "GET", lambda rng, c: "/stats"),
+    Scenario("stats.me", "GET", lambda rng, c: "/stats/me", auth=True),
+    # batch: compare with 20 x tasks.item plus auth.me
+    Scenario(
+        "batch.items", "POST", lambda rng, c: "/batch", auth=True,
+        json=lambda rng, c: {"operations": [{"path": "/auth/me"}] + [{"path": f"/tasks/{_id(rng, c)}"} for _ in range(20)]},
+    ),
+]
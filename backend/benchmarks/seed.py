@@ -0,0 +1,114 @@
+"""
+Realistic data for the API benchmarks: many users, tasks and notes with searchable text
+
+Tables are dropped and recreated, so never point this at real data.
+"""
+import os
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
+from sqlalchemy import insert
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.orm import Session
+from app.db import Base
+from app.models.task_model import Task
+from app.models.note_model import Note
+from app.models.user import User
+from app.services.import_service import ImportService
+from app.services.stats_service import StatsService
+from app.utils.auth import get_password_hash
+
+# Tasks (and as many notes) per preset; users get ~100 of each
+SCALES = {"1k": 1_000, "10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+BENCH_PASSWORD = "benchpass123"
+SEED_CHUNK = 10_000
+# Where the benchmarks run unless BENCH_DATABASE_URL names another throwaway database
+DEFAULT_BENCH_URL = "sqlite:///./bench.db"
+
+WORDS = (
+    "quarterly report budget review design meeting client invoice deploy release backend frontend "
+    "database migration roadmap hiring onboarding security audit customer feedback sprint planning "
+    "dashboard metrics incident postmortem contract renewal marketing launch research prototype"
+).split()
+
+def check_bench_database(engine: Engine) -> None:
+    """
+    Refuse to touch anything but the benchmark database: BENCH_DATABASE_URL, else the default bench file
+    Raises: RuntimeError
+    """
+    allowed = make_url(os.getenv("BENCH_DATABASE_URL") or DEFAULT_BENCH_URL)
+    if engine.url != allowed:
+        raise RuntimeError(
+            f"Refusing to reset {engine.url.render_as_string(hide_password=True)}: "
+            f"benchmarks only drop the database named by BENCH_DATABASE_URL (default {DEFAULT_BENCH_URL})"
+        )
+
+def reset_schema(engine: Engine) -> None:
+    """Fresh schema: migrations on Postgres (triggers, tsvector columns), create_all on SQLite"""
+    check_bench_database(engine)
+    if engine.dialect.name == "postgresql":
+        from alembic import command
+        from alembic.config import Config
+        config = Config("alembic.ini")
+        command.downgrade(config, "base")
+        command.upgrade(config, "head")
+    else:
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+def _task(rng: random.Random, users: int, now: datetime) -> dict:
+    return {
+        "title": _sentence(rng, rng.randint(2, 6)).capitalize(),
+        "description": _sentence(rng, rng.randint(5, 60)) if rng.random() < 0.8 else None,
+        "completed": rng.random() < 0.4,
+        "priority": rng.choices(["low", "medium", "high"], weights=[3, 5, 2])[0],
+        "due_date": now + timedelta(days=rng.randint(-30, 60)) if rng.random() < 0.7 else None,
+        "user_id": rng.randint(1, users) if rng.random() < 0.95 else None,
+    }
+
+def _note(rng: random.Random, users: int) -> dict:
+    return {
+        "title": _sentence(rng, rng.randint(1, 5)).capitalize(),
+        "content": _sentence(rng, rng.randint(30, 300)),
+        "user_id": rng.randint(1, users) if rng.random() < 0.95 else None,
+    }
+
+def _load(engine: Engine, model, rows: List[dict]) -> None:
+    """Same loader as the import endpoint: COPY on Postgres, executemany elsewhere"""
+    with Session(engine) as db:
+        imported, rejects = ImportService.load_chunk(db, model, list(enumerate(rows)))
+    if rejects:
+        raise RuntimeError(f"Seeding {model.__tablename__} failed: {rejects[0][1]}")
+
+def seed(engine: Engine, rows: int, seed: int = 42) -> Dict[str, int]:
+    """
+    Reset the schema and load rows tasks and rows notes spread over rows // 100 users
+    Every user's password is BENCH_PASSWORD, usernames are bench0, bench1, ...
+    Returns: row counts per table
+    """
+    reset_schema(engine)
+    rng = random.Random(seed)
+    users = max(10, rows // 100)
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+
+    # One hash for everyone, hashing 10k passwords would dominate the seeding time
+    hashed = get_password_hash(BENCH_PASSWORD)
+    with engine.begin() as conn:
+        for start in range(0, users, SEED_CHUNK):
+            conn.execute(insert(User), [
+                {"username": f"bench{i}", "email": f"bench{i}@example.com", "hashed_password": hashed}
+                for i in range(start, min(users, start + SEED_CHUNK))
+            ])
+
+    for start in range(0, rows, SEED_CHUNK):
+        size = min(SEED_CHUNK, rows - start)
+        _load(engine, Task, [_task(rng, users, now) for _ in range(size)])
+        _load(engine, Note, [_note(rng, users) for _ in range(size)])
+
+    # Counters are trigger-maintained already; the rebuild is a cheap guard against a partial seed
+    with Session(engine) as db:
+        StatsService.rebuild(db)
+    return {"users": users, "tasks": rows, "notes": rows}
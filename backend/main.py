@@ -1,12 +1,41 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Depends, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from app.api import tasks, notes, auth
-from app.db import create_tables
+from fastapi.responses import PlainTextResponse
+from app.api import tasks, notes, auth, search, stats, events, admin, batch
+from app.api import async_tasks, async_notes, async_auth
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from app.db import create_tables, get_db, engine, async_engine, pool_stats, async_pool_stats, read_router, DB_ASYNC
+from app.utils.routing import override_routes
+from app.utils.request_metrics import RequestMetricsMiddleware, TimedRoute, request_metrics, add_sync_endpoint_context
+from app.utils.profiling import ProfilingMiddleware, PROFILING_ENABLED, watch_current_thread
+from app.utils.batch import session_turn
+from app.utils.auth import token_cache, shutdown_hash_executor
+from app.services.auth_service import user_cache
+from app.services.task_service import task_cache
+from app.services.note_service import note_cache
+from app.services.cache_service import cache_backend
+from app.services.count_service import count_cache
+from app.services.event_service import broadcaster
 # Import models to ensure they're registered with Base
-from app.models import task_model, user, note_model
+from app.models import task_model, user, note_model, stats_model, tombstone_model
 
 
-app = FastAPI(title="Task Notes Dashboard")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    shutdown_hash_executor()
+    broadcaster.close()
+
+app = FastAPI(title="Task Notes Dashboard", lifespan=lifespan)
+# Time the app-level routes below like the routers' ones
+app.router.route_class = TimedRoute
+# Sync endpoints run in the threadpool: let a request profile sample that thread too
+add_sync_endpoint_context(watch_current_thread)
+# Sub-requests of a POST /batch share one session: their endpoints run one at a time
+add_sync_endpoint_context(session_turn)
 
 # Configure CORS middleware
 app.add_middleware(
@@ -15,8 +44,17 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # Allow all HTTP methods
     allow_headers=["*"],  # Allow all headers
+    expose_headers=["X-Total-Count", "X-Total-Count-Type"],  # Pagination totals of the list endpoints
 )
 
+# Per-request timing: Server-Timing header, /metrics histograms, query-count limit
+# Added last so it wraps CORS and times the whole request
+app.add_middleware(RequestMetricsMiddleware)
+
+# Admin-only profiling (X-Profiling-Token), off by default: when disabled nothing is installed
+if PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+
 # Create database tables
 #create_tables()
 
@@ -30,7 +68,58 @@ def read_root():
 def health_check():
     return {"status": "healthy", "message": "API is operational"}
 
+# Database health and live connection pool statistics
+@app.get("/health/db", tags=["Health"])
+def db_health_check(db: Session = Depends(get_db)):
+    try:
+        db.execute(text("SELECT 1"))
+    except SQLAlchemyError:
+        raise HTTPException(status_code=503, detail="Database unavailable")
+    
+    result = {"status": "healthy", "pool": pool_stats.snapshot(engine.pool)}
+    if async_engine is not None:
+        result["async_pool"] = async_pool_stats.snapshot(async_engine.sync_engine.pool)
+    if read_router.replicas:
+        result["replicas"] = read_router.stats()
+    return result
+
+# Hit/miss counters of the in-process caches
+@app.get("/health/cache", tags=["Health"])
+def cache_stats():
+    return {
+        "auth_tokens": token_cache.stats(),
+        "auth_users": user_cache.stats(),
+        "items": cache_backend.stats(),
+        "tasks": task_cache.stats(),
+        "notes": note_cache.stats(),
+        "list_counts": count_cache.stats(),
+    }
+
+# Open change-feed streams and published events
+@app.get("/health/events", tags=["Health"])
+def events_stats():
+    return broadcaster.stats()
+
+# Per-route request, database and serialization histograms in the Prometheus text format
+@app.get("/metrics", tags=["Health"], response_class=PlainTextResponse)
+def metrics():
+    return PlainTextResponse(request_metrics.render(), media_type="text/plain; version=0.0.4")
+
+# DB_ASYNC=true swaps in the async versions of the core routes for A/B runs
+if DB_ASYNC:
+    tasks_router = override_routes(tasks.router, async_tasks.router)
+    notes_router = override_routes(notes.router, async_notes.router)
+    auth_router = override_routes(auth.router, async_auth.router)
+else:
+    tasks_router, notes_router, auth_router = tasks.router, notes.router, auth.router
+
 # Include tasks router
-app.include_router(tasks.router, prefix="/tasks", tags=["Tasks"])
-app.include_router(notes.router, prefix="/notes", tags=["Notes"])   
-app.include_router(auth.router, prefix="/auth", tags=["Auth"])
\ No newline at end of file
+app.include_router(tasks_router, prefix="/tasks", tags=["Tasks"])
+app.include_router(notes_router, prefix="/notes", tags=["Notes"])   
+app.include_router(auth_router, prefix="/auth", tags=["Auth"])
+app.include_router(search.router, prefix="/search", tags=["Search"])
+app.include_router(stats.router, prefix="/stats", tags=["Stats"])
+app.include_router(events.router, prefix="/events", tags=["Events"])
+app.include_router(batch.router, prefix="/batch", tags=["Batch"])
+if PROFILING_ENABLED:
+    app.include_router(admin.router, prefix="/admin", tags=["Admin"])
\ No newline at end of file
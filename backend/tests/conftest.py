@@ -4,7 +4,9 @@ from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from main import app
-from app.db import get_db, Base
+from app.db import get_db, get_read_db, get_session_factory, Base
+from app.utils.batch import current_batch
+from app.utils.db_metrics import attach_query_timer
 
 # Test database URL (separate from main database)
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
@@ -15,11 +17,19 @@ engine = create_engine(
     connect_args={"check_same_thread": False}
 )
 
+# Count queries per request like app.db does for the real engine
+attach_query_timer(engine)
+
 # Create test session
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 # Override get_db dependency for testing
 def override_get_db():
+    # Share the session of an enclosing POST /batch like app.db.get_db does
+    batch = current_batch.get()
+    if batch is not None:
+        yield batch.session
+        return
     try:
         db = TestingSessionLocal()
         yield db
@@ -27,6 +37,8 @@ def override_get_db():
         db.close()
 
 app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_read_db] = override_get_db
+app.dependency_overrides[get_session_factory] = lambda: TestingSessionLocal
 
 @pytest.fixture(scope="session")
 def client():
@@ -42,6 +54,15 @@ def client():
     if os.path.exists("test.db"):
         os.remove("test.db")
 
+@pytest.fixture
+def db_session(client):
+    """Database session bound to the test database"""
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
 @pytest.fixture
 def test_user():
     """Test user data"""
@@ -51,6 +72,16 @@ def test_user():
         "password": "testpass123"
     }
 
+@pytest.fixture
+def auth_headers(client, test_user):
+    """Register and login the test user"""
+    client.post("/auth/register", json=test_user)
+    login_response = client.post("/auth/login", data={
+        "username": test_user["username"],
+        "password": test_user["password"]
+    })
+    return {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
 @pytest.fixture
 def test_task():
     """Test task data"""
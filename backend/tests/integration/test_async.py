@@ -0,0 +1,149 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import NullPool
+from app.api import tasks, notes, auth, batch
+from app.api import async_tasks, async_notes, async_auth
+from app.db import get_async_db, get_async_session_factory, get_async_database_url
+from app.utils.routing import override_routes
+from tests.conftest import SQLALCHEMY_DATABASE_URL, TestingSessionLocal, override_get_db
+from app.db import get_db, get_read_db, get_session_factory
+
+# Async engine on the same SQLite file as the sync test engine
+async_engine = create_async_engine(get_async_database_url(SQLALCHEMY_DATABASE_URL), poolclass=NullPool)
+TestingAsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+async def override_get_async_db():
+    async with TestingAsyncSessionLocal() as db:
+        yield db
+
+@pytest.fixture(scope="module")
+def async_client(client):
+    """Test client for an app serving the async routes, as main.py does with DB_ASYNC=true"""
+    app = FastAPI()
+    app.include_router(override_routes(tasks.router, async_tasks.router), prefix="/tasks")
+    app.include_router(override_routes(notes.router, async_notes.router), prefix="/notes")
+    app.include_router(override_routes(auth.router, async_auth.router), prefix="/auth")
+    app.include_router(batch.router, prefix="/batch")
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    app.dependency_overrides[get_async_session_factory] = lambda: TestingAsyncSessionLocal
+    app.dependency_overrides[get_session_factory] = lambda: TestingSessionLocal
+    
+    with TestClient(app) as test_client:
+        yield test_client
+
+@pytest.fixture
+def async_user():
+    """Separate user so the async tests don't pre-register the sync test user"""
+    return {
+        "username": "asyncuser",
+        "email": "async@example.com",
+        "password": "asyncpass123"
+    }
+
+def test_async_database_url():
+    """Test mapping sync URLs onto async drivers"""
+    assert get_async_database_url("postgresql://u:p@db:5432/x") == "postgresql+asyncpg://u:p@db:5432/x"
+    assert get_async_database_url("sqlite:///./test.db") == "sqlite+aiosqlite:///./test.db"
+
+def test_async_routes_replace_sync_routes():
+    """Test that only routes with an async version are swapped"""
+    merged = override_routes(tasks.router, async_tasks.router)
+    endpoints = {(route.path, tuple(sorted(route.methods))): route.endpoint for route in merged.routes}
+    assert endpoints[("/{task_id}", ("GET",))] is async_tasks.get_task
+    assert len(merged.routes) == len(tasks.router.routes)
+
+def test_async_task_crud(async_client, async_user, test_task):
+    """Test the task lifecycle through the async routes"""
+    # Register and login through the async auth routes
+    async_client.post("/auth/register", json=async_user)
+    login_response = async_client.post("/auth/login", data={
+        "username": async_user["username"],
+        "password": async_user["password"]
+    })
+    assert login_response.status_code == 200
+    token = login_response.json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    
+    assert async_client.get("/auth/me", headers=headers).json()["username"] == async_user["username"]
+    
+    # Create, read, update, delete
+    create_response = async_client.post("/tasks/", json=test_task, headers=headers)
+    assert create_response.status_code == 200
+    task_id = create_response.json()["id"]
+    
+    assert async_client.get(f"/tasks/{task_id}").json()["title"] == test_task["title"]
+    
+    response = async_client.put(f"/tasks/{task_id}", json={"completed": True}, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["completed"] == True
+    
+    page = async_client.get("/tasks/page", params={"limit": 1}).json()
+    assert len(page["items"]) == 1
+    
+    response = async_client.delete(f"/tasks/{task_id}", headers=headers)
+    assert response.status_code == 200
+    assert async_client.get(f"/tasks/{task_id}").status_code == 404
+
+def test_async_note_crud(async_client, async_user, test_note):
+    """Test the note lifecycle through the async routes"""
+    async_client.post("/auth/register", json=async_user)
+    login_response = async_client.post("/auth/login", data={
+        "username": async_user["username"],
+        "password": async_user["password"]
+    })
+    token = login_response.json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    
+    create_response = async_client.post("/notes/", json=test_note, headers=headers)
+    assert create_response.status_code == 200
+    note_id = create_response.json()["id"]
+    
+    response = async_client.put(f"/notes/{note_id}", json={"title": "Async note"}, headers=headers)
+    assert response.json()["title"] == "Async note"
+    
+    assert async_client.get("/notes/").status_code == 200
+    assert async_client.delete(f"/notes/{note_id}", headers=headers).status_code == 200
+    assert async_client.get(f"/notes/{note_id}").status_code == 404
+
+def test_async_export(async_client, async_user, test_task):
+    """Test the async export streams from its own session"""
+    async_client.post("/auth/register", json=async_user)
+    login_response = async_client.post("/auth/login", data={
+        "username": async_user["username"],
+        "password": async_user["password"]
+    })
+    headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+    task_id = async_client.post("/tasks/", json={**test_task, "title": "Async export"}, headers=headers).json()["id"]
+    
+    response = async_client.get("/tasks/export", params={"format": "csv"}, headers=headers)
+    assert response.status_code == 200
+    lines = response.text.splitlines()
+    assert lines[0].startswith("title,description,completed")
+    assert any(line.startswith("Async export,") and f",{task_id}," in line for line in lines)
+
+def test_async_batch(async_client, async_user, test_task):
+    """POST /batch dispatches to the async routes, sharing the user lookup"""
+    async_client.post("/auth/register", json=async_user)
+    login_response = async_client.post("/auth/login", data={
+        "username": async_user["username"],
+        "password": async_user["password"]
+    })
+    headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+    task_id = async_client.post("/tasks/", json=test_task, headers=headers).json()["id"]
+
+    response = async_client.post("/batch", headers=headers, json={"operations": [
+        {"path": "/auth/me"},
+        {"path": f"/tasks/{task_id}"},
+        {"method": "PUT", "path": f"/tasks/{task_id}", "body": {"completed": True}},
+        {"path": f"/tasks/{task_id}"},
+    ]})
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [result["status"] for result in results] == [200, 200, 200, 200]
+    assert results[0]["body"]["username"] == async_user["username"]
+    assert results[1]["body"]["completed"] is False
+    assert results[3]["body"]["completed"] is True
@@ -72,4 +72,125 @@ def test_get_current_user(client, test_user):
     response = client.get("/auth/me", headers=headers)
     assert response.status_code == 200
     data = response.json()
-    assert data["username"] == test_user["username"]
\ No newline at end of file
+    assert data["username"] == test_user["username"]
+
+def test_auth_cache_hits(client, test_user):
+    """Test repeated authenticated requests are served from the auth caches"""
+    client.post("/auth/register", json=test_user)
+    login_response = client.post("/auth/login", data={
+        "username": test_user["username"],
+        "password": test_user["password"]
+    })
+    token = login_response.json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    
+    client.get("/auth/me", headers=headers)
+    before = client.get("/health/cache").json()
+    client.get("/auth/me", headers=headers)
+    after = client.get("/health/cache").json()
+    
+    assert after["auth_tokens"]["hits"] == before["auth_tokens"]["hits"] + 1
+    assert after["auth_users"]["hits"] == before["auth_users"]["hits"] + 1
+
+def test_deactivated_user_is_evicted(client, db_session):
+    """Test that deactivating a user invalidates the cached user"""
+    from app.models.user import User
+    user_data = {"username": "deactivated", "email": "deactivated@example.com", "password": "testpass123"}
+    client.post("/auth/register", json=user_data)
+    login_response = client.post("/auth/login", data={
+        "username": user_data["username"],
+        "password": user_data["password"]
+    })
+    headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+    assert client.get("/auth/me", headers=headers).status_code == 200
+    
+    # Deactivate through the ORM
+    user = db_session.query(User).filter(User.username == user_data["username"]).first()
+    user.is_active = False
+    db_session.commit()
+    
+    response = client.get("/auth/me", headers=headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "User account is disabled"
+
+def test_user_cache_invalidated_on_commit(client, db_session):
+    """Test a user re-cached between flush and commit, or changed by an UPDATE statement, is evicted on commit"""
+    from sqlalchemy import update
+    from app.models.user import User
+    user_data = {"username": "flushed", "email": "flushed@example.com", "password": "testpass123"}
+    client.post("/auth/register", json=user_data)
+    login_response = client.post("/auth/login", data=user_data)
+    headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+    
+    # Flushed, not committed: other requests still see (and cache) the active user
+    user = db_session.query(User).filter(User.username == user_data["username"]).first()
+    user.is_active = False
+    db_session.flush()
+    assert client.get("/auth/me", headers=headers).status_code == 200
+    db_session.commit()
+    assert client.get("/auth/me", headers=headers).status_code == 400
+    
+    # Rolled back: nothing to evict, the active snapshot stays valid
+    db_session.execute(update(User).where(User.username == user_data["username"]).values(is_active=True))
+    db_session.commit()
+    assert client.get("/auth/me", headers=headers).status_code == 200
+    db_session.execute(update(User).where(User.username == user_data["username"]).values(is_active=False))
+    db_session.rollback()
+    assert client.get("/auth/me", headers=headers).status_code == 200
+    
+    db_session.execute(update(User).where(User.username == user_data["username"]).values(is_active=False))
+    db_session.commit()
+    assert client.get("/auth/me", headers=headers).status_code == 400
+
+def test_ttl_cache_expiry_and_eviction():
+    """Test TTLCache drops expired and least recently used entries"""
+    from app.utils.ttl_cache import TTLCache
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    # "b" was least recently used
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    
+    cache.set("short", 1, ttl=-1)
+    assert cache.get("short") is None
+    assert TTLCache(maxsize=10, ttl=0).enabled is False
+
+def test_login_rehashes_old_cost(client, db_session):
+    """Test a password hashed with another bcrypt cost is upgraded on login"""
+    from passlib.hash import bcrypt
+    from app.models.user import User
+    from app.utils.auth import BCRYPT_ROUNDS
+    user_data = {"username": "rehashuser", "email": "rehash@example.com", "password": "testpass123"}
+    client.post("/auth/register", json=user_data)
+    
+    # Simulate a hash made before BCRYPT_ROUNDS changed
+    user = db_session.query(User).filter(User.username == user_data["username"]).first()
+    user.hashed_password = bcrypt.using(rounds=4).hash(user_data["password"])
+    db_session.commit()
+    
+    response = client.post("/auth/login", data={
+        "username": user_data["username"],
+        "password": user_data["password"]
+    })
+    assert response.status_code == 200
+    
+    db_session.expire_all()
+    user = db_session.query(User).filter(User.username == user_data["username"]).first()
+    assert user.hashed_password.startswith(f"$2b${BCRYPT_ROUNDS:02d}$")
+
+def test_hash_backpressure(monkeypatch):
+    """Test hashing fails fast with 503 when every slot is taken"""
+    import threading
+    from fastapi import HTTPException
+    from app.utils import auth as auth_utils
+    slots = threading.BoundedSemaphore(1)
+    slots.acquire()
+    monkeypatch.setattr(auth_utils, "_hash_slots", slots)
+    monkeypatch.setattr(auth_utils, "HASH_QUEUE_TIMEOUT", 0.01)
+    
+    with pytest.raises(HTTPException) as exc_info:
+        auth_utils.get_password_hash("testpass123")
+    assert exc_info.value.status_code == 503
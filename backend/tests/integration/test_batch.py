@@ -0,0 +1,90 @@
+from sqlalchemy import event
+from app.services.task_service import task_cache
+from tests.conftest import engine
+
+def test_batch_runs_operations_in_order(client, auth_headers, test_user, test_task, test_note):
+    """Writes run in order with the batch's auth, each operation gets its own result"""
+    response = client.post("/batch", headers=auth_headers, json={"operations": [
+        {"id": "me", "path": "/auth/me"},
+        {"id": "task", "method": "POST", "path": "/tasks/", "body": test_task},
+        {"id": "note", "method": "POST", "path": "/notes/", "body": test_note},
+        {"id": "missing", "path": "/tasks/999999"},
+        {"id": "invalid", "method": "POST", "path": "/tasks/", "body": {"priority": "urgent"}},
+        {"id": "outside", "path": "/stats"},
+    ]})
+    assert response.status_code == 200
+    results = {result["id"]: result for result in response.json()["results"]}
+    assert list(results) == ["me", "task", "note", "missing", "invalid", "outside"]
+    assert results["me"]["status"] == 200 and results["me"]["body"]["username"] == test_user["username"]
+    assert results["task"]["status"] == 200 and results["task"]["body"]["title"] == test_task["title"]
+    assert results["note"]["status"] == 200 and results["note"]["body"]["content"] == test_note["content"]
+    assert results["missing"]["status"] == 404
+    assert results["invalid"]["status"] == 422
+    assert results["outside"]["status"] == 400
+
+    # Committed, not only flushed into the shared session
+    task = client.get(f"/tasks/{results['task']['body']['id']}")
+    assert task.status_code == 200
+
+def test_batch_without_token(client, test_task):
+    """The batch is open, protected operations still answer 401"""
+    response = client.post("/batch", json={"operations": [
+        {"method": "POST", "path": "/tasks/", "body": test_task},
+        {"path": "/tasks/?limit=1"},
+    ]})
+    assert response.status_code == 200
+    statuses = [result["status"] for result in response.json()["results"]]
+    assert statuses == [401, 200]
+
+def test_batch_item_lookups_use_one_query(client, auth_headers, test_task):
+    """Concurrent GET /tasks/{id} operations are loaded with a single IN query"""
+    ids = [client.post("/tasks/", json=test_task, headers=auth_headers).json()["id"] for _ in range(3)]
+    for task_id in ids:
+        task_cache.backend.delete(task_cache._key(task_id))
+
+    statements = []
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if "FROM tasks" in statement:
+            statements.append(statement)
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        response = client.post("/batch", headers=auth_headers, json={
+            "operations": [{"id": str(task_id), "path": f"/tasks/{task_id}"} for task_id in ids]
+        })
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [result["status"] for result in results] == [200, 200, 200]
+    assert [result["body"]["id"] for result in results] == ids
+    assert all(result["headers"]["etag"] for result in results)
+    assert len(statements) == 1 and " IN " in statements[0]
+
+def test_batch_rejects_streaming_and_oversized(client):
+    response = client.post("/batch", json={"operations": [{"path": "/tasks/export"}]})
+    assert response.json()["results"][0]["status"] == 400
+
+    response = client.post("/batch", json={"operations": [{"path": "/tasks/"}] * 1000})
+    assert response.status_code == 422
+
+def test_batch_unknown_user_fails_once(client, test_task, monkeypatch):
+    """A token whose user is gone is looked up once, every operation reports the same 401"""
+    from app.api import auth as auth_api
+    from app.utils.auth import create_access_token
+    lookups = []
+    original = auth_api.AuthService.get_authenticated_user
+    monkeypatch.setattr(auth_api.AuthService, "get_authenticated_user", lambda db, username: lookups.append(username) or original(db, username))
+
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': 'ghost-user'})}"}
+    response = client.post("/batch", headers=headers, json={"operations": [
+        {"path": "/auth/me"},
+        {"path": "/tasks/mine"},
+        {"path": "/notes/mine"},
+        {"method": "POST", "path": "/tasks/", "body": test_task},
+    ]})
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [result["status"] for result in results] == [401, 401, 401, 401]
+    assert results[0]["headers"]["www-authenticate"] == "Bearer"
+    assert lookups == ["ghost-user"]
@@ -0,0 +1,81 @@
+def test_bulk_create_tasks(client, auth_headers, test_task):
+    """Test bulk insert keeps request order and reports bad rows"""
+    rows = [
+        {**test_task, "title": "Bulk 1"},
+        {**test_task, "title": ""},
+        {**test_task, "title": "Bulk 3", "priority": "high"},
+    ]
+    response = client.post("/tasks/bulk", json=rows, headers=auth_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert [task["title"] for task in data["items"]] == ["Bulk 1", "Bulk 3"]
+    assert data["items"][1]["priority"] == "high"
+    assert [error["index"] for error in data["errors"]] == [1]
+    
+    # Rows really exist
+    task_id = data["items"][0]["id"]
+    assert client.get(f"/tasks/{task_id}").json()["title"] == "Bulk 1"
+
+def test_bulk_update_and_delete_tasks(client, auth_headers, test_task):
+    """Test set-based bulk update and delete"""
+    created = client.post("/tasks/bulk", json=[{**test_task, "title": f"Bulk {i}"} for i in range(3)], headers=auth_headers).json()["items"]
+    ids = [task["id"] for task in created]
+    
+    rows = [
+        {"id": ids[0], "completed": True},
+        {"id": ids[1], "completed": True},
+        {"id": ids[2], "title": "Renamed"},
+        {"id": 999999, "completed": True},
+    ]
+    response = client.patch("/tasks/bulk", json=rows, headers=auth_headers)
+    assert response.status_code == 200
+    data = response.json()
+    updated = {task["id"]: task for task in data["items"]}
+    assert updated[ids[0]]["completed"] is True
+    assert updated[ids[2]]["title"] == "Renamed"
+    assert data["errors"] == [{"index": 3, "id": 999999, "detail": "Task not found"}]
+    
+    response = client.request("DELETE", "/tasks/bulk", json={"ids": ids + [999999]}, headers=auth_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["deleted"] == sorted(ids)
+    assert data["errors"][0]["id"] == 999999
+    assert client.get(f"/tasks/{ids[0]}").status_code == 404
+
+def test_bulk_notes(client, auth_headers, test_note):
+    """Test the note bulk endpoints"""
+    response = client.post("/notes/bulk", json=[test_note, {"title": "No content"}], headers=auth_headers)
+    data = response.json()
+    assert len(data["items"]) == 1
+    assert data["errors"][0]["index"] == 1
+    note_id = data["items"][0]["id"]
+    
+    response = client.patch("/notes/bulk", json=[{"id": note_id, "title": "Bulk note"}], headers=auth_headers)
+    assert response.json()["items"][0]["title"] == "Bulk note"
+    
+    response = client.request("DELETE", "/notes/bulk", json={"ids": [note_id]}, headers=auth_headers)
+    assert response.json() == {"deleted": [note_id], "errors": []}
+
+def test_bulk_requires_auth(client, test_task):
+    """Test bulk endpoints are protected"""
+    assert client.post("/tasks/bulk", json=[test_task]).status_code == 401
+
+def test_bulk_rolls_back_on_constraint_violation(client, auth_headers, test_task):
+    """Test a database error rolls back the whole batch"""
+    from sqlalchemy import event
+    from tests.conftest import engine
+    
+    # SQLite only enforces foreign keys when asked to
+    def enable_foreign_keys(dbapi_connection, connection_record):
+        dbapi_connection.execute("PRAGMA foreign_keys=ON")
+    event.listen(engine, "connect", enable_foreign_keys)
+    engine.dispose()
+    try:
+        before = len(client.get("/tasks/", params={"limit": 100000}).json())
+        rows = [{**test_task, "title": "Rolled back"}, {**test_task, "user_id": 999999}]
+        response = client.post("/tasks/bulk", json=rows, headers=auth_headers)
+        assert response.status_code == 409
+        assert len(client.get("/tasks/", params={"limit": 100000}).json()) == before
+    finally:
+        event.remove(engine, "connect", enable_foreign_keys)
+        engine.dispose()
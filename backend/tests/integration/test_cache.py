@@ -0,0 +1,159 @@
+import asyncio
+import threading
+import time
+import pytest
+from app.services.cache_service import CacheBackend, ItemCache, FakeCacheBackend, LocalCacheBackend, ITEM_CACHE_TOMBSTONE_TTL
+from app.services.task_service import task_cache
+from app.schemas.task_schemas import TaskResponse
+
+@pytest.fixture
+def fake_backend():
+    """Run the task cache on the fake shared backend"""
+    backend = FakeCacheBackend()
+    previous, task_cache.backend = task_cache.backend, backend
+    yield backend
+    task_cache.backend = previous
+
+def test_get_task_reads_through_cache(client, auth_headers, test_task, fake_backend):
+    """Test repeated GETs are served from the cache and writes keep it fresh"""
+    task_id = client.post("/tasks/", json=test_task, headers=auth_headers).json()["id"]
+    key = f"task:{task_id}"
+    # Create writes through
+    assert ("set_if_newer", key) in fake_backend.ops
+
+    hits = task_cache.hits
+    response = client.get(f"/tasks/{task_id}")
+    assert response.status_code == 200
+    assert response.json()["title"] == test_task["title"]
+    assert response.headers["ETag"] == '"1"'
+    assert task_cache.hits == hits + 1
+
+    # Update writes the new row through
+    client.put(f"/tasks/{task_id}", json={"title": "Cached"}, headers=auth_headers)
+    response = client.get(f"/tasks/{task_id}")
+    assert response.json()["title"] == "Cached"
+    assert response.headers["ETag"] == '"2"'
+
+    # Bulk update invalidates, the next GET reloads from the database
+    client.patch("/tasks/bulk", json=[{"id": task_id, "completed": True}], headers=auth_headers)
+    assert client.get(f"/tasks/{task_id}").json()["completed"] is True
+    assert fake_backend.ops[-1] == ("add", key)
+
+    # Delete invalidates
+    client.delete(f"/tasks/{task_id}", headers=auth_headers)
+    assert client.get(f"/tasks/{task_id}").status_code == 404
+
+def test_item_cache_ttl(client, auth_headers, test_task, fake_backend):
+    """Test entries expire after the configured TTL"""
+    task_id = client.post("/tasks/", json=test_task, headers=auth_headers).json()["id"]
+    fake_backend.advance(task_cache.ttl + 1)
+
+    misses = task_cache.misses
+    assert client.get(f"/tasks/{task_id}").status_code == 200
+    assert task_cache.misses == misses + 1
+
+def test_item_cache_single_flight():
+    """Test concurrent misses on one key run the loader once"""
+    cache = ItemCache("test", TaskResponse, ttl=60, backend=FakeCacheBackend())
+    calls = []
+    row = {"id": 1, "title": "Hot", "version": 1, "created_at": "2024-01-01T00:00:00", "updated_at": "2024-01-01T00:00:00"}
+
+    def loader():
+        calls.append(1)
+        time.sleep(0.1)
+        return row
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_load(1, loader))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert [task.title for task in results] == ["Hot"] * 8
+    assert cache.coalesced == 7
+
+def test_item_cache_single_flight_async():
+    """Test the async path coalesces concurrent misses too"""
+    cache = ItemCache("test", TaskResponse, ttl=60, backend=FakeCacheBackend())
+    calls = []
+    row = {"id": 1, "title": "Hot", "version": 1, "created_at": "2024-01-01T00:00:00", "updated_at": "2024-01-01T00:00:00"}
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return row
+
+    async def run():
+        return await asyncio.gather(*(cache.aget_or_load(1, loader) for _ in range(8)))
+
+    results = asyncio.run(run())
+    assert len(calls) == 1
+    assert all(task.title == "Hot" for task in results)
+
+def test_item_cache_loader_does_not_overwrite_writes():
+    """Test a slow loader never replaces a value written through meanwhile"""
+    backend = FakeCacheBackend()
+    cache = ItemCache("test", TaskResponse, ttl=60, backend=backend)
+    stale = {"id": 1, "title": "Old", "version": 1, "created_at": "2024-01-01T00:00:00", "updated_at": "2024-01-01T00:00:00"}
+    fresh = TaskResponse.model_validate({**stale, "title": "New", "version": 2})
+
+    def loader():
+        cache.store(fresh)
+        return stale
+
+    cache.get_or_load(1, loader)
+    assert cache.get_or_load(1, loader).title == "New"
+
+def test_item_cache_store_keeps_newest_version():
+    """Test a write-through that lost a race to a newer update doesn't replace it"""
+    cache = ItemCache("test", TaskResponse, ttl=60, backend=FakeCacheBackend())
+    row = {"id": 1, "title": "v1", "version": 1, "created_at": "2024-01-01T00:00:00", "updated_at": "2024-01-01T00:00:00"}
+    newer, older = TaskResponse.model_validate({**row, "title": "v3", "version": 3}), TaskResponse.model_validate({**row, "title": "v2", "version": 2})
+
+    cache.store(newer)
+    cache.store(older)
+    assert cache.get_or_load(1, lambda: None).title == "v3"
+
+    # Nor does it bring an invalidated item back
+    cache.invalidate(1)
+    cache.store(TaskResponse.model_validate({**row, "title": "v4", "version": 4}))
+    assert cache.missing([1]) == [1]
+
+def test_local_backend_keeps_newest_version():
+    """Test the in-process backend applies the same version check"""
+    backend = LocalCacheBackend()
+    row = {"id": 1, "title": "v2", "version": 2, "created_at": "2024-01-01T00:00:00", "updated_at": "2024-01-01T00:00:00"}
+    assert backend.set_if_newer("k", TaskResponse.model_validate(row), 60)
+    assert not backend.set_if_newer("k", TaskResponse.model_validate({**row, "title": "v1", "version": 1}), 60)
+    assert backend.set_if_newer("k", TaskResponse.model_validate({**row, "title": "v3", "version": 3}), 60)
+    assert backend.get("k", TaskResponse).title == "v3"
+
+def test_cache_backend_requires_every_method():
+    """Test an incomplete backend fails when built, not on its first miss"""
+    class PartialBackend(CacheBackend):
+        def get(self, key, schema):
+            return None
+
+    with pytest.raises(TypeError):
+        PartialBackend()
+
+def test_item_cache_invalidate_beats_slow_loader():
+    """Test a row read before a concurrent delete isn't cached after it"""
+    backend = FakeCacheBackend()
+    cache = ItemCache("test", TaskResponse, ttl=60, backend=backend)
+    row = {"id": 1, "title": "Deleted", "version": 1, "created_at": "2024-01-01T00:00:00", "updated_at": "2024-01-01T00:00:00"}
+
+    def loader():
+        # The row was read, then a DELETE commits before the loader publishes it
+        cache.invalidate(1)
+        return row
+
+    assert cache.get_or_load(1, loader).title == "Deleted"
+    assert cache.get_or_load(1, lambda: None) is None
+
+    # Once the tombstone expires the key is cacheable again
+    backend.advance(ITEM_CACHE_TOMBSTONE_TTL + 1)
+    assert cache.get_or_load(1, lambda: row).title == "Deleted"
+    assert backend.ops[-1] == ("add", "test:1") and cache.missing([1]) == []
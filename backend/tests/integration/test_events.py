@@ -0,0 +1,74 @@
+import asyncio
+import json
+import threading
+import time
+from app.services.event_service import broadcaster
+
+def parse_events(body: str):
+    """(event, id, data) of every SSE message with data"""
+    events = []
+    for block in body.split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if not line.startswith(":") and ": " in line)
+        if "data" in fields:
+            events.append((fields.get("event"), fields.get("id"), json.loads(fields["data"])))
+    return events
+
+def test_events_stream_and_resume(client, auth_headers, test_task, test_note, monkeypatch):
+    """Test committed writes reach open streams, filtered by owner, and resume from Last-Event-ID"""
+    monkeypatch.setattr("app.api.events.EVENTS_MAX_DURATION", 1.0)
+    user_id = client.get("/auth/me", headers=auth_headers).json()["id"]
+    responses = {}
+
+    def listen(name, **params):
+        responses[name] = client.get("/events", params=params)
+
+    subscribers = broadcaster.stats()["subscribers"]
+    listeners = [
+        threading.Thread(target=listen, args=("all",)),
+        threading.Thread(target=listen, args=("mine",), kwargs={"user_id": user_id, "resource": "task"}),
+    ]
+    for listener in listeners:
+        listener.start()
+    while broadcaster.stats()["subscribers"] < subscribers + 2:
+        time.sleep(0.01)
+
+    task = client.post("/tasks/", json={**test_task, "user_id": user_id}, headers=auth_headers).json()
+    client.put(f"/tasks/{task['id']}", json={"completed": True}, headers=auth_headers)
+    other = client.post("/tasks/", json=test_task, headers=auth_headers).json()
+    client.post("/notes/", json=test_note, headers=auth_headers)
+    client.request("DELETE", "/tasks/bulk", json={"ids": [task["id"]]}, headers=auth_headers)
+    for listener in listeners:
+        listener.join()
+
+    assert responses["all"].headers["content-type"].startswith("text/event-stream")
+    events = parse_events(responses["all"].text)
+    assert [name for name, _, _ in events] == ["task.created", "task.updated", "task.created", "note.created", "task.deleted"]
+    assert events[1][2] == {"id": events[1][1], "resource": "task", "action": "updated", "item_id": task["id"], "user_id": user_id, "version": 2}
+    assert events[2][2]["item_id"] == other["id"]
+
+    # Only the user's own task events
+    mine = parse_events(responses["mine"].text)
+    assert [(name, data["item_id"]) for name, _, data in mine] == [
+        ("task.created", task["id"]), ("task.updated", task["id"]), ("task.deleted", task["id"])
+    ]
+
+    # Resume after the first event replays the rest from the backlog
+    monkeypatch.setattr("app.api.events.EVENTS_MAX_DURATION", 0.1)
+    resumed = parse_events(client.get("/events", headers={"Last-Event-ID": events[0][1]}).text)
+    assert [event_id for _, event_id, _ in resumed] == [event_id for _, event_id, _ in events[1:]]
+
+    # An id that is no longer in the backlog asks the client to refetch
+    assert parse_events(client.get("/events", params={"since": "gone-1"}).text)[0][0] == "reset"
+    assert broadcaster.stats()["subscribers"] == subscribers
+
+def test_events_unstarted_stream_keeps_no_subscription():
+    """A response dropped before its body starts (client gone) must not leave a subscriber behind"""
+    from app.api.events import stream_events
+
+    async def drop_response():
+        response = await stream_events(resource=None, user_id=None, since=None, last_event_id=None)
+        await response.body_iterator.aclose()
+
+    before = broadcaster.stats()["subscribers"]
+    asyncio.run(drop_response())
+    assert broadcaster.stats()["subscribers"] == before
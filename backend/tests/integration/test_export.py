@@ -0,0 +1,38 @@
+import csv
+import io
+import json
+
+def test_export_tasks_ndjson(client, auth_headers, test_task, monkeypatch):
+    """Test NDJSON export streams every matching task across several cursor batches"""
+    monkeypatch.setattr("app.services.task_service.EXPORT_BATCH_SIZE", 2)
+    user_id = client.get("/auth/me", headers=auth_headers).json()["id"]
+    rows = [{**test_task, "title": f"Export {i}", "user_id": user_id, "completed": i % 2 == 0} for i in range(5)]
+    created = client.post("/tasks/bulk", json=rows, headers=auth_headers).json()["items"]
+
+    response = client.get("/tasks/export", params={"user_id": user_id, "completed": True}, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert response.headers["content-disposition"] == 'attachment; filename="tasks.ndjson"'
+    exported = [json.loads(line) for line in response.text.splitlines()]
+    assert [task["title"] for task in exported] == ["Export 0", "Export 2", "Export 4"]
+    assert exported[0] == next(task for task in created if task["title"] == "Export 0")
+
+    # Date range: nothing was created in the future
+    response = client.get("/tasks/export", params={"user_id": user_id, "created_from": "2999-01-01T00:00:00"}, headers=auth_headers)
+    assert response.text == ""
+
+    # Requires authentication
+    assert client.get("/tasks/export").status_code == 401
+
+def test_export_notes_csv(client, auth_headers, test_note):
+    """Test CSV export has a header row and one row per note"""
+    note = client.post("/notes/", json={**test_note, "title": "Comma, \"quoted\""}, headers=auth_headers).json()
+
+    response = client.get("/notes/export", params={"format": "csv"}, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert list(rows[0]) == ["title", "content", "user_id", "id", "version", "created_at", "updated_at"]
+    exported = next(row for row in rows if row["id"] == str(note["id"]))
+    assert exported["title"] == 'Comma, "quoted"'
+    assert exported["user_id"] == ""
@@ -0,0 +1,80 @@
+import json
+
+def chunked(body: bytes, size: int):
+    """Stream a body in small pieces, splitting lines and multi-byte characters"""
+    for start in range(0, len(body), size):
+        yield body[start:start + size]
+
+def test_import_tasks_ndjson(client, auth_headers, monkeypatch):
+    """Test a streamed NDJSON import loads good rows in chunks and reports bad ones"""
+    monkeypatch.setattr("app.services.import_service.IMPORT_CHUNK_SIZE", 2)
+    lines = [json.dumps({"title": f"Imported ✓ {i}", "priority": "low"}) for i in range(5)]
+    lines[1] = "{not json"
+    lines[3] = json.dumps({"title": ""})
+    lines.append(json.dumps({"title": "Orphan", "user_id": 999999}))
+    body = ("\n".join(lines) + "\n").encode()
+
+    response = client.post(
+        "/tasks/import", params={"import_id": "ndjson-test"},
+        content=chunked(body, 7), headers=auth_headers
+    )
+    assert response.status_code == 200
+    summary = response.json()
+    assert summary["processed"] == 6
+    assert summary["imported"] == 3
+    assert summary["rejected"] == 3
+    assert summary["done"] is True
+    assert [error["index"] for error in sorted(summary["errors"], key=lambda error: error["index"])] == [1, 3, 5]
+
+    # Progress stays available after the upload
+    assert client.get("/tasks/import/ndjson-test", headers=auth_headers).json() == summary
+    assert client.get("/tasks/import/unknown", headers=auth_headers).status_code == 404
+
+    titles = {task["title"] for task in client.get("/tasks/", params={"limit": 100000}).json()}
+    assert {"Imported ✓ 0", "Imported ✓ 2", "Imported ✓ 4"} <= titles
+    assert "Orphan" not in titles
+
+    # Requires authentication
+    assert client.post("/tasks/import", content=body).status_code == 401
+
+def test_import_progress_is_per_user(client, auth_headers):
+    """Test import progress is only visible to its owner and a running import_id can't be taken over"""
+    from app.services.import_service import ImportService
+    body = (json.dumps({"title": "Mine"}) + "\n").encode()
+    assert client.post("/tasks/import", params={"import_id": "shared-id"}, content=body, headers=auth_headers).status_code == 200
+    
+    client.post("/auth/register", json={"username": "importer2", "email": "importer2@example.com", "password": "testpass123"})
+    token = client.post("/auth/login", data={"username": "importer2", "password": "testpass123"}).json()["access_token"]
+    other_headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/tasks/import/shared-id", headers=other_headers).status_code == 404
+    
+    # The other user's import with the same id is their own, and doesn't replace the first one
+    assert client.post("/notes/import", params={"import_id": "shared-id"}, content=body, headers=other_headers).status_code == 200
+    assert client.get("/tasks/import/shared-id", headers=auth_headers).json()["imported"] == 1
+    
+    # A finished import's id can be reused, a running one can't
+    other_id = client.get("/auth/me", headers=other_headers).json()["id"]
+    ImportService.start(other_id, "running-id")
+    response = client.post("/notes/import", params={"import_id": "running-id"}, content=body, headers=other_headers)
+    assert response.status_code == 409
+    assert client.post("/notes/import", params={"import_id": "shared-id"}, content=body, headers=other_headers).status_code == 200
+
+def test_import_notes_csv(client, auth_headers):
+    """Test CSV import with quoted multi-line cells and the export's layout"""
+    body = (
+        'title,content,user_id\r\n'
+        'Plain,Hello,\r\n'
+        '"Quoted, title","Line one\r\nLine ""two""",\r\n'
+        'Broken\r\n'
+    ).encode()
+
+    response = client.post("/notes/import", params={"format": "csv"}, content=chunked(body, 5), headers=auth_headers)
+    assert response.status_code == 200
+    summary = response.json()
+    assert (summary["imported"], summary["rejected"]) == (2, 1)
+    assert summary["errors"][0]["index"] == 2
+
+    notes = client.get("/notes/", params={"limit": 100000}).json()
+    quoted = next(note for note in notes if note["title"] == "Quoted, title")
+    assert quoted["content"] == 'Line one\r\nLine "two"'
+    assert quoted["user_id"] is None
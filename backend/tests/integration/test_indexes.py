@@ -0,0 +1,49 @@
+import pytest
+from sqlalchemy import text
+from app.services.task_service import TaskService, TASK_RESPONSE_COLUMNS
+from app.schemas.task_schemas import TaskListQuery
+from app.models.task_model import PriorityEnum
+from app.services.note_service import NoteService
+
+def explain(db, query):
+    """Return the SQLite query plan details for an ORM query or a select()"""
+    sql = getattr(query, "statement", query).compile(dialect=db.bind.dialect, compile_kwargs={"literal_binds": True})
+    rows = db.execute(text(f"EXPLAIN QUERY PLAN {sql}")).fetchall()
+    return " ".join(row[-1] for row in rows)
+
+def test_user_tasks_use_owner_index(db_session):
+    """Test that owner-scoped task listing is an index scan"""
+    plan = explain(db_session, TaskService._user_tasks_query(db_session, 1, None))
+    assert "USING INDEX ix_tasks_user_id_completed_due_date" in plan
+
+def test_open_user_tasks_use_index(db_session):
+    """Test that listing open tasks for a user avoids a table scan"""
+    plan = explain(db_session, TaskService._user_tasks_query(db_session, 1, False))
+    assert "USING INDEX ix_tasks_user_id_completed_due_date (user_id=? AND completed=?)" in plan
+    assert "SCAN tasks" not in plan
+
+def test_completed_tasks_use_index_in_order(db_session):
+    """Test GET /tasks/?completed= reads one side of an index in the default order, without a sort step"""
+    for completed in (True, False):
+        plan = explain(db_session, TaskService.list_stmt(TASK_RESPONSE_COLUMNS, 0, 100, TaskListQuery(completed=completed)))
+        assert "USING INDEX ix_tasks_completed_id (completed=?)" in plan
+        assert "TEMP B-TREE" not in plan
+
+def test_user_notes_use_owner_index(db_session):
+    """Test that owner-scoped note listing is an index scan"""
+    plan = explain(db_session, NoteService._user_notes_query(db_session, 1))
+    assert "USING INDEX ix_notes_user_id_created_at" in plan
+
+def test_task_queue_reads_index_in_order(db_session):
+    """Test each work-queue bucket is a range of the partial index, without a sort step"""
+    for dated in (True, False):
+        plan = explain(db_session, TaskService._queue_stmt(PriorityEnum.high, dated, 20))
+        assert "USING INDEX ix_tasks_queue" in plan
+        assert "TEMP B-TREE" not in plan
+
+def test_user_task_queue_reads_user_index_in_order(db_session):
+    """Test a per-user queue bucket is a range of that user's open tasks, without a sort step"""
+    for dated in (True, False):
+        plan = explain(db_session, TaskService._queue_stmt(PriorityEnum.high, dated, 20, user_id=1))
+        assert "USING INDEX ix_tasks_queue_user" in plan
+        assert "TEMP B-TREE" not in plan
@@ -0,0 +1,49 @@
+import re
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from app.utils.request_metrics import RequestTimings, current_timings
+
+def test_server_timing_header(client):
+    """Test every response reports database, handler and serialization time"""
+    response = client.get("/tasks/", params={"limit": 5})
+    assert response.status_code == 200
+    timing = response.headers["server-timing"]
+    assert re.search(r'db;dur=[\d.]+;desc="[1-9]\d* queries"', timing)
+    for metric in ("handler", "serialize", "total"):
+        assert re.search(rf"{metric};dur=[\d.]+", timing)
+
+def test_metrics_endpoint(client):
+    """Test /metrics exposes per-route counters and histograms in the Prometheus format"""
+    client.get("/stats")
+    client.get("/tasks/999999")
+
+    body = client.get("/metrics").text
+    assert 'http_requests_total{method="GET",route="/stats",status="200"}' in body
+    # Route templates, not raw paths
+    assert 'http_requests_total{method="GET",route="/tasks/{task_id}",status="404"}' in body
+    assert 'http_request_queries_bucket{method="GET",route="/stats",le="+Inf"}' in body
+    assert "# TYPE http_request_db_seconds histogram" in body
+
+def test_query_count_limit(client, monkeypatch):
+    """Test requests over QUERY_COUNT_LIMIT are counted as likely N+1s"""
+    monkeypatch.setattr("app.utils.request_metrics.QUERY_COUNT_LIMIT", 0)
+    client.get("/search", params={"q": "report"})
+
+    body = client.get("/metrics").text
+    assert re.search(r'http_requests_query_limit_exceeded_total\{method="GET",route="/search"\} [1-9]', body)
+
+def test_failed_query_keeps_timer_balanced(db_session):
+    """Test a statement that raises doesn't leave its start time on the pooled connection"""
+    timings = RequestTimings()
+    reset = current_timings.set(timings)
+    try:
+        with pytest.raises(OperationalError):
+            db_session.execute(text("SELECT * FROM no_such_table"))
+        assert db_session.connection().info.get("query_start") == []
+        db_session.rollback()
+        db_session.execute(text("SELECT 1"))
+        assert db_session.connection().info.get("query_start") == []
+    finally:
+        current_timings.reset(reset)
+    assert timings.queries == 2
@@ -0,0 +1,68 @@
+import os
+import sqlite3
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def alembic(database, *args):
+    """Run the alembic CLI against a SQLite file, like a deployment does"""
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{database}"}
+    subprocess.run([sys.executable, "-m", "alembic", *args], cwd=BACKEND_DIR, env=env, check=True, capture_output=True)
+
+# The migrations' server defaults are Postgres functions (now()), rows here spell out their timestamps
+STAMPS = "'2026-01-01 00:00:00', '2026-01-01 00:00:00'"
+
+def test_migrated_sqlite_keeps_stats_counters(tmp_path):
+    """Test a database built by alembic counts existing and new rows like one built by create_all"""
+    database = str(tmp_path / "migrated.db")
+    alembic(database, "upgrade", "e2b9d4c6a871")
+    with sqlite3.connect(database) as connection:
+        connection.execute(f"INSERT INTO users (id, username, email, hashed_password, is_active, created_at, updated_at) VALUES (1, 'u', 'u@example.com', 'x', 1, {STAMPS})")
+        connection.execute(f"INSERT INTO tasks (title, completed, priority, due_date, user_id, created_at, updated_at) VALUES ('a', 0, 'high', '2026-01-01 10:00:00', 1, {STAMPS})")
+        connection.execute(f"INSERT INTO notes (title, content, user_id, created_at, updated_at) VALUES ('n', 'c', NULL, {STAMPS})")
+
+    alembic(database, "upgrade", "head")
+    with sqlite3.connect(database) as connection:
+        connection.execute(f"INSERT INTO tasks (title, completed, priority, user_id, created_at, updated_at) VALUES ('b', 1, 'low', 1, {STAMPS})")
+        counters = {row[0]: row[1:] for row in connection.execute(
+            "SELECT scope, tasks_total, tasks_completed, tasks_low, tasks_high, notes_total FROM stat_counters"
+        )}
+        due = connection.execute("SELECT scope, due_day, open_count FROM task_due_counters ORDER BY scope").fetchall()
+    assert counters == {0: (2, 1, 1, 1, 1), 1: (2, 1, 1, 1, 0)}
+    assert due == [(0, "2026-01-01", 1), (1, "2026-01-01", 1)]
+
+    alembic(database, "downgrade", "e2b9d4c6a871")
+    with sqlite3.connect(database) as connection:
+        triggers = [row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")]
+        connection.execute("DELETE FROM tasks")
+    assert not [name for name in triggers if "_stats_" in name]
+
+def test_migrated_sqlite_has_the_model_triggers(tmp_path):
+    """Test alembic creates every trigger create_all does, so deletes reach the sync tombstones"""
+    from sqlalchemy import create_engine
+    from app.db import Base
+
+    built = tmp_path / "create_all.db"
+    engine = create_engine(f"sqlite:///{built}")
+    Base.metadata.create_all(engine)
+    engine.dispose()
+    database = str(tmp_path / "migrated.db")
+    alembic(database, "upgrade", "head")
+
+    def triggers(path):
+        with sqlite3.connect(path) as connection:
+            return {row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")}
+    assert triggers(database) == triggers(str(built))
+
+    with sqlite3.connect(database) as connection:
+        connection.execute(f"INSERT INTO notes (id, title, content, user_id, created_at, updated_at) VALUES (7, 'n', 'c', NULL, {STAMPS})")
+        connection.execute("DELETE FROM notes WHERE id = 7")
+        tombstones = connection.execute("SELECT resource, item_id FROM tombstones").fetchall()
+    assert tombstones == [("note", 7)]
+
+def test_migrated_sqlite_matches_models(tmp_path):
+    """Test autogenerate finds nothing to change after the migrations, FTS5 tables included"""
+    database = str(tmp_path / "migrated.db")
+    alembic(database, "upgrade", "head")
+    alembic(database, "check")
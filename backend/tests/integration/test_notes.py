@@ -101,4 +101,106 @@ def test_delete_note(client, test_user, test_note):
     
     # Verify note is deleted
     get_response = client.get(f"/notes/{note_id}")
-    assert get_response.status_code == 404
\ No newline at end of file
+    assert get_response.status_code == 404
+
+def test_get_notes_keyset_pages(client, test_user, test_note):
+    """Test walking notes with cursor pagination"""
+    # Setup: register, login, create a few notes
+    client.post("/auth/register", json=test_user)
+    login_response = client.post("/auth/login", data={
+        "username": test_user["username"],
+        "password": test_user["password"]
+    })
+    token = login_response.json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    for i in range(3):
+        client.post("/notes/", json={**test_note, "title": f"Paged Note {i}"}, headers=headers)
+    
+    # Walk all pages two rows at a time
+    seen_ids = []
+    cursor = None
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/notes/page", params=params)
+        assert response.status_code == 200
+        data = response.json()
+        seen_ids.extend(item["id"] for item in data["items"])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+    
+    # Every note shows up exactly once
+    all_notes = client.get("/notes/").json()
+    assert len(seen_ids) == len(set(seen_ids))
+    assert sorted(seen_ids) == sorted(note["id"] for note in all_notes)
+
+def test_update_note_if_match(client, test_user, test_note):
+    """Test optimistic concurrency with If-Match"""
+    client.post("/auth/register", json=test_user)
+    login_response = client.post("/auth/login", data={
+        "username": test_user["username"],
+        "password": test_user["password"]
+    })
+    token = login_response.json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    
+    note_id = client.post("/notes/", json=test_note, headers=headers).json()["id"]
+    
+    response = client.put(f"/notes/{note_id}", json={"title": "First"}, headers={**headers, "If-Match": '"1"'})
+    assert response.status_code == 200
+    response = client.put(f"/notes/{note_id}", json={"title": "Second"}, headers={**headers, "If-Match": '"1"'})
+    assert response.status_code == 412
+    response = client.put(f"/notes/{note_id}", json={"title": "Second"}, headers={**headers, "If-Match": "garbage"})
+    assert response.status_code == 400
+
+def test_get_notes_conditional(client, test_user, test_note):
+    """Test ETag / If-None-Match revalidation of list and item routes"""
+    client.post("/auth/register", json=test_user)
+    login_response = client.post("/auth/login", data={
+        "username": test_user["username"],
+        "password": test_user["password"]
+    })
+    token = login_response.json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    note_id = client.post("/notes/", json=test_note, headers=headers).json()["id"]
+    
+    list_etag = client.get("/notes/", params={"limit": 100000}).headers["ETag"]
+    response = client.get("/notes/", params={"limit": 100000}, headers={"If-None-Match": list_etag})
+    assert response.status_code == 304
+    
+    item_etag = client.get(f"/notes/{note_id}").headers["ETag"]
+    response = client.get(f"/notes/{note_id}", headers={"If-None-Match": item_etag})
+    assert response.status_code == 304
+    
+    client.delete(f"/notes/{note_id}", headers=headers)
+    response = client.get("/notes/", params={"limit": 100000}, headers={"If-None-Match": list_etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != list_etag
+
+def test_get_notes_sparse_fields(client, test_user, test_note):
+    """Test fields= returns only the chosen columns and preview_chars truncates content in SQL"""
+    client.post("/auth/register", json=test_user)
+    login_response = client.post("/auth/login", data={
+        "username": test_user["username"],
+        "password": test_user["password"]
+    })
+    headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+    note_id = client.post("/notes/", json={**test_note, "content": "x" * 5000}, headers=headers).json()["id"]
+    
+    response = client.get("/notes/", params={"limit": 100000, "fields": "id,title,updated_at"})
+    assert response.status_code == 200
+    note = next(note for note in response.json() if note["id"] == note_id)
+    assert set(note) == {"id", "title", "updated_at"}
+    assert response.headers["ETag"] != client.get("/notes/", params={"limit": 100000}).headers["ETag"]
+    
+    response = client.get("/notes/", params={"limit": 100000, "fields": "id,content", "preview_chars": 40})
+    note = next(note for note in response.json() if note["id"] == note_id)
+    assert note == {"id": note_id, "content": "x" * 40}
+    
+    # Full rows without fields; unknown fields are rejected
+    assert len(next(note for note in client.get("/notes/", params={"limit": 100000}).json() if note["id"] == note_id)["content"]) == 5000
+    response = client.get("/notes/", params={"fields": "id,secret"})
+    assert response.status_code == 400
+    assert "secret" in response.json()["detail"]
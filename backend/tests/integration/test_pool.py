@@ -0,0 +1,46 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from app.db import get_pool_options
+from app.utils.db_metrics import PoolStats, TimedQueuePool
+
+def test_db_health_check(client):
+    """Test database health endpoint reports pool statistics"""
+    response = client.get("/health/db")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "healthy"
+    assert "checkouts" in data["pool"]
+    assert "+Inf" in data["pool"]["wait_seconds"]["buckets"]
+
+def test_pool_options_for_postgres():
+    """Test pool settings are applied to server databases"""
+    options = get_pool_options("postgresql://u:p@db/x")
+    assert options["poolclass"] is TimedQueuePool
+    assert set(options) >= {"pool_size", "max_overflow", "pool_timeout", "pool_recycle", "pool_pre_ping"}
+
+def test_pool_stats_track_checkouts_and_timeouts(tmp_path):
+    """Test pool events and wait timing feed the statistics"""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=TimedQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.05
+    )
+    stats = PoolStats()
+    stats.attach(engine)
+    
+    conn = engine.connect()
+    snapshot = stats.snapshot(engine.pool)
+    assert snapshot["checked_out"] == 1
+    assert snapshot["checkouts"] == 1
+    assert snapshot["wait_seconds"]["count"] == 1
+    
+    # Pool is exhausted, the next checkout times out
+    with pytest.raises(PoolTimeoutError):
+        engine.connect()
+    assert stats.snapshot(engine.pool)["timeouts"] == 1
+    
+    conn.close()
+    snapshot = stats.snapshot(engine.pool)
+    assert snapshot["checked_out"] == 0
+    assert snapshot["checkins"] == 1
+    engine.dispose()
@@ -0,0 +1,62 @@
+import threading
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.api import tasks, admin
+from app.db import get_db, get_read_db
+from app.utils.profiling import ProfilingMiddleware
+from tests.conftest import override_get_db
+
+TOKEN = "profiling-test-token"
+
+@pytest.fixture
+def profiling_client(client, monkeypatch):
+    """Test client for an app with profiling enabled, as main.py does with PROFILING_ENABLED=true"""
+    monkeypatch.setattr("app.utils.profiling.PROFILING_TOKEN", TOKEN)
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware)
+    app.include_router(tasks.router, prefix="/tasks")
+    app.include_router(admin.router, prefix="/admin")
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+def busy_loop_for_profile(stop: threading.Event):
+    while not stop.is_set():
+        sum(range(1000))
+
+def test_profile_single_request(profiling_client, client):
+    """Test a request sent with the token returns its profile instead of its body"""
+    response = profiling_client.get("/tasks/", params={"limit": 5}, headers={"X-Profiling-Token": TOKEN})
+    assert response.status_code == 200
+    assert response.headers["x-profiled-status"] == "200"
+    assert response.text.startswith("Profile: ")
+
+    # Without the header requests are served as usual; a wrong token is refused
+    assert isinstance(profiling_client.get("/tasks/", params={"limit": 5}).json(), list)
+    assert profiling_client.get("/tasks/", headers={"X-Profiling-Token": "wrong"}).status_code == 403
+
+    # Disabled by default: the main app has no profiling surface
+    assert client.get("/admin/profile", headers={"X-Profiling-Token": TOKEN}).status_code == 404
+
+def test_sample_process(profiling_client):
+    """Test process sampling returns collapsed stacks covering every busy thread"""
+    stop = threading.Event()
+    worker = threading.Thread(target=busy_loop_for_profile, args=(stop,))
+    worker.start()
+    try:
+        response = profiling_client.get("/admin/profile", params={"seconds": 0.2, "interval": 0.001}, headers={"X-Profiling-Token": TOKEN})
+    finally:
+        stop.set()
+        worker.join()
+
+    assert response.status_code == 200
+    assert int(response.headers["x-profile-samples"]) > 0
+    lines = response.text.splitlines()
+    assert any("busy_loop_for_profile (test_profiling.py:" in line for line in lines)
+    stack, count = lines[0].rsplit(" ", 1)
+    assert ";" in stack and int(count) > 0
+
+    assert profiling_client.get("/admin/profile", params={"seconds": 0.1}).status_code == 403
@@ -0,0 +1,87 @@
+import os
+import time
+import pytest
+from fastapi import Request
+from sqlalchemy import create_engine, insert
+from main import app
+from app.db import Base, get_db, get_read_db
+from app.models.task_model import Task
+from app.services.count_service import count_cache
+from app.services.task_service import task_cache
+from app.utils.replicas import ReplicaRouter
+from tests.conftest import TestingSessionLocal, override_get_db
+
+# A second SQLite file stands in for the replica; it is never written by the app, so it "lags" forever
+REPLICA_DATABASE_URL = "sqlite:///./test_replica.db"
+
+@pytest.fixture
+def replica_engine():
+    engine = create_engine(REPLICA_DATABASE_URL, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+    os.remove("test_replica.db")
+
+def use_router(monkeypatch, router):
+    """Route the app's reads through router, with writes marking stickiness as app.db.get_db does"""
+    def get_db_marking(request: Request):
+        router.mark_write(request)
+        yield from override_get_db()
+
+    monkeypatch.setattr("app.db.read_router", router)
+    monkeypatch.setitem(app.dependency_overrides, get_db, get_db_marking)
+    monkeypatch.delitem(app.dependency_overrides, get_read_db)
+
+def listed(client, **kwargs):
+    return {task["id"] for task in client.get("/tasks/", params={"limit": 100000}, **kwargs).json()}
+
+def test_reads_use_replica_after_sticky_window(client, auth_headers, test_task, replica_engine, monkeypatch):
+    """Test reads go to the replica, except for a client that just wrote"""
+    router = ReplicaRouter(TestingSessionLocal, [replica_engine], sticky_seconds=0.3)
+    use_router(monkeypatch, router)
+
+    task_id = client.post("/tasks/", json=test_task, headers=auth_headers).json()["id"]
+    # The writer reads its own write from the primary; other clients read the (stale) replica
+    assert task_id in listed(client, headers=auth_headers)
+    assert listed(client) == set()
+    time.sleep(0.4)
+    assert task_id not in listed(client, headers=auth_headers)
+    assert router.stats()["replicas"][0]["reads"] == 2
+
+    # Rows read from a replica are served but never cached
+    with replica_engine.begin() as connection:
+        connection.execute(insert(Task), {"id": 999999, "title": "Replica only", "priority": "low", "completed": False})
+    assert client.get("/tasks/999999").json()["title"] == "Replica only"
+    assert task_cache.backend.get(task_cache._key(999999), task_cache.schema) is None
+
+def test_fallback_to_primary(client, auth_headers, test_task, replica_engine, monkeypatch):
+    """Test lagging or unreachable replicas are skipped"""
+    task_id = client.post("/tasks/", json=test_task, headers=auth_headers).json()["id"]
+
+    monkeypatch.setattr(ReplicaRouter, "measure_lag", staticmethod(lambda engine: 60.0))
+    router = ReplicaRouter(TestingSessionLocal, [replica_engine])
+    use_router(monkeypatch, router)
+    assert task_id in listed(client)
+    assert router.stats()["replicas"][0]["healthy"] is False
+    monkeypatch.undo()
+
+    down = create_engine("sqlite:///./missing-dir/replica.db")
+    router = ReplicaRouter(TestingSessionLocal, [down])
+    use_router(monkeypatch, router)
+    assert task_id in listed(client)
+    assert router.stats()["replicas"][0]["failures"] == 1
+    assert router.stats()["primary_reads"] == 1
+
+def test_replica_totals_not_served_to_primary_reads(client, auth_headers, test_task, replica_engine, monkeypatch):
+    """Test a total counted on a lagging replica never reaches a client reading the primary"""
+    router = ReplicaRouter(TestingSessionLocal, [replica_engine], sticky_seconds=60)
+    use_router(monkeypatch, router)
+
+    client.post("/tasks/", json=test_task, headers=auth_headers)
+    count_cache.clear()
+    # Another client counts on the (empty) replica first
+    assert client.get("/tasks/", params={"limit": 1}).headers["X-Total-Count"] == "0"
+
+    # The writer is sticky: its total comes from the primary, not the cached replica count
+    primary_total = client.get("/tasks/", params={"limit": 1}, headers=auth_headers).headers["X-Total-Count"]
+    assert int(primary_total) > 0
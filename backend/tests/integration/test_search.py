@@ -0,0 +1,43 @@
+def test_search_tasks_and_notes(client, auth_headers):
+    """Test search finds tasks and notes with highlighted snippets"""
+    task_id = client.post("/tasks/", json={"title": "Book zanzibar flights", "description": "Window seat"}, headers=auth_headers).json()["id"]
+    note_id = client.post("/notes/", json={"title": "Trip", "content": "Packing list for zanzibar: sunscreen"}, headers=auth_headers).json()["id"]
+    
+    response = client.get("/search", params={"q": "zanzibar"})
+    assert response.status_code == 200
+    results = response.json()["results"]
+    found = {(hit["type"], hit["id"]) for hit in results}
+    assert ("task", task_id) in found
+    assert ("note", note_id) in found
+    note_hit = next(hit for hit in results if hit["type"] == "note")
+    assert "<mark>zanzibar</mark>" in note_hit["snippet"]
+    
+    # Filter by type and prefix matching
+    results = client.get("/search", params={"q": "zanzi", "type": "task"}).json()["results"]
+    assert [hit["id"] for hit in results] == [task_id]
+
+def test_search_snippet_escapes_html(client, auth_headers):
+    """Test snippets escape the stored text and only add the <mark> tags"""
+    client.post("/notes/", json={"title": "Xss", "content": "<img src=x onerror=alert(1)> wombat & co"}, headers=auth_headers)
+    
+    hit = client.get("/search", params={"q": "wombat"}).json()["results"][0]
+    assert "<img" not in hit["snippet"]
+    assert "&lt;img src=x onerror=alert(1)&gt; <mark>wombat</mark> &amp; co" in hit["snippet"]
+
+def test_search_index_follows_writes(client, auth_headers):
+    """Test updates and deletes are reflected in the search index"""
+    note_id = client.post("/notes/", json={"title": "Ideas", "content": "quokka photos"}, headers=auth_headers).json()["id"]
+    assert len(client.get("/search", params={"q": "quokka"}).json()["results"]) == 1
+    
+    client.put(f"/notes/{note_id}", json={"content": "kangaroo photos"}, headers=auth_headers)
+    assert client.get("/search", params={"q": "quokka"}).json()["results"] == []
+    assert len(client.get("/search", params={"q": "kangaroo"}).json()["results"]) == 1
+    
+    client.delete(f"/notes/{note_id}", headers=auth_headers)
+    assert client.get("/search", params={"q": "kangaroo"}).json()["results"] == []
+
+def test_search_handles_query_syntax(client):
+    """Test user input can't break the FTS query"""
+    response = client.get("/search", params={"q": 'foo" OR (bar* NEAR'})
+    assert response.status_code == 200
+    assert client.get("/search", params={"q": ""}).status_code == 422
@@ -0,0 +1,81 @@
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import update
+from app.models.stats_model import StatCounter
+from app.services.stats_service import StatsService
+
+def test_stats_follow_writes(client, auth_headers, test_task, test_note):
+    """Test the counters follow single, bulk and delete writes, overall and per user"""
+    user_id = client.get("/auth/me", headers=auth_headers).json()["id"]
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    before = client.get("/stats").json()
+    mine_before = client.get("/stats/me", headers=auth_headers).json()
+
+    rows = [
+        {**test_task, "title": "Overdue", "user_id": user_id, "priority": "high", "due_date": (now - timedelta(days=2)).isoformat()},
+        {**test_task, "title": "Due today", "user_id": user_id, "priority": "low", "due_date": now.isoformat()},
+        {**test_task, "title": "Done", "user_id": user_id, "completed": True, "due_date": (now - timedelta(days=1)).isoformat()},
+    ]
+    overdue, due_today, done = client.post("/tasks/bulk", json=rows, headers=auth_headers).json()["items"]
+    client.post("/tasks/", json=test_task, headers=auth_headers)
+    client.post("/notes/", json={**test_note, "user_id": user_id}, headers=auth_headers)
+
+    response = client.get("/stats")
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == "private, max-age=5"
+    stats = response.json()
+    assert stats["tasks"]["total"] == before["tasks"]["total"] + 4
+    assert stats["tasks"]["completed"] == before["tasks"]["completed"] + 1
+    assert stats["tasks"]["open"] == before["tasks"]["open"] + 3
+    assert stats["tasks"]["by_priority"]["high"] == before["tasks"]["by_priority"]["high"] + 1
+    assert stats["tasks"]["overdue"] == before["tasks"]["overdue"] + 1
+    assert stats["tasks"]["due_today"] == before["tasks"]["due_today"] + 1
+    assert stats["notes"]["total"] == before["notes"]["total"] + 1
+    assert {"user_id": user_id, "notes": mine_before["notes"]["total"] + 1} in stats["notes_per_user"]
+
+    # Unowned tasks only count towards the global totals
+    mine = client.get("/stats/me", headers=auth_headers).json()
+    assert mine["tasks"]["total"] == mine_before["tasks"]["total"] + 3
+    assert "notes_per_user" not in mine
+
+    # Completing, re-prioritising and deleting move the counters back
+    client.put(f"/tasks/{overdue['id']}", json={"completed": True}, headers=auth_headers)
+    client.patch("/tasks/bulk", json=[{"id": due_today["id"], "priority": "high"}], headers=auth_headers)
+    client.request("DELETE", "/tasks/bulk", json={"ids": [done["id"]]}, headers=auth_headers)
+    mine = client.get("/stats/me", headers=auth_headers).json()
+    assert mine["tasks"]["total"] == mine_before["tasks"]["total"] + 2
+    assert mine["tasks"]["completed"] == mine_before["tasks"]["completed"] + 1
+    assert mine["tasks"]["overdue"] == mine_before["tasks"]["overdue"]
+    assert mine["tasks"]["due_today"] == mine_before["tasks"]["due_today"] + 1
+    assert mine["tasks"]["by_priority"]["low"] == mine_before["tasks"]["by_priority"]["low"]
+    assert mine["tasks"]["by_priority"]["high"] == mine_before["tasks"]["by_priority"]["high"] + 2
+
+    # Requires authentication
+    assert client.get("/stats/me").status_code == 401
+
+def test_stats_consistency_repair(client, auth_headers, test_task, db_session):
+    """Test the consistency check finds drifted counters and rebuild repairs them"""
+    client.post("/tasks/", json=test_task, headers=auth_headers)
+    assert StatsService.check(db_session) == []
+
+    db_session.execute(update(StatCounter).where(StatCounter.scope == 0).values(tasks_total=StatCounter.tasks_total + 5))
+    db_session.commit()
+    drift = StatsService.check(db_session)
+    assert len(drift) == 1 and drift[0].startswith("scope 0 tasks_total")
+
+    assert StatsService.rebuild(db_session) > 0
+    assert StatsService.check(db_session) == []
+
+def test_stats_sum_counter_shards(client, auth_headers, test_task, db_session):
+    """Test scope 0 reads add up its shards, as Postgres writers spread their deltas over them"""
+    client.post("/tasks/", json=test_task, headers=auth_headers)
+    StatsService.rebuild(db_session)
+    before = client.get("/stats").json()
+
+    # Move two tasks (one completed) to another shard: totals and consistency don't change
+    db_session.execute(update(StatCounter).where(StatCounter.scope == 0).values(tasks_total=StatCounter.tasks_total - 2, tasks_completed=StatCounter.tasks_completed - 1))
+    db_session.add(StatCounter(scope=0, shard=3, tasks_total=2, tasks_completed=1, tasks_low=0, tasks_medium=0, tasks_high=0, notes_total=0))
+    db_session.commit()
+    assert StatsService.check(db_session) == []
+    stats = client.get("/stats").json()
+    assert stats["tasks"] == before["tasks"]
+    assert StatsService.get_counters(db_session).tasks_total == before["tasks"]["total"]
@@ -0,0 +1,52 @@
+from datetime import datetime
+from app.utils.pagination import encode_sync_token
+
+def sync(client, path, since=None, **params):
+    """Follow has_more to the end, returns (items, deleted ids, token)"""
+    items, deleted = [], []
+    while True:
+        body = client.get(path, params={**params, **({"since": since} if since else {})}).json()
+        items.extend(body["items"])
+        deleted.extend(body["deleted"])
+        since = body["next"]
+        if not body["has_more"]:
+            return items, deleted, since
+
+def test_task_changes(client, auth_headers, test_task, monkeypatch):
+    """Test the changes feed returns updated rows and tombstones after a token, page by page"""
+    monkeypatch.setattr("app.services.sync_service.SYNC_LAG", 0)
+    user_id = client.get("/auth/me", headers=auth_headers).json()["id"]
+    rows = [{**test_task, "title": f"Sync {i}", "user_id": user_id} for i in range(4)]
+    created = client.post("/tasks/bulk", json=rows, headers=auth_headers).json()["items"]
+
+    # Full sync, two rows per page
+    items, deleted, token = sync(client, "/tasks/changes", user_id=user_id, limit=2)
+    assert {task["id"] for task in created} <= {task["id"] for task in items}
+    assert deleted == []
+
+    # Nothing changed since
+    assert sync(client, "/tasks/changes", token, user_id=user_id)[:2] == ([], [])
+
+    client.put(f"/tasks/{created[0]['id']}", json={"completed": True}, headers=auth_headers)
+    client.delete(f"/tasks/{created[1]['id']}", headers=auth_headers)
+    client.request("DELETE", "/tasks/bulk", json={"ids": [created[2]["id"]]}, headers=auth_headers)
+    client.post("/tasks/", json={**test_task, "title": "Someone else's"}, headers=auth_headers)
+
+    items, deleted, token = sync(client, "/tasks/changes", token, user_id=user_id, limit=1)
+    assert [(task["id"], task["version"], task["completed"]) for task in items] == [(created[0]["id"], 2, True)]
+    assert deleted == [created[1]["id"], created[2]["id"]]
+    assert sync(client, "/tasks/changes", token, user_id=user_id)[:2] == ([], [])
+
+def test_changes_lag_window(client, auth_headers, test_note):
+    """Test recent changes are sent again on the next call, so late commits aren't skipped"""
+    note = client.post("/notes/", json=test_note, headers=auth_headers).json()
+    _, _, token = sync(client, "/notes/changes")
+    items, _, _ = sync(client, "/notes/changes", token)
+    assert note["id"] in {item["id"] for item in items}
+
+def test_changes_invalid_token(client):
+    """Test malformed and expired tokens"""
+    assert client.get("/notes/changes", params={"since": "garbage"}).status_code == 400
+    old = datetime(2000, 1, 1)
+    response = client.get("/notes/changes", params={"since": encode_sync_token((old, 0), (old, 0))})
+    assert response.status_code == 410
@@ -100,4 +100,245 @@ def test_delete_task(client, test_user, test_task):
     
     # Verify task is deleted
     get_response = client.get(f"/tasks/{task_id}")
-    assert get_response.status_code == 404
\ No newline at end of file
+    assert get_response.status_code == 404
+
+def test_get_tasks_keyset_pages(client, test_user, test_task):
+    """Test walking tasks with cursor pagination"""
+    # Setup: register, login, create a few tasks
+    client.post("/auth/register", json=test_user)
+    login_response = client.post("/auth/login", data={
+        "username": test_user["username"],
+        "password": test_user["password"]
+    })
+    token = login_response.json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    for i in range(3):
+        client.post("/tasks/", json={**test_task, "title": f"Paged Task {i}"}, headers=headers)
+    
+    # Walk all pages two rows at a time
+    seen_ids = []
+    cursor = None
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/tasks/page", params=params)
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["items"]) <= 2
+        seen_ids.extend(item["id"] for item in data["items"])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+    
+    # Every task shows up exactly once
+    all_tasks = client.get("/tasks/").json()
+    assert len(seen_ids) == len(set(seen_ids))
+    assert sorted(seen_ids) == sorted(task["id"] for task in all_tasks)
+
+def test_get_tasks_invalid_cursor(client):
+    """Test that a malformed cursor is rejected"""
+    response = client.get("/tasks/page", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+def test_get_tasks_page_limit_bounds(client):
+    """Test that page sizes outside 1..1000 are rejected instead of failing on an empty page"""
+    for limit in (0, -1, 1001):
+        response = client.get("/tasks/page", params={"limit": limit})
+        assert response.status_code == 422
+        assert client.get("/notes/page", params={"limit": limit}).status_code == 422
+
+def test_get_my_tasks(client, test_user, test_task):
+    """Test listing tasks owned by the current user"""
+    # Setup: register, login
+    client.post("/auth/register", json=test_user)
+    login_response = client.post("/auth/login", data={
+        "username": test_user["username"],
+        "password": test_user["password"]
+    })
+    token = login_response.json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    user_id = client.get("/auth/me", headers=headers).json()["id"]
+    
+    # Create one owned task and one unowned task
+    client.post("/tasks/", json={**test_task, "user_id": user_id}, headers=headers)
+    client.post("/tasks/", json=test_task, headers=headers)
+    
+    response = client.get("/tasks/mine", params={"completed": False}, headers=headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data) >= 1
+    assert all(task["user_id"] == user_id for task in data)
+    
+    # Requires authentication
+    assert client.get("/tasks/mine").status_code == 401
+
+def test_update_task_if_match(client, test_user, test_task):
+    """Test optimistic concurrency with If-Match"""
+    client.post("/auth/register", json=test_user)
+    login_response = client.post("/auth/login", data={
+        "username": test_user["username"],
+        "password": test_user["password"]
+    })
+    token = login_response.json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    
+    create_response = client.post("/tasks/", json=test_task, headers=headers)
+    task_id = create_response.json()["id"]
+    assert create_response.json()["version"] == 1
+    etag = client.get(f"/tasks/{task_id}").headers["ETag"]
+    
+    # First writer wins and gets the new version
+    response = client.put(f"/tasks/{task_id}", json={"title": "Writer A"}, headers={**headers, "If-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["version"] == 2
+    assert response.headers["ETag"] == '"2"'
+    
+    # Second writer with the stale ETag is rejected
+    response = client.put(f"/tasks/{task_id}", json={"title": "Writer B"}, headers={**headers, "If-Match": etag})
+    assert response.status_code == 412
+    response = client.delete(f"/tasks/{task_id}", headers={**headers, "If-Match": etag})
+    assert response.status_code == 412
+    assert client.get(f"/tasks/{task_id}").json()["title"] == "Writer A"
+    
+    # Unknown task is still a 404
+    response = client.put("/tasks/999999", json={"title": "Nobody"}, headers={**headers, "If-Match": etag})
+    assert response.status_code == 404
+    
+    response = client.delete(f"/tasks/{task_id}", headers={**headers, "If-Match": '"2"'})
+    assert response.status_code == 200
+
+def test_get_tasks_conditional(client, test_user, test_task):
+    """Test ETag / If-None-Match revalidation of list and item routes"""
+    client.post("/auth/register", json=test_user)
+    login_response = client.post("/auth/login", data={
+        "username": test_user["username"],
+        "password": test_user["password"]
+    })
+    token = login_response.json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    task_id = client.post("/tasks/", json=test_task, headers=headers).json()["id"]
+    
+    # List: unchanged data revalidates with an empty 304
+    response = client.get("/tasks/", params={"limit": 100000})
+    assert response.status_code == 200
+    assert response.headers["Cache-Control"] == "private, no-cache"
+    list_etag = response.headers["ETag"]
+    response = client.get("/tasks/", params={"limit": 100000}, headers={"If-None-Match": list_etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == list_etag
+    
+    # Item: same for a single task
+    item_etag = client.get(f"/tasks/{task_id}").headers["ETag"]
+    response = client.get(f"/tasks/{task_id}", headers={"If-None-Match": item_etag})
+    assert response.status_code == 304
+    
+    # Any write invalidates both ETags
+    client.put(f"/tasks/{task_id}", json={"title": "Changed"}, headers=headers)
+    response = client.get("/tasks/", params={"limit": 100000}, headers={"If-None-Match": list_etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != list_etag
+    response = client.get(f"/tasks/{task_id}", headers={"If-None-Match": item_etag})
+    assert response.status_code == 200
+    assert response.json()["title"] == "Changed"
+
+def test_get_tasks_fast_path_matches_item(client, test_user, test_task):
+    """Test the column-row list path renders tasks exactly like GET /tasks/{id}"""
+    client.post("/auth/register", json=test_user)
+    login_response = client.post("/auth/login", data={
+        "username": test_user["username"],
+        "password": test_user["password"]
+    })
+    token = login_response.json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    task_id = client.post("/tasks/", json={**test_task, "priority": "high", "due_date": "2030-01-01T09:00:00"}, headers=headers).json()["id"]
+    
+    response = client.get("/tasks/", params={"limit": 100000})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    listed = next(task for task in response.json() if task["id"] == task_id)
+    assert listed == client.get(f"/tasks/{task_id}").json()
+
+def test_get_tasks_total_count(client, test_user, test_task, db_session, monkeypatch):
+    """Test X-Total-Count comes from the counters, is cached briefly, and estimates large unfiltered tables"""
+    from sqlalchemy import func, select
+    from app.models.task_model import Task
+    from app.services.count_service import CountService, count_cache
+    count_cache.clear()
+    client.post("/auth/register", json=test_user)
+    login_response = client.post("/auth/login", data={
+        "username": test_user["username"],
+        "password": test_user["password"]
+    })
+    headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+    client.post("/tasks/", json={**test_task, "completed": True}, headers=headers)
+    
+    response = client.get("/tasks/", params={"limit": 1})
+    assert response.headers["X-Total-Count"] == str(db_session.scalar(select(func.count()).select_from(Task)))
+    assert response.headers["X-Total-Count-Type"] == "exact"
+    completed = db_session.scalar(select(func.count()).select_from(Task).where(Task.completed == True))
+    assert client.get("/tasks/", params={"limit": 1, "completed": True}).headers["X-Total-Count"] == str(completed)
+    
+    # Cached for COUNT_CACHE_TTL: a new task shows up once the entry expires
+    total = int(response.headers["X-Total-Count"])
+    client.post("/tasks/", json=test_task, headers=headers)
+    assert client.get("/tasks/", params={"limit": 1}).headers["X-Total-Count"] == str(total)
+    count_cache.clear()
+    assert client.get("/tasks/", params={"limit": 1}).headers["X-Total-Count"] == str(total + 1)
+    
+    # Without a counter, large unfiltered tables get the planner's estimate
+    monkeypatch.setattr(CountService, "estimate_rows", staticmethod(lambda db, model: 5000000))
+    assert CountService.get_total(db_session, Task, ("estimate-test",)) == (5000000, False)
+    assert CountService.get_total(db_session, Task, ("filtered-test",), (Task.completed == True,)) == (completed, True)
+
+def test_get_tasks_sort_and_due_filters(client, test_user, test_task):
+    """Test sort= uses the semantic priority order and due date filters narrow the list"""
+    client.post("/auth/register", json=test_user)
+    login_response = client.post("/auth/login", data={
+        "username": test_user["username"],
+        "password": test_user["password"]
+    })
+    headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+    user_id = client.get("/auth/me", headers=headers).json()["id"]
+    rows = [
+        {**test_task, "title": "Sort low", "priority": "low", "due_date": "2001-01-03T00:00:00", "user_id": user_id},
+        {**test_task, "title": "Sort high late", "priority": "high", "due_date": "2001-01-05T00:00:00", "user_id": user_id},
+        {**test_task, "title": "Sort high soon", "priority": "high", "due_date": "2001-01-02T00:00:00", "user_id": user_id},
+        {**test_task, "title": "Sort medium", "priority": "medium", "due_date": "2001-01-04T00:00:00", "user_id": user_id},
+    ]
+    ids = {task["title"]: task["id"] for task in client.post("/tasks/bulk", json=rows, headers=headers).json()["items"]}
+    
+    params = {"limit": 100000, "due_after": "2001-01-01T00:00:00", "due_before": "2001-01-06T00:00:00"}
+    titles = [task["title"] for task in client.get("/tasks/", params={**params, "sort": "-priority,due_date"}).json()]
+    assert titles == ["Sort high soon", "Sort high late", "Sort medium", "Sort low"]
+    titles = [task["title"] for task in client.get("/tasks/", params={**params, "due_before": "2001-01-04T00:00:00", "sort": "due_date"}).json()]
+    assert titles == ["Sort high soon", "Sort low"]
+    
+    overdue = {task["id"] for task in client.get("/tasks/", params={"limit": 100000, "overdue": True}).json()}
+    assert set(ids.values()) <= overdue
+    assert client.get("/tasks/", params={"limit": 100000, "overdue": True}).headers["X-Total-Count"] == str(len(overdue))
+    assert client.get("/tasks/", params={"sort": "-secret"}).status_code == 400
+
+def test_get_task_queue(client, test_user, test_task):
+    """Test the work queue lists open tasks by priority, then due date, undated last"""
+    client.post("/auth/register", json=test_user)
+    login_response = client.post("/auth/login", data={
+        "username": test_user["username"],
+        "password": test_user["password"]
+    })
+    headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+    user = client.post("/auth/register", json={**test_user, "username": "queueuser", "email": "queue@example.com"}).json()
+    rows = [
+        {**test_task, "title": "Queue undated high", "priority": "high", "user_id": user["id"]},
+        {**test_task, "title": "Queue low", "priority": "low", "due_date": "2030-01-01T00:00:00", "user_id": user["id"]},
+        {**test_task, "title": "Queue high", "priority": "high", "due_date": "2030-02-01T00:00:00", "user_id": user["id"]},
+        {**test_task, "title": "Queue done", "priority": "high", "completed": True, "due_date": "2020-01-01T00:00:00", "user_id": user["id"]},
+        {**test_task, "title": "Queue medium", "priority": "medium", "due_date": "2030-01-01T00:00:00", "user_id": user["id"]},
+    ]
+    client.post("/tasks/bulk", json=rows, headers=headers)
+    
+    titles = [task["title"] for task in client.get("/tasks/queue", params={"user_id": user["id"]}).json()]
+    assert titles == ["Queue high", "Queue undated high", "Queue medium", "Queue low"]
+    titles = [task["title"] for task in client.get("/tasks/queue", params={"user_id": user["id"], "limit": 2}).json()]
+    assert titles == ["Queue high", "Queue undated high"]